@@ -1,87 +1,140 @@
 # synth_data_gen/__init__.py
 import os
-import yaml # For loading YAML config files
-import json # For loading JSON config files (optional, if supporting JSON config)
-from typing import Any, Dict, List, Optional, Type
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
 
-# Import the new generator classes
+# Generator classes are imported on first use through GENERATOR_MAP (see core/registry.py):
+# their rendering libraries dominate start-up time.
 from .core.base import BaseGenerator
-from .generators.epub import EpubGenerator
-from .generators.pdf import PdfGenerator
-from .generators.markdown import MarkdownGenerator
-from .common.utils import ensure_output_directories
 from .core.config_loader import ConfigLoader # Import the real ConfigLoader
+from .core.events import (Dispatcher, Event, GenerationReport, LoggingListener, PrometheusTextfileListener, emit,
+                          file_event, has_listeners, listeners_from_config, progress, subscribe, unsubscribe)
+from .core.execution import (GenerationResult, WorkItem, execute_work_item, execute_work_items_async,
+                             iter_parallel, resolve_max_workers)
+from .core.layout import OutputLayout
+from .core.manifest import GenerationManifest, manifest_filename
+from .core.matrix import ConfigMatrix, parse_matrix
+from .core.seeding import derive_seed, seeded
+from .core.sharding import resolve_shard, shard_for, shard_key
+from .core.tracing import TraceWriter, recording, span, traced_plan
+from .core.plugins import PluginManager
+from .core.profiling import ProfileSettings, profiling_from_config
+from .core.registry import GeneratorRegistry
+from .core.sinks import DirectorySink, OutputSink, TarSink, ZipSink, open_sink
+from .exceptions import (EpubGenerationError, GeneratorError, InvalidConfigError, MarkdownGenerationError,
+                         PdfGenerationError, PluginError)
 
-# Placeholder for custom exceptions (as defined in spec)
-class InvalidConfigError(ValueError): pass # This might be superseded by ConfigLoader's exceptions
-class GeneratorError(RuntimeError): pass
-class EpubGenerationError(GeneratorError): pass
-class PdfGenerationError(GeneratorError): pass
-class MarkdownGenerationError(GeneratorError): pass
-class PluginError(RuntimeError): pass
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from .core.events import Listener
 
 
-# Mapping of type strings to generator classes
-GENERATOR_MAP: Dict[str, Type[BaseGenerator]] = {
-    "epub": EpubGenerator,
-    "pdf": PdfGenerator,
-    "markdown": MarkdownGenerator,
-    # Plugins would extend this map
-}
+# Discovers generator plugins (entry points) the first time an unknown type is looked up.
+plugin_manager = PluginManager()
 
-def generate_data(config_path: Optional[str] = None, config_obj: Optional[Dict[str, Any]] = None, output_dir_override: Optional[str] = None) -> List[str]:
+# Mapping of type strings to generator classes, imported on first lookup
+GENERATOR_MAP: GeneratorRegistry = GeneratorRegistry({
+    "epub": "synth_data_gen.generators.epub:EpubGenerator",
+    "pdf": "synth_data_gen.generators.pdf:PdfGenerator",
+    "markdown": "synth_data_gen.generators.markdown:MarkdownGenerator",
+}, discover=plugin_manager.discover)
+
+_LAZY_GENERATOR_NAMES = {"EpubGenerator": "epub", "PdfGenerator": "pdf", "MarkdownGenerator": "markdown"}
+
+
+def __getattr__(name: str) -> Any:
+    # `synth_data_gen.PdfGenerator` etc. still work, importing the generator on first access.
+    if name in _LAZY_GENERATOR_NAMES:
+        return GENERATOR_MAP[_LAZY_GENERATOR_NAMES[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _report_generation_error(generator_type_str: str, output_file_path: str, e: BaseException) -> None:
+    # Wrap in GeneratorError as per spec
+    gen_error = GeneratorError(f"Error during {generator_type_str} generation for {output_file_path}: {e}")
+    # Specific errors can also be raised by generators themselves
+    if isinstance(e, (EpubGenerationError, PdfGenerationError, MarkdownGenerationError)):
+        gen_error = e # Use the more specific error if already raised
+
+    if not has_listeners(): # listeners get the error with the file's "file_finished" event
+        print(str(gen_error))
+    # Decide whether to continue with other files or stop
+    # For now, we'll log and continue
+
+
+def _resolve_specific_config(config: Dict[str, Any], loader: ConfigLoader, generator_type_str: str,
+                             generator_instance: BaseGenerator, global_settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
-    Generates synthetic data files based on the provided configuration.
+    Returns the validated specific config for one generator type: its section
+    of the main config, or the generator's defaults if there is none.
+    Returns None (after printing why) if the config is invalid.
     """
-    print(f"Starting synthetic data generation (config_path='{config_path}', config_obj provided: {config_obj is not None}, output_dir_override='{output_dir_override}')...")
+    # Get generator-specific config from the main loaded_config
+    # The loader instance is 'loader', the full config is 'config'
+    specific_config = loader.get_generator_config(config, generator_type_str.lower())
 
-    # Instantiate the real ConfigLoader
-    # The schema path might be handled internally by ConfigLoader or passed here
-    # For now, assuming ConfigLoader uses its default schema if schema_path is None
-    loader = ConfigLoader() # ConfigLoader handles its own default schema path
-    
+    # If specific settings are empty after trying to load from main config,
+    # then use generator's defaults.
+    if not specific_config: # and generator_type_str.lower() in GENERATOR_MAP: # Check if it's a known type
+        # This check for GENERATOR_MAP might be redundant if specific_config is already empty
+        specific_config = generator_instance.get_default_specific_config()
+        print(f"Using default specific settings for {generator_type_str} as none were found in the main config.")
+
+    # Validate the specific config using the generator's method
     try:
-        # Use load_and_validate_config
-        # If config_obj is provided, it should take precedence or be handled by ConfigLoader
-        if config_obj:
-            # ConfigLoader's current load_and_validate_config doesn't directly take config_obj.
-            # This part might need adjustment based on how ConfigLoader is designed to handle this.
-            # For now, we'll assume if config_obj is given, config_path might be None or ignored.
-            # This is a simplification and might need refinement.
-            # A more robust ConfigLoader might have a load_from_object_and_validate method.
-            # OR, the test setup needs to ensure config_path is always primary for this integration.
-            # For this TDD step, we focus on config_path.
-            if config_path:
-                 print(f"Warning: Both config_path ('{config_path}') and config_obj provided. Prioritizing config_path for loading.")
-            config = loader.load_and_validate_config(config_path=config_path, config_override_object=config_obj)
+        # Ensure specific_config is a dict before validation,
+        # as get_default_specific_config should return a dict.
+        if not isinstance(specific_config, dict):
+            print(f"Warning: Specific configuration for {generator_type_str} is not a dictionary. Using defaults.")
+            specific_config = generator_instance.get_default_specific_config()
 
-        elif config_path:
-            config = loader.load_and_validate_config(config_path=config_path)
-        else:
-            # Load default config if neither path nor object is provided
-            config = loader.load_and_validate_config()
+        with span("validate_config", category="setup", type=generator_type_str):
+            valid = generator_instance.validate_config(specific_config, global_settings)
+        if not valid:
+            print(f"Warning: Invalid specific configuration for {generator_type_str}. Skipping.")
+            # Or raise InvalidConfigError
+            return None
+    except Exception as e:
+        print(f"Error validating config for {generator_type_str}: {e}. Skipping.")
+        return None
+    return specific_config
 
-    except Exception as e: # Catching a broader exception as ConfigLoader might raise various types
-        print(f"Configuration error: {e}")
-        raise # Re-raise for now
 
+def _plan_work_items(config: Dict[str, Any], loader: ConfigLoader, layout: OutputLayout,
+                     shard: Optional[Tuple[int, int]] = None, in_memory: bool = False,
+                     collect_metrics: bool = False, trace: bool = False,
+                     profile: Optional[ProfileSettings] = None) -> Iterator[Tuple[WorkItem, BaseGenerator]]:
+    """
+    Walks config["file_types"] and yields one (WorkItem, generator_instance) pair
+    per file to generate. Generator instances are created once per file type.
+    With `shard` = (shard_index, shard_count), only the items owned by that
+    shard are yielded (see core/sharding.py). With `global_settings.base_seed`,
+    each item gets its own seed derived from the same identity as its shard.
+    Each entry's output directory is registered with `layout` and created
+    when its first item is planned; with `in_memory`, items are rendered to
+    bytes for an output sink, so no output directories are created.
+    With `collect_metrics`, items report their phases and element counts
+    (see core/events.py), and with `trace`, their trace spans (see
+    core/tracing.py). Items sampled by `profile` are profiled (see
+    core/profiling.py).
+    An entry with a `matrix` block is expanded into one case per combination
+    of its values (see core/matrix.py), `count` items each, as it is walked.
+    """
     global_settings = config.get("global_settings", {})
-    base_output_dir = output_dir_override if output_dir_override else config.get("output_directory_base", "synthetic_output")
-    
-    ensure_output_directories(base_output_dir) # Ensure base output directory exists
-
-    generated_files: List[str] = []
+    base_seed = global_settings.get("base_seed") if isinstance(global_settings, dict) else None
 
-    for file_type_config in config.get("file_types", []):
+    for entry_position, file_type_config in enumerate(config.get("file_types", [])):
         generator_type_str = file_type_config.get("type")
         if not generator_type_str:
             print(f"Warning: Missing 'type' in file_type configuration: {file_type_config}. Skipping.")
             continue
 
-        GeneratorClass = GENERATOR_MAP.get(generator_type_str.lower())
+        try:
+            GeneratorClass = GENERATOR_MAP.get(generator_type_str.lower())
+        except PluginError as e:
+            print(f"Warning: {e} Skipping.")
+            continue
         if not GeneratorClass:
             print(f"Warning: Unknown generator type '{generator_type_str}'. Skipping.")
-            # Potentially use PluginManager here in the future
             continue
         
         generator_instance = GeneratorClass()
@@ -91,66 +144,529 @@ def generate_data(config_path: Optional[str] = None, config_obj: Optional[Dict[s
             print(f"Warning: Invalid 'count' for type '{generator_type_str}': {count}. Defaulting to 1.")
             count = 1
             
-        # Get generator-specific config from the main loaded_config
-        # The loader instance is 'loader', the full config is 'config'
-        specific_config = loader.get_generator_config(config, generator_type_str.lower())
-        
-        # If specific settings are empty after trying to load from main config,
-        # then use generator's defaults.
-        if not specific_config: # and generator_type_str.lower() in GENERATOR_MAP: # Check if it's a known type
-            # This check for GENERATOR_MAP might be redundant if specific_config is already empty
-            specific_config = generator_instance.get_default_specific_config()
-            print(f"Using default specific settings for {generator_type_str} as none were found in the main config.")
+        specific_config = _resolve_specific_config(config, loader, generator_type_str, generator_instance, global_settings)
+        if specific_config is None:
+            continue
 
-        # Validate the specific config using the generator's method
         try:
-            # Ensure specific_config is a dict before validation,
-            # as get_default_specific_config should return a dict.
-            if not isinstance(specific_config, dict):
-                print(f"Warning: Specific configuration for {generator_type_str} is not a dictionary. Using defaults.")
-                specific_config = generator_instance.get_default_specific_config()
-
-            if not generator_instance.validate_config(specific_config, global_settings):
-                print(f"Warning: Invalid specific configuration for {generator_type_str}. Skipping.")
-                # Or raise InvalidConfigError
-                continue
-        except Exception as e:
-            print(f"Error validating config for {generator_type_str}: {e}. Skipping.")
+            matrix = parse_matrix(file_type_config, base_seed, entry_position)
+        except ValueError as e:
+            print(f"Warning: Invalid matrix for type '{generator_type_str}': {e} Skipping.")
             continue
 
         file_output_subdir = file_type_config.get("output_subdir", generator_type_str + "s")
-        current_output_dir = os.path.join(base_output_dir, file_output_subdir)
-        ensure_output_directories(current_output_dir)
+        current_output_dir = layout.register(file_output_subdir)
 
         default_extension = generator_type_str if generator_type_str != "markdown" else "md"
         filename_pattern = file_type_config.get("filename_pattern", f"{generator_type_str}_{{index}}.{default_extension}")
 
+        # Without a matrix the entry is a single case. Matrix cases are merged
+        # over the entry's config one at a time and share its generator
+        # instance; items are numbered across all cases of the entry.
+        if matrix is None:
+            cases = iter([(1, specific_config)])
+            total = count
+        else:
+            cases = _matrix_cases(matrix, specific_config, loader, generator_type_str, generator_instance, global_settings)
+            total = count * matrix.case_count
+
+        index = 0
+        for case_number, case_config in cases:
+            if case_config is None: # invalid case, already reported
+                index += count
+                continue
+            for _ in range(count):
+                index += 1
+                item_key = shard_key(entry_position, generator_type_str, index)
+                if shard is not None and shard_for(item_key, shard[1]) != shard[0]:
+                    continue
+                # Create a unique filename
+                # Basic slugification for title, could be more robust
+                slug_title = case_config.get("title", f"doc_{index}").lower().replace(" ", "_").replace(":", "").replace("'", "")
+                slug_title = "".join(c for c in slug_title if c.isalnum() or c == '_')[:30] # Limit length
 
-        for i in range(count):
-            # Create a unique filename
-            # Basic slugification for title, could be more robust
-            slug_title = specific_config.get("title", f"doc_{i+1}").lower().replace(" ", "_").replace(":", "").replace("'", "")
-            slug_title = "".join(c for c in slug_title if c.isalnum() or c == '_')[:30] # Limit length
+                filename = filename_pattern.format(index=index, slug_title=slug_title, case=case_number)
+                output_file_path = os.path.join(current_output_dir, filename)
+                if not in_memory:
+                    layout.ensure(file_output_subdir)
 
-            filename = filename_pattern.format(index=i+1, slug_title=slug_title)
-            output_file_path = os.path.join(current_output_dir, filename)
-            
-            print(f"Generating {generator_type_str} ({i+1}/{count}): {output_file_path}")
-            try:
-                generated_path = generator_instance.generate(specific_config, global_settings, output_file_path)
-                generated_files.append(generated_path)
-            except Exception as e:
-                # Wrap in GeneratorError as per spec
-                gen_error = GeneratorError(f"Error during {generator_type_str} generation for {output_file_path}: {e}")
-                # Specific errors can also be raised by generators themselves
-                if isinstance(e, (EpubGenerationError, PdfGenerationError, MarkdownGenerationError)):
-                    gen_error = e # Use the more specific error if already raised
-                
-                print(str(gen_error))
-                # Decide whether to continue with other files or stop
-                # For now, we'll log and continue
+                item = WorkItem(
+                    file_type=generator_type_str,
+                    index=index,
+                    generator_cls=GeneratorClass,
+                    specific_config=case_config,
+                    global_settings=global_settings,
+                    output_path=output_file_path,
+                    count=total,
+                    seed=derive_seed(base_seed, item_key) if base_seed is not None else None,
+                    in_memory=in_memory,
+                    collect_metrics=collect_metrics,
+                    trace=trace,
+                )
+                if profile is not None and profile.selects(item_key, generator_type_str, case_config):
+                    item.profile = profile
+                    item.profile_path = profile.report_base(output_file_path, layout.base_dir)
+                yield item, generator_instance
+
+
+def _matrix_cases(matrix: ConfigMatrix, specific_config: Dict[str, Any], loader: ConfigLoader, generator_type_str: str,
+                  generator_instance: BaseGenerator, global_settings: Dict[str, Any]) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    Yields (case number, specific config) for each case of `matrix`, lazily.
+    Invalid cases are reported and yielded with a None config, so that the
+    planner still consumes their item numbers and the other cases keep their
+    filenames and seeds.
+    """
+    for case_number, overrides in matrix.cases():
+        case_config = loader._merge_configs(specific_config, overrides)
+        if not generator_instance.validate_config(case_config, global_settings):
+            print(f"Warning: Invalid matrix case {case_number} for {generator_type_str}: {overrides}. Skipping.")
+            case_config = None
+        yield case_number, case_config
+
+
+def _announce(verb: str, planned: Iterable[Tuple[WorkItem, BaseGenerator]]) -> Iterator[Tuple[WorkItem, BaseGenerator]]:
+    """Reports "<verb> <type> (i/count): <path>" for each planned item as it is handed on (see events.progress)."""
+    for item, generator_instance in planned:
+        progress(f"{verb} {item.file_type} ({item.index}/{item.count}): {item.output_path}")
+        yield item, generator_instance
+
+
+def _resolve_shard(config: Dict[str, Any], shard_index: Optional[int], shard_count: Optional[int]) -> Optional[Tuple[int, int]]:
+    if shard_index is None:
+        shard_index = config.get("shard_index")
+    if shard_count is None:
+        shard_count = config.get("shard_count")
+    try:
+        return resolve_shard(shard_index, shard_count)
+    except ValueError as e:
+        raise InvalidConfigError(str(e)) from e
+
+
+def _writes_manifest(config: Dict[str, Any], resume: Any) -> bool:
+    """Whether a run keeps the output directory's manifest: when resuming, or when the config asks for it."""
+    return bool(resume) or bool(config.get("manifest", False))
+
+
+def _run_listeners(config: Dict[str, Any], listeners: Optional[List["Listener"]]) -> List["Listener"]:
+    """The listeners passed for a run plus those of the config's `metrics` block."""
+    try:
+        return list(listeners or []) + listeners_from_config(config.get("metrics"))
+    except ValueError as e:
+        raise InvalidConfigError(str(e)) from e
+
+
+def _notify(results: Iterable[GenerationResult], dispatcher: Dispatcher) -> Iterator[GenerationResult]:
+    """Emits a "file_finished" event for each result as it is handed on."""
+    for result in results:
+        dispatcher.emit(file_event(result))
+        yield result
+
+
+def _load_config(loader: ConfigLoader, config_path: Optional[str], config_obj: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        # Use load_and_validate_config
+        # If config_obj is provided, it should take precedence or be handled by ConfigLoader
+        if config_obj:
+            # ConfigLoader's current load_and_validate_config doesn't directly take config_obj.
+            # This part might need adjustment based on how ConfigLoader is designed to handle this.
+            # For now, we'll assume if config_obj is given, config_path might be None or ignored.
+            # This is a simplification and might need refinement.
+            # A more robust ConfigLoader might have a load_from_object_and_validate method.
+            # OR, the test setup needs to ensure config_path is always primary for this integration.
+            # For this TDD step, we focus on config_path.
+            if config_path:
+                 print(f"Warning: Both config_path ('{config_path}') and config_obj provided. Prioritizing config_path for loading.")
+            return loader.load_and_validate_config(config_path=config_path, config_override_object=config_obj)
+
+        elif config_path:
+            return loader.load_and_validate_config(config_path=config_path)
+        else:
+            # Load default config if neither path nor object is provided
+            return loader.load_and_validate_config()
+
+    except Exception as e: # Catching a broader exception as ConfigLoader might raise various types
+        print(f"Configuration error: {e}")
+        raise # Re-raise for now
+
+
+def iter_generate_data(config_path: Optional[str] = None, config_obj: Optional[Dict[str, Any]] = None, output_dir_override: Optional[str] = None,
+                       max_workers: Optional[int] = None, ordered: bool = False, resume: Optional[bool] = None,
+                       shard_index: Optional[int] = None, shard_count: Optional[int] = None,
+                       output_sink: Optional[OutputSink] = None,
+                       listeners: Optional[List["Listener"]] = None, trace_path: Optional[str] = None) -> Iterator[GenerationResult]:
+    """
+    Generates synthetic data files and yields a `GenerationResult` (path, file_type,
+    index, bytes, elapsed, error) as soon as each file has been written.
+
+    Work items are planned lazily and, with `max_workers` > 1, at most a small
+    window of them is in flight on the process pool, so memory stays flat for
+    corpora of any size. With a pool, results arrive in completion order unless
+    `ordered` is True. Failed files are reported and yielded with `error` set.
+
+    With `resume` (or the root config key of the same name), files whose
+    entry in the output directory's manifest matches their current inputs
+    and which are still unchanged on disk are not regenerated; they are
+    yielded as they are planned, with `skipped` set. Resuming, or the root
+    config key `manifest: true`, records every generated file in that
+    manifest (see core/manifest.py).
+
+    `shard_index`/`shard_count` (or the root config keys of the same names)
+    restrict the run to one shard of the corpus, so N nodes can split a config
+    between them without coordination; merging their output directories gives
+    the single-node corpus.
+
+    `output_sink` (or an `output_sink` config block, see `core.sinks.open_sink`)
+    sends every document, rendered in memory, to a sink such as a tar or zip
+    archive instead of one file per document; result paths are then the
+    archive member names. Sinks opened from config are closed here; a passed
+    sink stays open for the caller. Resuming only applies to directory output;
+    with `manifest: true`, the manifest becomes the archive's last member.
+
+    `listeners` (plus those of a `metrics` config block) receive the run's
+    events: a "file_finished" per file with its phase durations, element
+    counts and warnings, and "run_started"/"run_finished" (see core/events.py).
+    Pass a `GenerationReport` to get the run's totals. While a run has
+    listeners, its per-file progress lines and errors go to them instead of
+    stdout; the root config key `quiet` drops the progress lines otherwise.
+
+    `trace_path` (or the root config key `trace`) writes a Chrome/Perfetto
+    trace of the run: config loading, planning and, per file and worker, its
+    generation phases (see core/tracing.py).
+
+    A `profiling` config block or the SYNTH_DATA_GEN_PROFILE environment
+    variable profiles a sample of the files with cProfile and/or
+    tracemalloc (see core/profiling.py).
+    """
+    # Instantiate the real ConfigLoader
+    # The schema path might be handled internally by ConfigLoader or passed here
+    # For now, assuming ConfigLoader uses its default schema if schema_path is None
+    loader = ConfigLoader() # ConfigLoader handles its own default schema path
+    # Recorded before it is known whether the config asks for a trace; dropped if it doesn't.
+    with recording() as setup_spans, span("load_config", category="setup", path=config_path):
+        config = _load_config(loader, config_path, config_obj)
+
+    owned_sink = None
+    if output_sink is None:
+        try:
+            output_sink = owned_sink = open_sink(config.get("output_sink"))
+        except ValueError as e:
+            raise InvalidConfigError(str(e)) from e
+    # Printed once a stdout sink has claimed stdout, so it can't precede the archive.
+    print(f"Starting synthetic data generation (config_path='{config_path}', config_obj provided: {config_obj is not None}, output_dir_override='{output_dir_override}')...")
+
+    base_output_dir = output_dir_override if output_dir_override else config.get("output_directory_base", "synthetic_output")
+
+    layout = OutputLayout(base_output_dir)
+    if output_sink is None:
+        layout.ensure() # Ensure base output directory exists
+
+    if max_workers is None:
+        max_workers = config.get("max_workers")
+    max_workers = resolve_max_workers(max_workers)
+
+    if resume is None:
+        resume = config.get("resume", False)
+    shard = _resolve_shard(config, shard_index, shard_count)
+
+    run_listeners = _run_listeners(config, listeners)
+    try:
+        profile = profiling_from_config(config.get("profiling"))
+    except ValueError as e:
+        raise InvalidConfigError(str(e)) from e
+    manifest = GenerationManifest(base_output_dir, manifest_filename(shard), enabled=_writes_manifest(config, resume),
+                                  in_memory=output_sink is not None)
+    trace_path = trace_path or config.get("trace")
+    tracer = TraceWriter(trace_path) if trace_path else None
+    if tracer is not None:
+        tracer.write(setup_spans)
+    dispatcher = Dispatcher(run_listeners, quiet=bool(config.get("quiet", False)))
+    # Without listeners nothing is measured beyond what every result carries.
+    observed = dispatcher.has_listeners()
+    if observed:
+        dispatcher.emit(Event("run_started", message=config_path or "<config object>"))
+    start = time.perf_counter()
+    generated = failed = 0
+
+    planned = manifest.track(_plan_work_items(config, loader, layout, shard, in_memory=output_sink is not None,
+                                              collect_metrics=observed, trace=tracer is not None, profile=profile),
+                             resume=bool(resume))
+    if tracer is not None:
+        planned = traced_plan(planned, tracer)
+
+    if max_workers > 1:
+        # Items are submitted ahead of the pool, so they are only reported as queued here.
+        results = iter_parallel((item for item, _ in _announce("Queued", planned)), max_workers, ordered=ordered)
+    else:
+        results = (execute_work_item(item, generator_instance) for item, generator_instance in _announce("Generating", planned))
+    # The run's listeners are current only while it works, not while the caller holds a result.
+    results = dispatcher.advancing(results)
+
+    try:
+        for result in results:
+            yield from _notify(manifest.drain_skipped(), dispatcher) if observed else manifest.drain_skipped()
+            with dispatcher.active():
+                manifest.record_result(result)
+                if result.error is not None:
+                    failed += 1
+                    _report_generation_error(result.file_type, result.path, result.error)
+                elif result.data is not None:
+                    relpath = os.path.relpath(result.path, base_output_dir).replace(os.sep, "/")
+                    with recording(tracer is not None) as sink_spans, span("sink_write", category="output", path=relpath):
+                        result.path = output_sink.write(relpath, result.data)
+                    result.data = None
+                    if tracer is not None:
+                        tracer.write(sink_spans)
+            if tracer is not None:
+                tracer.write(result.trace)
+                result.trace = None
+            if result.error is None:
+                generated += 1
+            if observed:
+                dispatcher.emit(file_event(result))
+            yield result
+        yield from _notify(manifest.drain_skipped(), dispatcher) if observed else manifest.drain_skipped()
+        if output_sink is not None and manifest.entries:
+            output_sink.write(manifest.filename, manifest.dumps())
+    finally:
+        manifest.close()
+        if owned_sink is not None:
+            owned_sink.close()
+        if observed:
+            dispatcher.emit(Event("run_finished", duration=time.perf_counter() - start, counts={"files": generated, "failures": failed},
+                                  message=f"{generated} files generated, {failed} failed"))
+        if tracer is not None:
+            tracer.close()
+
+
+def generate_data(config_path: Optional[str] = None, config_obj: Optional[Dict[str, Any]] = None, output_dir_override: Optional[str] = None,
+                  max_workers: Optional[int] = None, resume: Optional[bool] = None,
+                  shard_index: Optional[int] = None, shard_count: Optional[int] = None,
+                  output_sink: Optional[OutputSink] = None,
+                  listeners: Optional[List["Listener"]] = None, trace_path: Optional[str] = None) -> List[str]:
+    """
+    Generates synthetic data files based on the provided configuration.
+
+    `max_workers` (or the root config key of the same name) sends each
+    (file_type, index) work item to a process pool of that size; 0 means one
+    worker per CPU. The default of 1 generates everything in this process.
+    With `resume`, files that are up to date according to the output
+    directory's manifest are kept instead of regenerated, and
+    `shard_index`/`shard_count` generate only one shard of the corpus, and
+    `output_sink` writes the corpus into e.g. a tar or zip archive,
+    `listeners` receive the run's metrics events and `trace_path` gets a
+    Chrome trace of the run (see `iter_generate_data`).
+    """
+    generated_files: List[str] = []
+    for result in iter_generate_data(config_path, config_obj, output_dir_override, max_workers=max_workers, ordered=True, resume=resume,
+                                     shard_index=shard_index, shard_count=shard_count, output_sink=output_sink,
+                                     listeners=listeners, trace_path=trace_path):
+        if result.ok:
+            generated_files.append(result.path)
 
     print(f"Synthetic data generation finished. Generated {len(generated_files)} files.")
     return generated_files
 
-__all__ = ['generate_data', 'InvalidConfigError', 'GeneratorError', 'EpubGenerationError', 'PdfGenerationError', 'MarkdownGenerationError', 'PluginError']
\ No newline at end of file
+def _collect_results(manifest: GenerationManifest, results: List[GenerationResult], dispatcher: Dispatcher) -> List[str]:
+    skipped = list(manifest.drain_skipped())
+    generated_files: List[str] = [result.path for result in skipped]
+    if dispatcher.has_listeners():
+        for result in skipped + results:
+            dispatcher.emit(file_event(result))
+    with dispatcher.active(): # runs on an executor thread, outside the run's context
+        for result in results:
+            manifest.record_result(result)
+            if result.ok:
+                generated_files.append(result.path)
+            else:
+                _report_generation_error(result.file_type, result.path, result.error)
+    return generated_files
+
+async def generate_data_async(config_path: Optional[str] = None, config_obj: Optional[Dict[str, Any]] = None, output_dir_override: Optional[str] = None,
+                              max_concurrency: Optional[int] = None, executor: Optional["Executor"] = None,
+                              resume: Optional[bool] = None, shard_index: Optional[int] = None,
+                              shard_count: Optional[int] = None, listeners: Optional[List["Listener"]] = None) -> List[str]:
+    """
+    asyncio counterpart of `generate_data`, for callers running inside an event loop.
+
+    Each file's generation is scheduled on `executor` (a private thread pool by
+    default) with at most `max_concurrency` (or the root config key of the same
+    name; default one per CPU) documents in flight. Config loading, directory
+    setup and planning also run off the event loop. Cancelling the awaiting task
+    cancels all in-flight work and removes files written by items that were
+    already running (see `execute_work_items_async`). `resume` and sharding work
+    as in `generate_data`. Returns the generated paths in plan order, preceded by
+    any files that were skipped as up to date. Output always goes to directories;
+    an `output_sink` config block is ignored with a warning. `listeners` get a
+    "file_finished" event per file once the run has finished, without phase
+    durations or element counts.
+    """
+    import asyncio
+
+    print(f"Starting synthetic data generation (config_path='{config_path}', config_obj provided: {config_obj is not None}, output_dir_override='{output_dir_override}')...")
+
+    loop = asyncio.get_running_loop()
+    loader = ConfigLoader()
+    config = await loop.run_in_executor(None, _load_config, loader, config_path, config_obj)
+    if str((config.get("output_sink") or {}).get("type", "directory")).lower() != "directory":
+        print("Warning: generate_data_async only writes to directories. Ignoring 'output_sink'.")
+
+    base_output_dir = output_dir_override if output_dir_override else config.get("output_directory_base", "synthetic_output")
+    layout = OutputLayout(base_output_dir)
+    await loop.run_in_executor(None, layout.ensure)
+
+    if max_concurrency is None:
+        max_concurrency = config.get("max_concurrency", 0)
+    max_concurrency = resolve_max_workers(max_concurrency, "max_concurrency")
+
+    if resume is None:
+        resume = config.get("resume", False)
+    shard = _resolve_shard(config, shard_index, shard_count)
+
+    run_listeners = _run_listeners(config, listeners)
+    manifest = await loop.run_in_executor(None, GenerationManifest, base_output_dir, manifest_filename(shard),
+                                          _writes_manifest(config, resume))
+    planned = _announce("Queued", manifest.track(_plan_work_items(config, loader, layout, shard), resume=bool(resume)))
+    dispatcher = Dispatcher(run_listeners, quiet=bool(config.get("quiet", False)))
+    start = time.perf_counter()
+    try:
+        if dispatcher.has_listeners():
+            dispatcher.emit(Event("run_started", message=config_path or "<config object>"))
+        # The executor calls run in copies of this task's context (see execute_work_items_async).
+        with dispatcher.active():
+            results = await execute_work_items_async(planned, max_concurrency, executor)
+        # Recording appends to the manifest file, so it happens off the loop too.
+        generated_files = await loop.run_in_executor(None, _collect_results, manifest, results, dispatcher)
+        if dispatcher.has_listeners():
+            failed = sum(1 for result in results if not result.ok)
+            dispatcher.emit(Event("run_finished", duration=time.perf_counter() - start, counts={"files": len(generated_files), "failures": failed},
+                                  message=f"{len(generated_files)} files generated, {failed} failed"))
+    finally:
+        manifest.close()
+
+    print(f"Synthetic data generation finished. Generated {len(generated_files)} files.")
+    return generated_files
+
+class GenerationSession:
+    """
+    Loads and validates a configuration once and keeps everything derived from
+    it (generator instances, their resolved specific configs and, through the
+    PDF generator, its stylesheet template) for repeated single-document calls.
+
+        session = GenerationSession(config_obj=config, output_dir_override="out")
+        result = session.generate_one("pdf", {"title": "Case 17"})
+        pdf_bytes = session.render_one("pdf", {"title": "Case 18"}) # in memory, no file
+
+    Meant for hot loops such as fuzz harnesses, where building a ConfigLoader,
+    re-reading defaults and instantiating generators per call would dominate.
+    """
+
+    def __init__(self, config_path: Optional[str] = None, config_obj: Optional[Dict[str, Any]] = None,
+                 output_dir_override: Optional[str] = None):
+        self.loader = ConfigLoader()
+        self.config = _load_config(self.loader, config_path, config_obj)
+        self.global_settings = self.config.get("global_settings", {})
+        self.base_output_dir = output_dir_override if output_dir_override else self.config.get("output_directory_base", "synthetic_output")
+        self.layout = OutputLayout(self.base_output_dir)
+        self.layout.ensure()
+        self._generators: Dict[str, BaseGenerator] = {}
+        self._specific_configs: Dict[str, Dict[str, Any]] = {}
+        self._counts: Dict[str, int] = {}
+        try:
+            self.profile = profiling_from_config(self.config.get("profiling"))
+        except ValueError as e:
+            raise InvalidConfigError(str(e)) from e
+
+    def generator(self, file_type: str) -> BaseGenerator:
+        """The session's generator instance for `file_type`."""
+        file_type = file_type.lower()
+        generator = self._generators.get(file_type)
+        if generator is None:
+            try:
+                GeneratorClass = GENERATOR_MAP.get(file_type)
+            except PluginError as e:
+                raise InvalidConfigError(str(e)) from e
+            if not GeneratorClass:
+                raise InvalidConfigError(f"Unknown generator type '{file_type}'.")
+            generator = self._generators[file_type] = GeneratorClass()
+        return generator
+
+    def specific_config(self, file_type: str) -> Dict[str, Any]:
+        """The resolved, validated specific config for `file_type`; treat it as read-only."""
+        file_type = file_type.lower()
+        specific_config = self._specific_configs.get(file_type)
+        if specific_config is None:
+            specific_config = _resolve_specific_config(self.config, self.loader, file_type, self.generator(file_type), self.global_settings)
+            if specific_config is None:
+                raise InvalidConfigError(f"Invalid specific configuration for '{file_type}'.")
+            self._specific_configs[file_type] = specific_config
+        return specific_config
+
+    def _output_dir(self, file_type: str) -> str:
+        return self.layout.ensure(file_type + "s")
+
+    def _prepare(self, file_type: str, overrides: Optional[Dict[str, Any]]) -> Tuple[BaseGenerator, Dict[str, Any], int, Optional[int]]:
+        """Returns (generator, merged specific config, index, seed) for the next document of `file_type`."""
+        generator = self.generator(file_type)
+        specific_config = self.specific_config(file_type)
+        if overrides:
+            specific_config = self.loader._merge_configs(specific_config, overrides)
+            if not generator.validate_config(specific_config, self.global_settings):
+                raise InvalidConfigError(f"Invalid overrides for '{file_type}': {overrides}")
+
+        index = self._counts.get(file_type, 0) + 1
+        self._counts[file_type] = index
+        base_seed = self.global_settings.get("base_seed") if isinstance(self.global_settings, dict) else None
+        seed = derive_seed(base_seed, "session", file_type, index) if base_seed is not None else None
+        return generator, specific_config, index, seed
+
+    def render_one(self, file_type: str, overrides: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Like `generate_one`, but renders the document in memory and returns
+        its bytes instead of writing a file. Rendering errors are raised.
+        Documents rendered and generated share the per-type numbering, so the
+        n-th document of a type has the same seed either way.
+        """
+        file_type = file_type.lower()
+        generator, specific_config, _, seed = self._prepare(file_type, overrides)
+        with seeded(seed):
+            return generator.render(specific_config, self.global_settings)
+
+    def generate_one(self, file_type: str, overrides: Optional[Dict[str, Any]] = None,
+                     output_path: Optional[str] = None) -> GenerationResult:
+        """
+        Generates one `file_type` document from the session's specific config
+        with `overrides` merged over it, and returns its `GenerationResult`.
+        Without `output_path`, files are numbered per type within the session
+        ("<type>s/<type>_session_<n>.<ext>" under the output base).
+        With `global_settings.base_seed`, the n-th document of a type gets the
+        same seed in every session. A `profiling` config block applies as in
+        `generate_data`.
+        """
+        file_type = file_type.lower()
+        generator, specific_config, index, seed = self._prepare(file_type, overrides)
+        if output_path is None:
+            extension = file_type if file_type != "markdown" else "md"
+            output_path = os.path.join(self._output_dir(file_type), f"{file_type}_session_{index}.{extension}")
+        item = WorkItem(
+            file_type=file_type,
+            index=index,
+            generator_cls=type(generator),
+            specific_config=specific_config,
+            global_settings=self.global_settings,
+            output_path=output_path,
+            seed=seed,
+            collect_metrics=has_listeners(),
+        )
+        if self.profile is not None and self.profile.selects(f"session:{file_type}:{index}", file_type, specific_config):
+            item.profile = self.profile
+            item.profile_path = self.profile.report_base(output_path, self.base_output_dir)
+        result = execute_work_item(item, generator)
+        if result.error is not None:
+            _report_generation_error(result.file_type, result.path, result.error)
+        if item.collect_metrics:
+            emit(file_event(result))
+        return result
+
+
+__all__ = ['generate_data', 'GenerationSession', 'OutputSink', 'DirectorySink', 'TarSink', 'ZipSink', 'iter_generate_data', 'generate_data_async', 'GenerationResult', 'InvalidConfigError', 'GeneratorError', 'EpubGenerationError', 'PdfGenerationError', 'MarkdownGenerationError', 'PluginError', 'PluginManager', 'Event', 'GenerationReport', 'LoggingListener', 'PrometheusTextfileListener', 'subscribe', 'unsubscribe', 'TraceWriter']
\ No newline at end of file
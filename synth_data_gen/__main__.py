@@ -0,0 +1,6 @@
+"""`python -m synth_data_gen` runs the command-line interface (see cli.py)."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
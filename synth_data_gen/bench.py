@@ -0,0 +1,279 @@
+"""
+Benchmarks for the generators and their variants.
+
+    synth-data-gen bench -o results.json                  # or: python -m synth_data_gen.bench
+    synth-data-gen bench -k pdf/ -n 50 --compare results.json
+
+Every scenario generates the same seeded document `iterations` times through
+a `GenerationSession` (after `warmup` untimed runs) and reports docs/sec,
+MB/sec, p50/p99 latency and peak RSS. The default scenarios cover every
+`pdf_variant`, every `md_variant` and EPUBs at a few chapter/note/image
+densities; `-k` selects scenarios whose name contains any of its arguments.
+
+By default each scenario runs in a fresh process, so its peak RSS is its own
+rather than the high-water mark of everything benchmarked before it. Results
+are saved as JSON; `--compare` diffs a run against an earlier results file
+and exits with status 1 if any metric got worse by more than `--threshold`.
+"""
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+RESULTS_FORMAT_VERSION = 1
+
+PDF_VARIANTS = [
+    "single_column_text", "multi_column_text", "text_flow_around_image", "simulated_ocr_high_quality",
+    "with_bookmarks", "visual_toc_hyperlinked", "running_headers_footers", "bottom_page_footnotes", "simple_table",
+]
+MD_VARIANTS = [
+    "basic_elements", "extended_elements", "json_frontmatter_variant", "error_frontmatter_variant",
+    "no_frontmatter_variant", "embedded_html", "with_latex",
+]
+# name: (chapters, sections per chapter, notes per chapter, images per chapter)
+EPUB_DENSITIES = {
+    "light": (3, 2, 1, 0),
+    "medium": (12, 4, 5, 2),
+    "heavy": (40, 8, 15, 6),
+}
+
+# metric: True if higher is better
+COMPARED_METRICS = {"docs_per_sec": True, "mb_per_sec": True, "p50_ms": False, "p99_ms": False, "peak_rss_mb": False}
+
+
+@dataclass
+class Scenario:
+    """One benchmarked document: a file type and the settings merged over its defaults."""
+    name: str
+    file_type: str
+    overrides: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    file_type: str
+    docs: int
+    failures: int
+    bytes: int
+    seconds: float
+    docs_per_sec: float
+    mb_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    peak_rss_mb: Optional[float]
+    warnings: int = 0
+    phase_ms: Dict[str, float] = field(default_factory=dict) # mean time per document in each phase
+
+
+def default_scenarios() -> List[Scenario]:
+    # The default base font ("Times New Roman") isn't one of reportlab's built-in fonts.
+    scenarios = [Scenario(f"pdf/{variant}", "pdf", {"pdf_variant": variant, "base_font_family": "Helvetica"})
+                 for variant in PDF_VARIANTS]
+    scenarios += [Scenario(f"markdown/{variant}", "markdown", {"md_variant": variant}) for variant in MD_VARIANTS]
+    for density, (chapters, sections, notes, images) in EPUB_DENSITIES.items():
+        scenarios.append(Scenario(f"epub/{density}", "epub", {
+            "chapters_config": chapters,
+            "sections_per_chapter_config": sections,
+            "notes_system": {"enable": True, "type": "footnotes_same_page", "notes_config": notes},
+            "multimedia": {"include_images": True, "images_config": images},
+        }))
+    return scenarios
+
+
+def select_scenarios(scenarios: Sequence[Scenario], patterns: Optional[Sequence[str]]) -> List[Scenario]:
+    """The scenarios whose name contains any of `patterns` (all of them without patterns)."""
+    if not patterns:
+        return list(scenarios)
+    return [scenario for scenario in scenarios if any(pattern in scenario.name for pattern in patterns)]
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0 for none)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """This process's peak resident set size in MB, or None where the platform doesn't report it."""
+    try:
+        import resource
+    except ImportError: # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(scenario: Scenario, iterations: int = 20, warmup: int = 2, base_seed: int = 0,
+                 output_dir: Optional[str] = None) -> ScenarioResult:
+    """
+    Generates `scenario`'s document `warmup` + `iterations` times in this
+    process and measures the timed runs. A run that raises, or that leaves
+    no output file or an empty one, counts as a failure and isn't timed.
+    Progress output is suppressed; generator warnings are counted instead
+    (see core/events.py).
+    """
+    from . import GenerationSession
+    from .core.events import GenerationReport, listening
+
+    report = GenerationReport()
+    with tempfile.TemporaryDirectory(prefix="synth_bench_") as scratch, contextlib.redirect_stdout(io.StringIO()):
+        output_dir = output_dir or scratch
+        config = {
+            "global_settings": {"base_seed": base_seed},
+            "file_types": [{"type": scenario.file_type, "count": 0}],
+        }
+        session = GenerationSession(config_obj=config, output_dir_override=output_dir)
+        extension = "md" if scenario.file_type == "markdown" else scenario.file_type
+        output_path = os.path.join(output_dir, f"bench.{extension}") # rewritten by every run
+        latencies: List[float] = []
+        total_bytes = failures = 0
+        for run in range(warmup + iterations):
+            if os.path.exists(output_path):
+                os.remove(output_path) # so a run that writes nothing can't pass off the previous run's file
+            with listening([report] if run >= warmup else []):
+                result = session.generate_one(scenario.file_type, scenario.overrides, output_path=output_path)
+            if run < warmup:
+                continue
+            if result.ok and result.bytes > 0:
+                latencies.append(result.elapsed)
+                total_bytes += result.bytes
+            else:
+                failures += 1
+
+    seconds = sum(latencies)
+    return ScenarioResult(
+        name=scenario.name,
+        file_type=scenario.file_type,
+        docs=len(latencies),
+        failures=failures,
+        bytes=total_bytes,
+        seconds=seconds,
+        docs_per_sec=len(latencies) / seconds if seconds else 0.0,
+        mb_per_sec=total_bytes / (1024 * 1024) / seconds if seconds else 0.0,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        peak_rss_mb=peak_rss_mb(),
+        warnings=len(report.warnings),
+        phase_ms={name: total * 1000 / max(report.files, 1) for name, total in sorted(report.phase_seconds.items())},
+    )
+
+
+def run_benchmarks(scenarios: Sequence[Scenario], iterations: int = 20, warmup: int = 2, base_seed: int = 0,
+                   isolate: bool = True) -> Dict[str, Any]:
+    """
+    Runs `scenarios` one after another and returns the results document that
+    `save_results` writes. With `isolate`, each scenario gets a fresh process.
+    """
+    results: List[ScenarioResult] = []
+    started = time.time()
+    if isolate:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        context = multiprocessing.get_context("spawn")
+        for scenario in scenarios:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results.append(pool.submit(run_scenario, scenario, iterations, warmup, base_seed).result())
+    else:
+        results = [run_scenario(scenario, iterations, warmup, base_seed) for scenario in scenarios]
+    return {
+        "version": RESULTS_FORMAT_VERSION,
+        "created": started,
+        "environment": _environment(),
+        "settings": {"iterations": iterations, "warmup": warmup, "base_seed": base_seed, "isolate": isolate},
+        "scenarios": {result.name: asdict(result) for result in results},
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    from importlib import metadata
+
+    versions: Dict[str, Optional[str]] = {}
+    for distribution in ("synth_data_gen", "reportlab", "EbookLib", "lxml", "PyYAML"):
+        try:
+            versions[distribution] = metadata.version(distribution)
+        except metadata.PackageNotFoundError:
+            versions[distribution] = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+            "cpu_count": os.cpu_count(), "versions": versions}
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    if not isinstance(results, dict) or results.get("version") != RESULTS_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a benchmark results file (format version {RESULTS_FORMAT_VERSION}).")
+    return results
+
+
+@dataclass
+class MetricChange:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    change: float # relative change, positive = current is larger
+    regression: bool
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[MetricChange]:
+    """
+    Compares the scenarios present in both result documents. A metric regresses
+    when it got worse (lower throughput, higher latency or memory) by more than
+    `threshold` (a fraction).
+    """
+    changes: List[MetricChange] = []
+    for name, current_scenario in current["scenarios"].items():
+        baseline_scenario = baseline["scenarios"].get(name)
+        if baseline_scenario is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = baseline_scenario.get(metric), current_scenario.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            changes.append(MetricChange(name, metric, old, new, change, worse > threshold))
+    return changes
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [f"{'scenario':<40} {'docs/s':>9} {'MB/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8} {'fail':>5}"]
+    for name, scenario in results["scenarios"].items():
+        rss = scenario["peak_rss_mb"]
+        lines.append(f"{name:<40} {scenario['docs_per_sec']:>9.2f} {scenario['mb_per_sec']:>8.2f} {scenario['p50_ms']:>9.2f}"
+                     f" {scenario['p99_ms']:>9.2f} {'-' if rss is None else f'{rss:.1f}':>8} {scenario['failures']:>5}")
+    return "\n".join(lines)
+
+
+def format_changes(changes: Sequence[MetricChange]) -> str:
+    lines = [f"{'scenario':<40} {'metric':<12} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for change in changes:
+        flag = "  REGRESSION" if change.regression else ""
+        lines.append(f"{change.scenario:<40} {change.metric:<12} {change.baseline:>10.2f} {change.current:>10.2f}"
+                     f" {change.change:>+8.1%}{flag}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from .cli import main
+
+    sys.exit(main(["bench"] + sys.argv[1:]))
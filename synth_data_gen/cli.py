@@ -0,0 +1,170 @@
+"""
+Command-line interface.
+
+    synth-data-gen generate config.yaml -o out/ -j 8
+    synth-data-gen validate config.yaml
+    synth-data-gen plan config.yaml --shard-index 0 --shard-count 4
+    synth-data-gen bench -o results.json --compare baseline.json
+
+Start-up only imports the package core; a generator's module (and its
+rendering library) is imported when a config first uses its type, so a
+Markdown-only job never loads reportlab or ebooklib.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="synth-data-gen", description="Generate synthetic EPUB, PDF and Markdown test data.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name: str, help_text: str) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument("config", nargs="?", help="YAML config file (default: the built-in default config)")
+        return command
+
+    def add_shard_options(command: argparse.ArgumentParser) -> None:
+        command.add_argument("--shard-index", type=int, help="generate only this shard of the corpus (0-based)")
+        command.add_argument("--shard-count", type=int, help="number of shards the corpus is split into")
+
+    generate = add_command("generate", "Generate the files described by a config.")
+    generate.add_argument("-o", "--output-dir", help="output base directory (overrides output_directory_base)")
+    generate.add_argument("-j", "--workers", type=int, help="worker processes (0 = one per CPU)")
+    generate.add_argument("--resume", action="store_true", default=None, help="keep files that are already up to date")
+    generate.add_argument("--metrics-textfile", help="write the run's metrics to this Prometheus textfile")
+    generate.add_argument("--trace", help="write a Chrome/Perfetto trace of the run to this JSON file")
+    add_shard_options(generate)
+
+    add_command("validate", "Load and validate a config and each generator section it uses.")
+
+    plan = add_command("plan", "List the files a config would generate, without generating them.")
+    plan.add_argument("-o", "--output-dir", help="output base directory (overrides output_directory_base)")
+    add_shard_options(plan)
+
+    bench = commands.add_parser("bench", help="Benchmark the generators and their variants.",
+                                description="Benchmark the generators and their variants (see synth_data_gen.bench).")
+    bench.add_argument("-k", "--select", nargs="+", metavar="PATTERN", help="only scenarios whose name contains a pattern")
+    bench.add_argument("-n", "--iterations", type=int, default=20, help="timed documents per scenario (default: 20)")
+    bench.add_argument("--warmup", type=int, default=2, help="untimed documents per scenario (default: 2)")
+    bench.add_argument("--seed", type=int, default=0, help="base_seed of the benchmarked documents (default: 0)")
+    bench.add_argument("--no-isolate", dest="isolate", action="store_false", help="run all scenarios in this process")
+    bench.add_argument("-o", "--output", help="save the results to this JSON file")
+    bench.add_argument("--compare", metavar="BASELINE", help="compare with an earlier results file")
+    bench.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression (default: 0.10)")
+    bench.add_argument("--list", action="store_true", help="list the selected scenarios and exit")
+    return parser
+
+
+def _generate(args: argparse.Namespace) -> int:
+    from . import PrometheusTextfileListener, iter_generate_data
+
+    listeners = [PrometheusTextfileListener(args.metrics_textfile)] if args.metrics_textfile else []
+    failed = generated = 0
+    for result in iter_generate_data(config_path=args.config, output_dir_override=args.output_dir, max_workers=args.workers,
+                                     resume=args.resume, shard_index=args.shard_index, shard_count=args.shard_count,
+                                     listeners=listeners, trace_path=args.trace):
+        if result.ok:
+            generated += 1
+        else:
+            failed += 1
+    print(f"Generated {generated} files, {failed} failed.")
+    return 1 if failed else 0
+
+
+def _validate(args: argparse.Namespace) -> int:
+    from . import GENERATOR_MAP, ConfigLoader, PluginError, _load_config, _resolve_specific_config
+    from .core.events import listeners_from_config
+    from .core.matrix import parse_matrix
+    from .core.profiling import profiling_from_config
+
+    loader = ConfigLoader()
+    config = _load_config(loader, args.config, None)
+    global_settings = config.get("global_settings", {})
+    problems = 0
+    for block, check in (("metrics", listeners_from_config), ("profiling", profiling_from_config)):
+        try:
+            check(config.get(block))
+        except ValueError as e:
+            print(f"{block}: {e}")
+            problems += 1
+    for position, entry in enumerate(config.get("file_types", [])):
+        type_name = str(entry.get("type", "")).lower() if isinstance(entry, dict) else ""
+        if type_name not in GENERATOR_MAP:
+            print(f"file_types[{position}]: unknown or missing type {entry.get('type') if isinstance(entry, dict) else entry!r}")
+            problems += 1
+            continue
+        try:
+            generator = GENERATOR_MAP[type_name]()
+        except PluginError as e:
+            print(f"file_types[{position}]: {e}")
+            problems += 1
+            continue
+        if _resolve_specific_config(config, loader, type_name, generator, global_settings) is None:
+            print(f"file_types[{position}]: invalid settings for '{type_name}'")
+            problems += 1
+        try:
+            parse_matrix(entry)
+        except ValueError as e:
+            print(f"file_types[{position}]: {e}")
+            problems += 1
+    print("Config is valid." if not problems else f"Config has {problems} problem(s).")
+    return 1 if problems else 0
+
+
+def _plan(args: argparse.Namespace) -> int:
+    from . import ConfigLoader, _load_config, _plan_work_items, _resolve_shard
+    from .core.layout import OutputLayout
+
+    loader = ConfigLoader()
+    config = _load_config(loader, args.config, None)
+    base_output_dir = args.output_dir or config.get("output_directory_base", "synthetic_output")
+    shard = _resolve_shard(config, args.shard_index, args.shard_count)
+    planned = 0
+    # Planned as in-memory items, so no output directories are created.
+    for item, _ in _plan_work_items(config, loader, OutputLayout(base_output_dir), shard, in_memory=True):
+        print(f"{item.file_type}\t{item.index}\t{item.output_path}")
+        planned += 1
+    print(f"{planned} files planned.")
+    return 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    from . import bench
+
+    scenarios = bench.select_scenarios(bench.default_scenarios(), args.select)
+    if args.list:
+        for scenario in scenarios:
+            print(scenario.name)
+        return 0
+    if not scenarios:
+        raise ValueError(f"No benchmark scenario matches {args.select}.")
+    baseline = bench.load_results(args.compare) if args.compare else None
+    results = bench.run_benchmarks(scenarios, args.iterations, args.warmup, args.seed, isolate=args.isolate)
+    print(bench.format_results(results))
+    if args.output:
+        bench.save_results(results, args.output)
+    if baseline is None:
+        return 0
+    changes = bench.compare_results(baseline, results, args.threshold)
+    print()
+    print(bench.format_changes(changes))
+    regressions = sum(change.regression for change in changes)
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import yaml
+
+    args = _build_parser().parse_args(argv)
+    handler = {"generate": _generate, "validate": _validate, "plan": _plan, "bench": _bench}[args.command]
+    try:
+        return handler(args)
+    except (FileNotFoundError, ValueError, yaml.YAMLError) as e: # ValueError covers InvalidConfigError
+        print(f"synth-data-gen: error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
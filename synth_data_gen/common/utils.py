@@ -2,6 +2,8 @@ import os
 import zipfile
 from ebooklib import epub
 
+from ..core.events import phase, warn
+
 # Define output base directory relative to the project root
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 BASE_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "generated") # Restored for general use
@@ -17,7 +19,10 @@ PDF_SUBDIR_NAME = "pdf"   # Renamed to avoid conflict with PDF_DIR
 MD_SUBDIR_NAME = "markdown" # Renamed to avoid conflict with MD_DIR
 
 def ensure_output_directories(base_dir: str):
-    """Ensures all necessary output subdirectories exist within the given base_dir."""
+    """
+    Ensures all necessary output subdirectories exist within the given base_dir.
+    Generation no longer uses this fixed tree; see core/layout.py.
+    """
     
     # Ensure the base_dir itself exists
     os.makedirs(base_dir, exist_ok=True)
@@ -90,7 +95,8 @@ def _write_epub_file(book, filepath):
     """Helper function to write the EPUB file, with basic custom file handling."""
     
     # Standard EPUB writing
-    epub.write_epub(filepath, book, {})
+    with phase("write"):
+        epub.write_epub(filepath, book, {})
 
     # Post-process to add files to META-INF or other non-OEBPS locations
     if hasattr(book, 'custom_files_to_add'):
@@ -102,9 +108,8 @@ def _write_epub_file(book, filepath):
                     epub_zip.writestr(rel_path, content_bytes)
             # print(f"Successfully added custom files to EPUB: {filepath}") # Optional: for debugging
         except Exception as e:
-            print(f"Error adding custom files to EPUB {filepath}: {e}")
+            warn(f"Error adding custom files to EPUB {filepath}: {e}")
             # Consider re-raising or more specific error handling
-    print(f"Successfully created EPUB: {filepath}")
 
 # Call this once if common.py is imported, or ensure main runner calls it.
 # For now, let's assume the main runner will call ensure_output_directories().
\ No newline at end of file
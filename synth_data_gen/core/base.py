@@ -1,12 +1,40 @@
-import random # Needed for range and probabilistic down the line
+import os
+import random # Draws use self.rng; kept so tests can patch core.base.random (the shared module)
+import tempfile
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+from .budget import current_budget, document_budget
+from .events import current_metrics
+from .quantity import CappedQuantity, QuantitySampler, compile_quantity, unit_scope
+from .schemas import section_errors
+from .seeding import current_rng, current_seed
 
 class BaseGenerator(ABC):
     """
     Abstract base class for all data generators.
     """
     GENERATOR_ID: str = "base"
+    # Bump when the output for an unchanged config changes, so that resumed runs
+    # regenerate files recorded in an existing manifest (see core/manifest.py).
+    GENERATOR_VERSION: str = "1"
+    # Name of the shipped schema for this generator's specific settings (see
+    # core/schemas.py), checked by validate_config; None skips the check.
+    SETTINGS_SECTION: Optional[str] = None
+
+    @property
+    def rng(self):
+        """
+        Source of all randomness for the file being generated: its own seeded
+        `random.Random` when `global_settings.base_seed` is set, otherwise the
+        `random` module (see core/seeding.py).
+        """
+        return current_rng()
+
+    @property
+    def deterministic(self) -> bool:
+        """True while generating a seeded file; writers should then avoid timestamps and random ids."""
+        return current_seed() is not None
 
     @abstractmethod
     def generate(self, specific_config: Dict[str, Any], global_config: Dict[str, Any], output_path: str) -> str:
@@ -23,6 +51,19 @@ class BaseGenerator(ABC):
         """
         pass
 
+    def render(self, specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> bytes:
+        """
+        Generates a single document in memory and returns its bytes.
+
+        The built-in generators override this to render straight into memory.
+        This fallback lets any generator be used in memory by generating into a
+        temporary directory and reading the file back.
+        """
+        with tempfile.TemporaryDirectory(prefix="synth_render_") as tmp_dir:
+            generated_path = self.generate(specific_config, global_config, os.path.join(tmp_dir, f"document.{self.GENERATOR_ID}"))
+            with open(generated_path, "rb") as f:
+                return f.read()
+
     def validate_config(self, specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> bool:
         """
         Validates the specific configuration for this generator.
@@ -39,8 +80,8 @@ class BaseGenerator(ABC):
             NotImplementedError: If a subclass does not implement this method and relies on it.
                                  Subclasses should implement their own validation logic.
         """
-        # Basic validation can be added here if common to all generators
-        # For now, subclasses are expected to implement their own comprehensive validation
+        # Common checks, plus the shipped schema for SETTINGS_SECTION (compiled once,
+        # see core/schemas.py). Subclasses add their own checks on top.
         if not isinstance(specific_config, dict):
             # Or raise an InvalidConfigError from synth_data_gen.exceptions
             # For now, print and return False for simplicity until exceptions are defined
@@ -49,7 +90,10 @@ class BaseGenerator(ABC):
         if not isinstance(global_config, dict):
             print("Error: global_config must be a dictionary.")
             return False
-        return True
+        errors = section_errors(self.SETTINGS_SECTION, specific_config) if self.SETTINGS_SECTION else []
+        for message in errors:
+            print(f"Error: {message}")
+        return not errors
 
     @abstractmethod
     def get_default_specific_config(self) -> Dict[str, Any]:
@@ -62,10 +106,33 @@ class BaseGenerator(ABC):
         """
         pass
 
+    # Compiled samplers per quantity dict, by identity; bounded for long-lived
+    # generators that see a fresh merged config per document (e.g. sessions).
+    _MAX_COMPILED_QUANTITIES = 1024
+
+    def _quantity_sampler(self, config_value: Any, context_key_name: str) -> QuantitySampler:
+        """
+        Returns the compiled sampler for a Unified Quantity config value (see
+        core/quantity.py). Dict values are compiled on first use and cached by
+        identity, so they must not be mutated while a generator is using them.
+        """
+        if not isinstance(config_value, dict):
+            return compile_quantity(config_value, context_key_name)
+        cache = self.__dict__.setdefault("_compiled_quantities", {})
+        cached = cache.get(id(config_value))
+        if cached is not None and cached[0] is config_value:
+            return cached[1]
+        if len(cache) >= self._MAX_COMPILED_QUANTITIES:
+            cache.clear()
+        sampler = compile_quantity(config_value, context_key_name)
+        # Keep the dict alive so its id can't be reused by another one.
+        cache[id(config_value)] = (config_value, sampler)
+        return sampler
+
     def _determine_count(self, config_value: Any, context_key_name: str) -> int:
         """
         Determines the count of an element based on its configuration value.
-        Handles exact integers, range objects, and probabilistic objects.
+        Handles exact integers, range, probabilistic and distribution objects (see core/quantity.py).
 
         Args:
             config_value: The configuration value for the element's count.
@@ -78,80 +145,59 @@ class BaseGenerator(ABC):
             int: The determined count for the element.
         """
         if isinstance(config_value, int):
-            return config_value
-        elif isinstance(config_value, dict):
-            if "min" in config_value and "max" in config_value:
-                # Range object
-                min_val = config_value.get("min", 0)
-                max_val = config_value.get("max", 0)
-                if not (isinstance(min_val, int) and isinstance(max_val, int) and min_val >= 0 and max_val >= min_val):
-                    print(f"Warning: Invalid range config for '{context_key_name}': {config_value}. Defaulting to 0.")
-                    return 0
-                return random.randint(min_val, max_val)
-            elif "chance" in config_value:
-                # Probabilistic object
-                chance = config_value.get("chance", 0.0)
-                if_true_config = config_value.get("if_true", 1)  # Default to 1 if chance met and if_true missing
-                if_false_config = config_value.get("if_false", 0) # Default to 0 if chance not met and if_false missing
-                max_total_val = config_value.get("max_total") # Can be None
-
-                if not (isinstance(chance, float) and 0.0 <= chance <= 1.0):
-                    print(f"Warning: Invalid chance value for probabilistic config '{context_key_name}': {chance}. Defaulting to determined if_false value.")
-                    # Determine count based on if_false_config directly
-                    if isinstance(if_false_config, int):
-                        determined_count = if_false_config
-                    elif isinstance(if_false_config, dict) and "min" in if_false_config and "max" in if_false_config:
-                        min_val_f = if_false_config.get("min", 0)
-                        max_val_f = if_false_config.get("max", 0)
-                        if not (isinstance(min_val_f, int) and isinstance(max_val_f, int) and min_val_f >= 0 and max_val_f >= min_val_f):
-                            determined_count = 0
-                        else:
-                            determined_count = random.randint(min_val_f, max_val_f)
-                    else:
-                        determined_count = 0 # Default for invalid if_false_config
-                else:
-                    # Valid chance, proceed with probability check
-                    if random.random() < chance:
-                        # Process if_true_config
-                        if isinstance(if_true_config, int):
-                            determined_count = if_true_config
-                        elif isinstance(if_true_config, dict) and "min" in if_true_config and "max" in if_true_config:
-                            min_val_t = if_true_config.get("min", 0)
-                            max_val_t = if_true_config.get("max", 0)
-                            if not (isinstance(min_val_t, int) and isinstance(max_val_t, int) and min_val_t >= 0 and max_val_t >= min_val_t):
-                                print(f"Warning: Invalid range in if_true for probabilistic config '{context_key_name}': {if_true_config}. Defaulting to 1.")
-                                determined_count = 1
-                            else:
-                                determined_count = random.randint(min_val_t, max_val_t)
-                        else:
-                            print(f"Warning: Invalid if_true structure in probabilistic config '{context_key_name}': {if_true_config}. Defaulting to 1.")
-                            determined_count = 1
-                    else:
-                        # Process if_false_config
-                        if isinstance(if_false_config, int):
-                            determined_count = if_false_config
-                        elif isinstance(if_false_config, dict) and "min" in if_false_config and "max" in if_false_config:
-                            min_val_f = if_false_config.get("min", 0)
-                            max_val_f = if_false_config.get("max", 0)
-                            if not (isinstance(min_val_f, int) and isinstance(max_val_f, int) and min_val_f >= 0 and max_val_f >= min_val_f):
-                                print(f"Warning: Invalid range in if_false for probabilistic config '{context_key_name}': {if_false_config}. Defaulting to 0.")
-                                determined_count = 0
-                            else:
-                                determined_count = random.randint(min_val_f, max_val_f)
-                        else:
-                            print(f"Warning: Invalid if_false structure in probabilistic config '{context_key_name}': {if_false_config}. Defaulting to 0.")
-                            determined_count = 0
-                
-                if max_total_val is not None:
-                    if not (isinstance(max_total_val, int) and max_total_val >= 0):
-                        print(f"Warning: Invalid max_total value for probabilistic config '{context_key_name}': {max_total_val}. Ignoring max_total.")
-                    else:
-                        determined_count = min(determined_count, max_total_val)
-                return determined_count
-            else:
-                print(f"Warning: Unknown dictionary structure for count config '{context_key_name}': {config_value}. Defaulting to 0.")
-                return 0
-        else:
-            # Default or error for unhandled types
-            print(f"Warning: Invalid type for count config '{context_key_name}': {type(config_value)}. Defaulting to 0.")
-            return 0
\ No newline at end of file
+            return self._counted(context_key_name, config_value)
+        # Probabilistic values with `per_unit_of` are drawn over the units of the current unit_scope().
+        sampler = self._quantity_sampler(config_value, context_key_name)
+        budget = current_budget()
+        if budget is None or not isinstance(sampler, CappedQuantity):
+            return self._counted(context_key_name, sampler.sample_in_scope(self.rng))
+        # Inside a document, max_total is shared by every draw of this quantity (see core/budget.py).
+        if budget.exhausted(sampler, sampler.max_total):
+            return 0
+        return self._counted(context_key_name, budget.spend(sampler, sampler.max_total, sampler.sample_in_scope(self.rng)))
+
+    @staticmethod
+    def _counted(context_key_name: str, n: int) -> int:
+        """
+        Adds a drawn count to the current document's metrics, if it collects any
+        (see core/events.py), under the context name without its trailing
+        number ("sections_in_chapter_3" -> "sections_in_chapter"). Returns `n`.
+        """
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.add_count(context_key_name.rstrip("0123456789_"), n)
+        return n
+
+    def _spend_budget(self, sampler: QuantitySampler, counts: List[int]) -> List[int]:
+        """Charges a batch of counts to the document budget, in order, if `sampler` is capped."""
+        budget = current_budget()
+        if budget is None or not isinstance(sampler, CappedQuantity):
+            return counts
+        return [budget.spend(sampler, sampler.max_total, count) for count in counts]
+
+    def _determine_counts(self, config_value: Any, context_key_name: str, n: int) -> List[int]:
+        """Draws `n` independent counts for the same config value in one batch (e.g. sections for every chapter)."""
+        sampler = self._quantity_sampler(config_value, context_key_name)
+        counts = self._spend_budget(sampler, sampler.sample(self.rng, n))
+        self._counted(context_key_name, sum(counts))
+        return counts
+
+    def _determine_counts_per_unit(self, config_value: Any, context_key_name: str,
+                                   units_per_parent: List[Dict[str, int]]) -> List[int]:
+        """
+        Draws the counts for several parents at once from the units each holds,
+        i.e. the unit_scope() each would declare (e.g. notes per chapter from
+        {"section": 4, "paragraph": 4} per chapter), with `max_total` capping
+        the total across all of them.
+        """
+        sampler = self._quantity_sampler(config_value, context_key_name)
+        unit = sampler.per_unit_of
+        units = [max(int(parent_units.get(unit, 1)), 0) if unit else 1 for parent_units in units_per_parent]
+        counts = self._spend_budget(sampler, sampler.sample_per_parent(self.rng, units))
+        self._counted(context_key_name, sum(counts))
+        return counts
+
+    # Context manager declaring the units (paragraph=n, ...) the enclosed counts are drawn over.
+    unit_scope = staticmethod(unit_scope)
+    # Context manager sharing max_total budgets across the enclosed counts; see also budget.document_scoped.
+    document_budget = staticmethod(document_budget)
@@ -0,0 +1,70 @@
+"""
+Document-wide `max_total` budgets.
+
+A probabilistic quantity's `max_total` caps how many of an element a whole
+document gets, but counts are drawn piecemeal (notes per chapter, images per
+section, ...). While a document is being built, a `DocumentBudget` ledger
+tracks how much of each capped quantity has been spent, so per-chapter draws
+share one budget; once it is spent, later draws for that element return 0
+without sampling at all.
+
+Generators open the ledger around the method that builds one document (see
+`document_scoped`); nested entries share the outer ledger. Outside a
+document (e.g. `_determine_count` called on its own), `max_total` caps each
+draw separately, as before.
+"""
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+_active = threading.local()
+
+
+class DocumentBudget:
+    """Remaining allowance per capped quantity for the document being built. O(1) per operation."""
+
+    def __init__(self):
+        self._remaining: Dict[Hashable, int] = {}
+
+    def remaining(self, key: Hashable, limit: int) -> int:
+        """What is left of `key`'s budget of `limit` (the full limit if nothing was spent yet)."""
+        return self._remaining.get(key, limit)
+
+    def spend(self, key: Hashable, limit: int, requested: int) -> int:
+        """Takes up to `requested` from `key`'s budget and returns how much was granted."""
+        remaining = self._remaining.get(key, limit)
+        granted = min(max(requested, 0), remaining)
+        self._remaining[key] = remaining - granted
+        return granted
+
+    def exhausted(self, key: Hashable, limit: int) -> bool:
+        return self.remaining(key, limit) <= 0
+
+
+def current_budget() -> Optional[DocumentBudget]:
+    """The ledger of the document being built on this thread, if any."""
+    return getattr(_active, "budget", None)
+
+
+@contextmanager
+def document_budget() -> Iterator[DocumentBudget]:
+    """Opens a ledger for one document, or reuses the one already open on this thread."""
+    budget = current_budget()
+    if budget is not None:
+        yield budget
+        return
+    _active.budget = budget = DocumentBudget()
+    try:
+        yield budget
+    finally:
+        _active.budget = None
+
+
+def document_scoped(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorates the generator method that builds one document, so its counts share one budget."""
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with document_budget():
+            return method(*args, **kwargs)
+    return wrapper
@@ -2,9 +2,255 @@
 Configuration Loader for the Synthetic Data Generation package.
 """
 import yaml
-import jsonschema
 import os
-import copy
+import hashlib
+import pickle
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from .frozen import FrozenDict, freeze, merge_configs
+from .schemas import validate
+
+# libyaml's loader is several times faster than the pure-Python one; same safe subset.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Set to "1" to keep parsed configs in a pickle next to each config file (see ConfigLoader).
+PERSISTENT_CACHE_ENV = "SYNTH_DATA_GEN_CONFIG_CACHE"
+
+
+class _ParsedConfigCache:
+    """
+    Process-wide cache of parsed config files, keyed by absolute path and
+    validated by (mtime, size, inode) and the sha256 of the file's content.
+
+    A stat match alone is only trusted for files whose mtime is comfortably
+    older than the moment they were cached; a file rewritten within the same
+    timestamp tick is caught by re-hashing its content. Entries hold pickled
+    data, so every caller gets its own copy to mutate.
+    """
+    # Files modified this recently (relative to caching) are re-hashed even if stat matches.
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int, int], str, bytes, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat_key(stat: os.stat_result) -> Tuple[int, int, int]:
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def load(self, file_path: str, persistent: bool = False) -> Any:
+        return pickle.loads(self._entry(file_path, persistent)[2])
+
+    def load_with_digest(self, file_path: str, persistent: bool = False) -> Tuple[Any, str]:
+        """(parsed data, sha256 of the content it was parsed from)."""
+        entry = self._entry(file_path, persistent)
+        return pickle.loads(entry[2]), entry[1]
+
+    def digest(self, file_path: str, persistent: bool = False) -> str:
+        """The sha256 of the file's current content (from the cache when it provably hasn't changed)."""
+        return self._entry(file_path, persistent)[1]
+
+    def _entry(self, file_path: str, persistent: bool) -> Tuple[Tuple[int, int, int], str, bytes, int]:
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        stat_key = self._stat_key(stat)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stat_key and stat.st_mtime_ns < entry[3] - self.RACY_WINDOW_NS:
+            return entry
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry is not None and entry[1] == digest:
+            payload = entry[2]
+        else:
+            payload = self._read_persistent(path, digest) if persistent else None
+            if payload is None:
+                data = yaml.load(raw.decode("utf-8"), Loader=YAML_LOADER)
+                payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+                if persistent:
+                    self._write_persistent(path, digest, payload)
+        entry = (stat_key, digest, payload, time.time_ns())
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    @staticmethod
+    def persistent_path(path: str) -> str:
+        directory, name = os.path.split(path)
+        return os.path.join(directory, f".{name}.parsed.pickle")
+
+    def _read_persistent(self, path: str, digest: str) -> Optional[bytes]:
+        try:
+            with open(self.persistent_path(path), "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if isinstance(cached, dict) and cached.get("sha256") == digest:
+            return cached.get("payload")
+        return None
+
+    def _write_persistent(self, path: str, digest: str, payload: bytes) -> None:
+        target = self.persistent_path(path)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"sha256": digest, "payload": payload}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, target)
+        except OSError:
+            # A read-only config directory just means no persistent cache.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_parsed_configs = _ParsedConfigCache()
+
+
+INCLUDE_KEY = "include"
+EXTENDS_KEY = "extends"
+
+
+class ConfigIncludeError(ValueError):
+    """An `include`/`extends` directive is malformed, names a missing file, or forms a cycle."""
+
+
+def _include_scopes(config: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    The mappings of a config file that may hold an `include:` directive: the
+    file itself, each section directly below it (e.g. `pdf:`, `global_settings:`)
+    and each `file_types` entry. Deeper `include` keys are ordinary settings.
+    """
+    yield config
+    for key, value in config.items():
+        if isinstance(value, dict):
+            yield value
+        elif key == "file_types" and isinstance(value, list):
+            yield from (entry for entry in value if isinstance(entry, dict))
+
+
+def _uses_directives(value: Any) -> bool:
+    if not isinstance(value, dict):
+        return False
+    return EXTENDS_KEY in value or any(INCLUDE_KEY in scope for scope in _include_scopes(value))
+
+
+class _IncludeResolver:
+    """
+    Resolves `extends:` and `include:` directives.
+
+    `extends: base.yaml` (or a list) at the top of a file layers the file over
+    whole parent configs; `include: typography.yaml` (or a list), at the top
+    of a file, of one of its sections or of a `file_types` entry (see
+    `_include_scopes`), merges a shared fragment into that mapping. Directives are
+    applied in that order and the mapping's own keys override both; paths are
+    relative to the file containing them. Included files may use directives
+    themselves; a file that (indirectly) includes itself is an error.
+
+    Every file is parsed once per process through the parsed-config cache.
+    Resolved configs are memoized per file together with the content hashes
+    of every file in their include graph, and reused for as long as those
+    hashes still match, so a fragment shared by hundreds of configs is
+    resolved once. Resolved configs are read-only (see core/frozen.py).
+    """
+
+    def __init__(self):
+        self._resolved: Dict[str, Tuple[Tuple[Tuple[str, str], ...], FrozenDict]] = {}
+        self._lock = threading.Lock()
+
+    def _cached_entry(self, path: str, persistent: bool) -> Optional[Tuple[Tuple[Tuple[str, str], ...], FrozenDict]]:
+        entry = self._resolved.get(path)
+        if entry is None:
+            return None
+        try:
+            if all(_parsed_configs.digest(dep, persistent) == digest for dep, digest in entry[0]):
+                return entry
+        except OSError:
+            pass
+        return None
+
+    def cached(self, path: str, persistent: bool) -> Optional[FrozenDict]:
+        """The memoized resolution of `path` (absolute), if no file of its include graph has changed."""
+        entry = self._cached_entry(path, persistent)
+        return entry[1] if entry is not None else None
+
+    def resolve(self, path: str, persistent: bool, data: Any = None) -> FrozenDict:
+        """Resolves the file at `path` (absolute). `data` is its parsed content, if already loaded."""
+        return self._resolve(path, persistent, data, ())[1]
+
+    def _resolve(self, path: str, persistent: bool, data: Any,
+                 chain: Tuple[str, ...]) -> Tuple[Tuple[Tuple[str, str], ...], FrozenDict]:
+        """Returns ((path, sha256) of every file in the include graph, resolved config)."""
+        if path in chain:
+            cycle = " -> ".join(os.path.basename(p) for p in chain[chain.index(path):] + (path,))
+            raise ConfigIncludeError(f"Config include cycle: {cycle}")
+        entry = self._cached_entry(path, persistent)
+        if entry is not None:
+            return entry
+
+        if data is None:
+            data, digest = _parsed_configs.load_with_digest(path, persistent)
+        else:
+            digest = _parsed_configs.digest(path, persistent)
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise ConfigIncludeError(f"Config file {path} must contain a mapping to be extended or included.")
+        deps: Dict[str, str] = {path: digest}
+        scopes = {id(scope) for scope in _include_scopes(data)}
+        resolved = self._expand(data, os.path.dirname(path), chain + (path,), deps, persistent, scopes, root=True)
+        entry = (tuple(sorted(deps.items())), resolved)
+        with self._lock:
+            self._resolved[path] = entry
+        return entry
+
+    def _referenced(self, refs: Any, base_dir: str, directive: str, chain: Tuple[str, ...],
+                    deps: Dict[str, str], persistent: bool) -> FrozenDict:
+        if isinstance(refs, str):
+            refs = [refs]
+        if not isinstance(refs, list) or not all(isinstance(ref, str) and ref for ref in refs):
+            raise ConfigIncludeError(f"'{directive}' in {chain[-1]} must be a file path or a list of file paths, got {refs!r}.")
+        merged = FrozenDict()
+        for ref in refs:
+            target = os.path.abspath(os.path.join(base_dir, os.path.expanduser(ref)))
+            if not os.path.exists(target):
+                raise ConfigIncludeError(f"File '{ref}' referenced by '{directive}' in {chain[-1]} not found.")
+            target_deps, resolved = self._resolve(target, persistent, None, chain)
+            deps.update(target_deps)
+            merged = merge_configs(merged, resolved)
+        return merged
+
+    def _expand(self, value: Any, base_dir: str, chain: Tuple[str, ...], deps: Dict[str, str],
+                persistent: bool, scopes: Set[int], root: bool = False) -> Any:
+        """`scopes` holds the ids of the mappings whose `include` key is a directive."""
+        if isinstance(value, dict):
+            merged = FrozenDict()
+            if root and EXTENDS_KEY in value:
+                merged = self._referenced(value[EXTENDS_KEY], base_dir, EXTENDS_KEY, chain, deps, persistent)
+            directive = id(value) in scopes and INCLUDE_KEY in value
+            if directive:
+                merged = merge_configs(merged, self._referenced(value[INCLUDE_KEY], base_dir, INCLUDE_KEY, chain, deps, persistent))
+            own = {key: self._expand(item, base_dir, chain, deps, persistent, scopes)
+                   for key, item in value.items()
+                   if not (directive and key == INCLUDE_KEY) and not (root and key == EXTENDS_KEY)}
+            return merge_configs(merged, own)
+        if isinstance(value, list):
+            return freeze([self._expand(item, base_dir, chain, deps, persistent, scopes) for item in value])
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._resolved.clear()
+
+
+_resolved_configs = _IncludeResolver()
 
 class ConfigLoader:
     """
@@ -12,24 +258,43 @@ class ConfigLoader:
     """
     DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "default_config.yaml")
 
-    def __init__(self, default_config_path: str = None):
+    def __init__(self, default_config_path: str = None, persistent_cache: bool = None):
+        """
+        Parsed config files are cached per process (see `_ParsedConfigCache`).
+        With `persistent_cache` (default: the SYNTH_DATA_GEN_CONFIG_CACHE
+        environment variable), the parse result is also kept in a hidden pickle
+        next to each config file, for launchers that resolve the same configs
+        from many short-lived processes. Only enable it for config directories
+        you trust: the pickle is loaded as-is.
+        """
         if default_config_path is not None:
             self.default_config_path = default_config_path
         else:
             self.default_config_path = self.DEFAULT_CONFIG_PATH
+        if persistent_cache is None:
+            persistent_cache = os.environ.get(PERSISTENT_CACHE_ENV, "") == "1"
+        self.persistent_cache = persistent_cache
 
     def _load_single_config_file(self, file_path: str) -> dict:
         """Loads a single YAML config file.
         Raises FileNotFoundError if not found, or yaml.YAMLError for syntax issues.
-        Returns an empty dict if the YAML file is valid but empty."""
+        Returns an empty dict if the YAML file is valid but empty.
+        A file using `extends:`/`include:` directives is returned with them
+        resolved, as a read-only config (see `_IncludeResolver`); a cycle or a
+        missing referenced file raises ConfigIncludeError."""
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Configuration file not found at {file_path}")
+        path = os.path.abspath(file_path)
+        resolved = _resolved_configs.cached(path, self.persistent_cache)
+        if resolved is not None:
+            return resolved
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            return data if data is not None else {}
+            data = _parsed_configs.load(path, persistent=self.persistent_cache)
         except yaml.YAMLError as e:
             raise e
+        if _uses_directives(data):
+            return _resolved_configs.resolve(path, self.persistent_cache, data)
+        return data if data is not None else {}
 
     def load_config(self, file_path: str) -> dict:
         """
@@ -54,16 +319,13 @@ class ConfigLoader:
         """
         Recursively merges two dictionaries. `override` takes precedence.
         Lists in `override` replace lists in `base`.
+        Returns a read-only config sharing the subtrees of `base` that
+        `override` doesn't touch (see core/frozen.py); neither input is modified.
         """
-        merged = copy.deepcopy(base)
-        for key, value in override.items():
-            if isinstance(value, dict) and key in merged and isinstance(merged[key], dict):
-                merged[key] = self._merge_configs(merged[key], value)
-            else:
-                merged[key] = copy.deepcopy(value)
-        return merged
+        return merge_configs(base, override)
 
-    def load_and_validate_config(self, file_path: str = None, schema: dict = None) -> dict:
+    def load_and_validate_config(self, file_path: str = None, schema: dict = None,
+                                 config_path: str = None, config_override_object: dict = None) -> dict:
         """
         Loads configuration and validates it.
         1. Loads default configuration.
@@ -72,12 +334,24 @@ class ConfigLoader:
         4. If only default_config loaded, uses that.
         5. If only user_config loaded (no default_config found/loadable), uses that.
         6. If neither could be loaded, raises FileNotFoundError.
-        7. Validates the resulting effective_config against the schema if provided.
+        7. Validates the resulting effective_config against the schema if provided
+           (compiled once and cached, see core/schemas.py).
+
+        `config_path` is accepted as an alias of `file_path` (the name used by
+        `generate_data`). `config_override_object`, if given, is merged over the
+        result of steps 1-5 and satisfies step 6 on its own.
+
+        The result is read-only (a `FrozenDict`, see core/frozen.py), so it can be
+        shared between threads and documents; derive changed copies with
+        `_merge_configs`.
         """
+        if file_path is None:
+            file_path = config_path
+
         default_config = self.get_default_config() # Returns {} if issues
         user_config = {}
         user_config_loaded_successfully = False
-        
+
         if file_path:
             # load_config is strict and will raise FileNotFoundError or YAMLError if applicable
             user_config = self.load_config(file_path) 
@@ -91,18 +365,25 @@ class ConfigLoader:
                 effective_config = user_config
         elif default_config: # No user_file_path provided, use default if it was loaded
             effective_config = default_config
+        elif config_override_object is not None: # Only an in-memory config object was given
+            effective_config = {}
         else: # No user config was loaded (no path, or path failed) AND no default config
             # This means file_path was None, and get_default_config() returned {}
             raise FileNotFoundError(
                 "No configuration file path provided and default configuration could not be loaded."
             )
 
+        if config_override_object is not None:
+            effective_config = self._merge_configs(effective_config, config_override_object)
+        effective_config = freeze(effective_config)
+
         if schema:
-            jsonschema.validate(instance=effective_config, schema=schema)
+            validate(effective_config, schema)
         return effective_config
 
     def get_generator_config(self, full_config: dict, section_name: str) -> dict:
         """
         Retrieves a specific generator's configuration section from the full config.
+        Sections of a loaded config are read-only, like the config itself.
         """
-        return full_config.get(section_name, {})
\ No newline at end of file
+        return full_config.get(section_name, FrozenDict())
\ No newline at end of file
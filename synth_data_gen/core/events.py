@@ -0,0 +1,430 @@
+"""
+Generation events and metrics.
+
+A run reports what it does as `Event`s: one "file_finished" per document (its
+duration, bytes written, per-phase durations, element counts, warnings and
+error), "warning"s, "progress" lines ("Generating ...", "Skipping ..."), and
+"run_started"/"run_finished" around the whole run.
+Listeners are callables taking an `Event`. They are attached for one run
+(`generate_data(..., listeners=[...])`, or a `metrics:` config block, see
+`listeners_from_config`) or for the whole process (`subscribe`). A run's own
+listeners live in its `Dispatcher`, which is active (a context variable)
+only while the run is working, so concurrent runs on other threads or asyncio
+tasks don't see each other's events. Three listeners come with the package:
+
+    LoggingListener              one log record per event
+    PrometheusTextfileListener   a node_exporter textfile, rewritten per run
+    GenerationReport             an in-memory aggregate of the run
+
+While a work item is being generated, its phases, counts and warnings are
+collected into the item's `FileMetrics` instead of being emitted one by one:
+a pool worker has no listeners, so they travel back to the parent with the
+item's `GenerationResult`, which emits a single "file_finished" for it.
+
+With no listener attached (and no trace being recorded, see tracing.py)
+nothing is collected: `phase()` and `count()` are a few attribute lookups,
+and `warn()` and `progress()` print as before (progress not in a run
+configured with `quiet: true`).
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import tracing
+
+Listener = Callable[["Event"], None]
+
+_listeners: List[Listener] = []
+_listeners_lock = threading.Lock()
+# The Dispatcher of the run working in this context, if it has one.
+_run = contextvars.ContextVar("synth_data_gen_run", default=None)
+# The FileMetrics of the work item being generated on this thread, if it collects any.
+_active = threading.local()
+
+
+@dataclass
+class Event:
+    """Something that happened during a run. Unused fields keep their defaults."""
+    kind: str # "run_started", "file_finished", "phase", "warning", "progress" or "run_finished"
+    file_type: Optional[str] = None
+    path: Optional[str] = None
+    phase: Optional[str] = None
+    duration: float = 0.0
+    bytes: int = 0
+    phases: Dict[str, float] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    warnings: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    message: Optional[str] = None
+    skipped: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class FileMetrics:
+    """What was measured while one work item was generated; picklable, so it can leave a worker process."""
+    phases: Dict[str, float] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    warnings: List[str] = field(default_factory=list)
+
+    def add_phase(self, name: str, duration: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def add_count(self, name: str, n: int) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+
+def subscribe(listener: Listener) -> Listener:
+    """Attaches `listener` to every run in this process. Returns it, so it can be used as a decorator."""
+    with _listeners_lock:
+        _listeners.append(listener)
+    return listener
+
+
+def unsubscribe(listener: Listener) -> None:
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def _deliver(listeners: List[Listener], event: Event) -> None:
+    for listener in listeners:
+        try:
+            listener(event)
+        except Exception as e:
+            print(f"Warning: Metrics listener {listener!r} failed on a '{event.kind}' event: {e}")
+
+
+class Dispatcher:
+    """
+    The listeners of one run. Its events go to them and to the process-wide
+    subscribers; while it is `active`, so do the events emitted through
+    `emit`, `phase`, `warn` and `progress` in that thread or task. A `quiet`
+    run doesn't print progress lines when nobody listens.
+    """
+
+    def __init__(self, listeners: Optional[List[Listener]] = None, quiet: bool = False):
+        self.listeners = list(listeners or [])
+        self.quiet = quiet
+
+    def has_listeners(self) -> bool:
+        return bool(self.listeners) or bool(_listeners)
+
+    def emit(self, event: Event) -> None:
+        """Hands `event` to the run's listeners and the subscribers. A failing listener is reported but doesn't stop the run."""
+        _deliver(self.listeners + list(_listeners), event)
+
+    @contextmanager
+    def active(self) -> Iterator["Dispatcher"]:
+        """Makes this the current run's dispatcher for the enclosed block."""
+        token = _run.set(self)
+        try:
+            yield self
+        finally:
+            _run.reset(token)
+
+    def advancing(self, iterable: Iterable[Any]) -> Iterator[Any]:
+        """
+        Hands on `iterable`'s items, being active while each one is produced
+        but not while the consumer holds it (a generator suspended inside
+        `active` would leave it current in the consumer's context).
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.active():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+@contextmanager
+def listening(listeners: Optional[List[Listener]]) -> Iterator[None]:
+    """Attaches `listeners` to what runs in the enclosed block, in this thread or task only."""
+    with Dispatcher(listeners).active():
+        yield
+
+
+def _current_listeners() -> List[Listener]:
+    dispatcher = _run.get()
+    return (dispatcher.listeners if dispatcher is not None else []) + list(_listeners)
+
+
+def has_listeners() -> bool:
+    dispatcher = _run.get()
+    return bool(_listeners) or (dispatcher is not None and bool(dispatcher.listeners))
+
+
+def emit(event: Event) -> None:
+    """Hands `event` to the current run's listeners and the subscribers. A failing listener is reported but doesn't stop the run."""
+    _deliver(_current_listeners(), event)
+
+
+def current_metrics() -> Optional[FileMetrics]:
+    """The metrics of the work item being generated on this thread, if it collects any."""
+    return getattr(_active, "metrics", None)
+
+
+@contextmanager
+def collecting(enabled: bool = True) -> Iterator[Optional[FileMetrics]]:
+    """Collects the enclosed phases, counts and warnings into a new `FileMetrics` (None if not `enabled`)."""
+    if not enabled:
+        yield None
+        return
+    previous = getattr(_active, "metrics", None)
+    _active.metrics = metrics = FileMetrics()
+    try:
+        yield metrics
+    finally:
+        _active.metrics = previous
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Times the enclosed block as phase `name` of the current document (or as a
+    "phase" event), and as a trace span while one is recorded (see tracing.py).
+    """
+    metrics = getattr(_active, "metrics", None)
+    spans = tracing.current_spans()
+    if metrics is None and spans is None and not has_listeners():
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        if spans is not None:
+            tracing.add_span(spans, name, start, end)
+        duration = (end - start) / 1e9
+        if metrics is not None:
+            metrics.add_phase(name, duration)
+        elif has_listeners():
+            emit(Event("phase", phase=name, duration=duration))
+
+
+def count(name: str, n: int) -> None:
+    """Adds `n` elements of kind `name` to the current document's counts. Outside a work item this does nothing."""
+    metrics = getattr(_active, "metrics", None)
+    if metrics is not None:
+        metrics.add_count(name, n)
+
+
+def warn(message: str) -> None:
+    """Reports a non-fatal problem: to the current document's metrics, else to listeners, else stdout."""
+    metrics = getattr(_active, "metrics", None)
+    if metrics is not None:
+        metrics.warnings.append(message)
+    elif has_listeners():
+        emit(Event("warning", message=message))
+    else:
+        print(message)
+
+
+def progress(message: str) -> None:
+    """Reports a per-file progress line: to listeners, else stdout unless the current run is quiet."""
+    if has_listeners():
+        emit(Event("progress", message=message))
+        return
+    dispatcher = _run.get()
+    if dispatcher is None or not dispatcher.quiet:
+        print(message)
+
+
+def file_event(result: Any) -> Event:
+    """The "file_finished" event of a `GenerationResult`."""
+    metrics = result.metrics
+    return Event(
+        "file_finished",
+        file_type=result.file_type,
+        path=result.path,
+        duration=result.elapsed,
+        bytes=result.bytes,
+        phases=metrics.phases if metrics is not None else {},
+        counts=metrics.counts if metrics is not None else {},
+        warnings=metrics.warnings if metrics is not None else [],
+        error=None if result.error is None else f"{type(result.error).__name__}: {result.error}",
+        skipped=result.skipped,
+    )
+
+
+class LoggingListener:
+    """Logs every event through `logger` (default: the "synth_data_gen" logger)."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("synth_data_gen")
+        self.level = level
+
+    def __call__(self, event: Event) -> None:
+        if event.kind == "file_finished":
+            if event.error is not None:
+                self.logger.error("Failed %s %s: %s", event.file_type, event.path, event.error)
+            else:
+                self.logger.log(self.level, "%s %s %s (%d bytes, %.3fs)", "Kept" if event.skipped else "Generated",
+                                event.file_type, event.path, event.bytes, event.duration)
+            for message in event.warnings:
+                self.logger.warning("%s: %s", event.path, message)
+        elif event.kind == "warning":
+            self.logger.warning("%s", event.message)
+        elif event.kind == "phase":
+            self.logger.debug("Phase %s took %.3fs", event.phase, event.duration)
+        elif event.kind == "progress":
+            self.logger.debug("%s", event.message)
+        elif event.kind == "run_started":
+            self.logger.log(self.level, "Generation started: %s", event.message)
+        elif event.kind == "run_finished":
+            self.logger.log(self.level, "Generation finished in %.3fs: %s", event.duration, event.message)
+
+
+@dataclass
+class GenerationReport:
+    """
+    Listener aggregating a run in memory:
+
+        report = GenerationReport()
+        generate_data("config.yaml", listeners=[report])
+        print(report.files, report.bytes, report.phase_seconds)
+    """
+    files: int = 0
+    failures: int = 0
+    skipped: int = 0
+    bytes: int = 0
+    duration: float = 0.0 # wall time of the run, once it has finished
+    files_by_type: Dict[str, int] = field(default_factory=dict)
+    bytes_by_type: Dict[str, int] = field(default_factory=dict)
+    seconds_by_type: Dict[str, float] = field(default_factory=dict)
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    element_counts: Dict[str, int] = field(default_factory=dict)
+    errors: List[Tuple[str, str]] = field(default_factory=list) # (path, error)
+    warnings: List[str] = field(default_factory=list)
+
+    def __call__(self, event: Event) -> None:
+        if event.kind == "file_finished":
+            self._add_file(event)
+        elif event.kind == "phase":
+            self.phase_seconds[event.phase] = self.phase_seconds.get(event.phase, 0.0) + event.duration
+        elif event.kind == "warning":
+            self.warnings.append(event.message)
+        elif event.kind == "run_finished":
+            self.duration += event.duration
+
+    def _add_file(self, event: Event) -> None:
+        self.warnings.extend(event.warnings)
+        if event.error is not None:
+            self.failures += 1
+            self.errors.append((event.path, event.error))
+            return
+        if event.skipped:
+            self.skipped += 1
+            return
+        file_type = event.file_type
+        self.files += 1
+        self.bytes += event.bytes
+        self.files_by_type[file_type] = self.files_by_type.get(file_type, 0) + 1
+        self.bytes_by_type[file_type] = self.bytes_by_type.get(file_type, 0) + event.bytes
+        self.seconds_by_type[file_type] = self.seconds_by_type.get(file_type, 0.0) + event.duration
+        for name, duration in event.phases.items():
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + duration
+        for name, n in event.counts.items():
+            self.element_counts[name] = self.element_counts.get(name, 0) + n
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.duration if self.duration else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.files} files ({self.bytes} bytes) generated, {self.skipped} kept, {self.failures} failed"
+                f" in {self.duration:.2f}s.")
+
+
+def _prometheus_labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class PrometheusTextfileListener:
+    """
+    Aggregates a run like `GenerationReport` and, when it finishes, writes the
+    totals to `path` in the Prometheus text format, for node_exporter's
+    textfile collector. The file is replaced atomically.
+    """
+
+    def __init__(self, path: str, prefix: str = "synth_data_gen"):
+        self.path = path
+        self.prefix = prefix
+        self.report = GenerationReport()
+
+    def __call__(self, event: Event) -> None:
+        if event.kind == "run_started":
+            self.report = GenerationReport()
+        self.report(event)
+        if event.kind == "run_finished":
+            self.write()
+
+    def render(self) -> str:
+        report, prefix = self.report, self.prefix
+        lines: List[str] = []
+
+        def metric(name: str, metric_type: str, help_text: str, samples: List[Tuple[str, float]]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            lines.extend(f"{prefix}_{name}{labels} {value}" for labels, value in samples)
+
+        metric("files_total", "counter", "Documents generated, by type.",
+               [(_prometheus_labels(file_type=t), n) for t, n in sorted(report.files_by_type.items())])
+        metric("bytes_total", "counter", "Bytes written, by type.",
+               [(_prometheus_labels(file_type=t), n) for t, n in sorted(report.bytes_by_type.items())])
+        metric("file_seconds_total", "counter", "Time spent generating documents, by type.",
+               [(_prometheus_labels(file_type=t), s) for t, s in sorted(report.seconds_by_type.items())])
+        metric("phase_seconds_total", "counter", "Time spent in each generation phase.",
+               [(_prometheus_labels(phase=p), s) for p, s in sorted(report.phase_seconds.items())])
+        metric("elements_total", "counter", "Elements drawn, by element kind.",
+               [(_prometheus_labels(element=e), n) for e, n in sorted(report.element_counts.items())])
+        metric("failures_total", "counter", "Documents that failed to generate.", [("", report.failures)])
+        metric("skipped_total", "counter", "Documents kept because they were up to date.", [("", report.skipped)])
+        metric("warnings_total", "counter", "Warnings reported.", [("", len(report.warnings))])
+        metric("run_duration_seconds", "gauge", "Wall time of the last run.", [("", report.duration)])
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write metrics textfile {self.path}: {e}")
+
+
+def listeners_from_config(spec: Optional[Dict[str, Any]]) -> List[Listener]:
+    """
+    Builds listeners from a `metrics` config block:
+
+        metrics:
+          log: true                                   # or a level name, e.g. DEBUG
+          prometheus_textfile: /var/lib/node_exporter/synth_data_gen.prom
+    """
+    if not spec:
+        return []
+    if not isinstance(spec, dict):
+        raise ValueError(f"'metrics' must be a mapping, got {spec!r}.")
+    listeners: List[Listener] = []
+    log = spec.get("log")
+    if log:
+        level = logging.getLevelName(log.upper()) if isinstance(log, str) else logging.INFO
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level {log!r} in 'metrics.log'.")
+        listeners.append(LoggingListener(level=level))
+    textfile = spec.get("prometheus_textfile")
+    if textfile:
+        listeners.append(PrometheusTextfileListener(textfile))
+    return listeners
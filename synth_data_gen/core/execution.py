@@ -0,0 +1,318 @@
+"""
+Execution backends for running planned generation work items.
+
+`generate_data` turns the loaded configuration into a sequence of `WorkItem`s,
+one per output file. Those items can be run one after another in the calling
+process, or fanned out to a pool of worker processes.
+
+`execute_work_items_async` is the asyncio counterpart, for callers that
+already run inside an event loop.
+"""
+import contextvars
+import functools
+import hashlib
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from .base import BaseGenerator
+from .events import FileMetrics, collecting
+from .tracing import Span, recording, span
+from .manifest import file_checksum
+from .profiling import ProfileSettings, profiled
+from .seeding import seeded
+
+if TYPE_CHECKING:
+    import asyncio # imported where needed: it costs more start-up time than the rest of the package
+
+
+@dataclass
+class WorkItem:
+    """A single (file_type, index) unit of generation work."""
+    file_type: str
+    index: int
+    generator_cls: Type[BaseGenerator]
+    specific_config: Dict[str, Any]
+    global_settings: Dict[str, Any]
+    output_path: str
+    count: int = 1 # number of items planned for this file type, for progress messages
+    seed: Optional[int] = None # this file's RNG seed, derived from global_settings.base_seed (see seeding.py)
+    in_memory: bool = False # render to bytes for an OutputSink instead of writing output_path (see sinks.py)
+    collect_metrics: bool = False # collect phases, element counts and warnings into the result (see events.py)
+    trace: bool = False # record trace spans into the result (see tracing.py)
+    profile: Optional[ProfileSettings] = None # set for items sampled for profiling (see profiling.py)
+    profile_path: Optional[str] = None # where the item's profile reports go, without suffix
+
+
+@dataclass
+class GenerationResult:
+    """
+    Outcome of one work item, small enough to stream for very large corpora.
+    If generation failed, `error` is set and `path` is the intended output path.
+    """
+    path: str
+    file_type: str
+    index: int
+    bytes: int
+    elapsed: float
+    error: Optional[BaseException] = None
+    checksum: Optional[str] = None # sha256 of the output file, if one was written
+    skipped: bool = False # True if the file was already up to date (see manifest.py)
+    data: Optional[bytes] = None # the document, for in-memory items until it is handed to the sink
+    metrics: Optional[FileMetrics] = None # set for items planned with collect_metrics
+    trace: Optional[List[Span]] = None # set for items planned with trace
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _output_stats(path: Any) -> Tuple[int, Optional[str]]:
+    """Size and checksum of a generated file, or (0, None) if there is no such file."""
+    if isinstance(path, str) and os.path.isfile(path):
+        return os.path.getsize(path), file_checksum(path)
+    return 0, None
+
+
+def execute_work_item(item: WorkItem, generator: BaseGenerator) -> GenerationResult:
+    """Runs one work item with the given generator instance and times it."""
+    if not (item.collect_metrics or item.trace or item.profile):
+        return _execute_work_item(item, generator)
+    with collecting(item.collect_metrics) as metrics, recording(item.trace) as spans:
+        with span(f"{item.file_type} {item.index}", path=item.output_path), profiled(item.profile, item.profile_path):
+            result = _execute_work_item(item, generator)
+    result.metrics = metrics
+    result.trace = spans
+    return result
+
+
+def _execute_work_item(item: WorkItem, generator: BaseGenerator) -> GenerationResult:
+    start = time.perf_counter()
+    try:
+        with seeded(item.seed):
+            if item.in_memory:
+                data = generator.render(item.specific_config, item.global_settings)
+            else:
+                generated_path = generator.generate(item.specific_config, item.global_settings, item.output_path)
+    except Exception as e:
+        return GenerationResult(item.output_path, item.file_type, item.index, 0, time.perf_counter() - start, e)
+    elapsed = time.perf_counter() - start
+    if item.in_memory:
+        return GenerationResult(item.output_path, item.file_type, item.index, len(data), elapsed,
+                                checksum=hashlib.sha256(data).hexdigest(), data=data)
+    size, checksum = _output_stats(generated_path)
+    return GenerationResult(generated_path, item.file_type, item.index, size, elapsed, checksum=checksum)
+
+
+# Generator instances owned by the current worker process, keyed by class.
+# Unpickling a work item's `generator_cls` imports its module (and with it
+# reportlab or ebooklib) the first time a worker sees that type, so workers
+# only pay for the generators the run actually uses.
+_WORKER_GENERATORS: Dict[Type[BaseGenerator], BaseGenerator] = {}
+
+
+def _get_worker_generator(generator_cls: Type[BaseGenerator]) -> BaseGenerator:
+    generator = _WORKER_GENERATORS.get(generator_cls)
+    if generator is None:
+        generator = generator_cls()
+        _WORKER_GENERATORS[generator_cls] = generator
+    return generator
+
+
+def run_work_item(item: WorkItem) -> GenerationResult:
+    """
+    Runs one work item inside a worker process.
+    Failures are captured in the returned result, so errors can be reported by
+    the parent exactly like the serial path does.
+    """
+    try:
+        generator = _get_worker_generator(item.generator_cls)
+    except Exception as e:
+        return GenerationResult(item.output_path, item.file_type, item.index, 0, 0.0, e)
+    return execute_work_item(item, generator)
+
+
+def resolve_max_workers(max_workers: Any, setting_name: str = "max_workers") -> int:
+    """
+    Normalises a `max_workers` (or similar concurrency) setting.
+    None or 1 means serial execution; 0 means one worker per CPU.
+    Invalid values fall back to 1 with a warning.
+    """
+    if max_workers is None:
+        return 1
+    if isinstance(max_workers, bool) or not isinstance(max_workers, int) or max_workers < 0:
+        print(f"Warning: Invalid '{setting_name}' value: {max_workers}. Defaulting to 1.")
+        return 1
+    if max_workers == 0:
+        return os.cpu_count() or 1
+    return max_workers
+
+
+def iter_parallel(items: Iterable[WorkItem], max_workers: int, ordered: bool = False,
+                  max_pending: Optional[int] = None) -> Iterator[GenerationResult]:
+    """
+    Runs work items on a process pool and yields their results.
+
+    `items` is consumed lazily and at most `max_pending` items (default: twice
+    the worker count) are in flight at once, so memory stays flat however many
+    items there are. Results are yielded as they complete, or in submission
+    order if `ordered` is True.
+    """
+    if max_pending is None:
+        max_pending = 2 * max_workers
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+
+        def _fill():
+            while len(pending) < max_pending:
+                item = next(items, None)
+                if item is None:
+                    return
+                pending.append((item, pool.submit(run_work_item, item)))
+
+        def _collect(item, future) -> GenerationResult:
+            try:
+                return future.result()
+            except Exception as e: # e.g. BrokenProcessPool or an unpicklable result
+                return GenerationResult(item.output_path, item.file_type, item.index, 0, 0.0, e)
+
+        try:
+            _fill()
+            while pending:
+                if ordered:
+                    item, future = pending.popleft()
+                    yield _collect(item, future)
+                else:
+                    wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                    still_pending = deque()
+                    for item, future in pending:
+                        if future.done():
+                            yield _collect(item, future)
+                        else:
+                            still_pending.append((item, future))
+                    pending = still_pending
+                _fill()
+        finally:
+            # If the consumer stops early, don't start work nobody will collect.
+            for _, future in pending:
+                future.cancel()
+
+
+def _discard_cancelled_output(output_path: str, future: Future) -> None:
+    """
+    Done-callback for a work item whose task was cancelled after its thread had
+    already started. The thread can't be interrupted, so once it finishes the
+    file it wrote is removed; a cancelled run leaves no output behind.
+    """
+    if os.path.isfile(output_path):
+        try:
+            os.remove(output_path)
+        except OSError as e:
+            print(f"Warning: Could not remove output of cancelled item {output_path}: {e}")
+
+
+def _call_seeded(seed: Optional[int], fn, *args):
+    """Runs fn(*args) on an executor thread with `seed`'s RNG stream active."""
+    with seeded(seed):
+        return fn(*args)
+
+
+def _submit(executor: Executor, fn, *args) -> Future:
+    """
+    executor.submit(fn, *args), run in a copy of the caller's context on thread
+    executors, so the calls see the run's listeners (see events.py) like the
+    awaiting task does.
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        return executor.submit(fn, *args)
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+async def _execute_work_item_async(item: WorkItem, generator: BaseGenerator, executor: Executor,
+                                   slots: "asyncio.Semaphore") -> GenerationResult:
+    """
+    Runs one work item on `executor`. The caller has already acquired one of
+    `slots` for it; the slot is held until the document has been rendered and
+    written, and is always released here.
+
+    Generators that split generate() into render_content()/write_content()
+    (currently Markdown) are run as two executor calls, so a cancellation
+    between the two skips the write entirely.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    future: Optional[Future] = None
+    try:
+        if hasattr(generator, "render_content") and hasattr(generator, "write_content"):
+            future = _submit(executor, _call_seeded, item.seed, generator.render_content, item.specific_config, item.global_settings)
+            content = await asyncio.wrap_future(future, loop=loop)
+            future = _submit(executor, generator.write_content, content, item.output_path)
+        else:
+            future = _submit(executor, _call_seeded, item.seed, generator.generate, item.specific_config, item.global_settings, item.output_path)
+        generated_path = await asyncio.wrap_future(future, loop=loop)
+        elapsed = time.perf_counter() - start
+        future = None # the file is complete; a cancellation from here on keeps it
+        size, checksum = await asyncio.wrap_future(executor.submit(_output_stats, generated_path), loop=loop)
+    except asyncio.CancelledError:
+        if future is not None and not future.cancel():
+            future.add_done_callback(functools.partial(_discard_cancelled_output, item.output_path))
+        raise
+    except Exception as e:
+        return GenerationResult(item.output_path, item.file_type, item.index, 0, time.perf_counter() - start, e)
+    finally:
+        slots.release()
+    return GenerationResult(generated_path, item.file_type, item.index, size, elapsed, checksum=checksum)
+
+
+async def execute_work_items_async(planned: Iterable[Tuple[WorkItem, BaseGenerator]], max_concurrency: int,
+                                   executor: Optional[Executor] = None) -> List[GenerationResult]:
+    """
+    Runs (WorkItem, generator) pairs on an executor from inside an event loop.
+
+    A single semaphore caps the work: at most `max_concurrency` documents are
+    being rendered or written at once, and the plan is only advanced (on the
+    loop's default executor, since planning instantiates generators and creates
+    directories) when a slot frees up. Without an explicit `executor`, a thread
+    pool of `max_concurrency` threads is created and shut down here.
+
+    If the awaiting task is cancelled, every in-flight item is cancelled too and
+    no further items are planned. Items that have not started yet never run.
+    An item whose thread is already running can't be interrupted: it runs to
+    completion in the background and the file it wrote is then deleted.
+    Results are returned in plan order.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_concurrency)
+    owned_executor = None
+    if executor is None:
+        executor = owned_executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    planned = iter(planned)
+    tasks: List["asyncio.Future"] = []
+    try:
+        while True:
+            await slots.acquire()
+            pair = await loop.run_in_executor(None, contextvars.copy_context().run, next, planned, None)
+            if pair is None:
+                slots.release()
+                break
+            item, generator = pair
+            tasks.append(asyncio.ensure_future(_execute_work_item_async(item, generator, executor, slots)))
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        # Let the tasks run their cancellation handlers before the executor goes away.
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if owned_executor is not None:
+            owned_executor.shutdown(wait=False)
@@ -0,0 +1,95 @@
+"""
+Read-only configs with structural sharing.
+
+`ConfigLoader` returns configs as `FrozenDict`/`FrozenList` trees: real
+`dict`/`list` subclasses (so jsonschema, json and equality with plain dicts
+behave as before) whose mutating methods raise `TypeError`. Because nothing
+can change them, merging an override shares every subtree the override
+doesn't touch instead of deep-copying it: the cost of `merge_configs` is the
+size of the touched levels plus the override itself, not of the whole
+config, and one config object can be handed to any number of threads or
+documents.
+
+To change a config, derive a new one with `merge_configs(config, {...})`,
+or `thaw()` it into plain mutable containers. `copy.deepcopy` also thaws.
+"""
+from typing import Any, Dict, Mapping
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> None:
+    raise TypeError(f"{type(self).__name__} is read-only; derive a changed copy with merge_configs() or thaw().")
+
+
+class FrozenDict(dict):
+    """A dict that can't be modified after construction. Values are frozen too (see `freeze`)."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __reduce__(self):
+        # dict's default pickling rebuilds the dict item by item through __setitem__.
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return thaw(self)
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """A list that can't be modified after construction."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    __iadd__ = __imul__ = _read_only
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> list:
+        return thaw(self)
+
+
+def freeze(value: Any) -> Any:
+    """Returns `value` with every dict and list in it made read-only. Frozen subtrees are reused as is."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Returns a plain, mutable deep copy of a (possibly frozen) config value."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def merge_configs(base: Mapping[str, Any], override: Mapping[str, Any]) -> FrozenDict:
+    """
+    Recursively merges `override` over `base` into a new frozen config.
+    Nested dicts merge; anything else in `override` (including lists)
+    replaces the value in `base`. Neither argument is modified, and subtrees
+    of `base` that `override` doesn't touch are shared, not copied.
+    """
+    merged = dict(freeze(base))
+    for key, value in override.items():
+        current = merged.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            merged[key] = merge_configs(current, value)
+        else:
+            merged[key] = freeze(value)
+    return FrozenDict(merged)
@@ -0,0 +1,65 @@
+"""
+Output directory layout.
+
+A run writes into the output base directory and one subdirectory per
+`file_types` entry (`output_subdir`, default "<type>s"); generators only need
+the parent directory of the file they write. `OutputLayout` is the per-run
+registry of those directories: they are declared up front and created
+lazily, the first time an item actually lands in them, so entries with no
+items in this shard (or a run writing to an archive sink) create nothing.
+
+`ensure_directory` remembers every directory it has created in a
+process-local cache, so the per-file calls in generators cost a set lookup
+instead of an `os.makedirs` after the first file. Deleting a cached
+directory behind the cache's back is not noticed; a new `OutputLayout`
+forgets the directories under its base, so every run starts from the disk.
+"""
+import os
+import threading
+from typing import Dict, Set
+
+_created_dirs: Set[str] = set()
+_lock = threading.Lock()
+
+
+def ensure_directory(path: str) -> str:
+    """Creates `path` (and its parents) unless this process already has. Returns `path`."""
+    key = os.path.abspath(path)
+    if key in _created_dirs:
+        return path
+    os.makedirs(path, exist_ok=True)
+    with _lock:
+        _created_dirs.add(key)
+    return path
+
+
+def forget_directories(base_dir: str) -> None:
+    """Drops `base_dir` and everything below it from the cache of created directories."""
+    base = os.path.abspath(base_dir)
+    prefix = base.rstrip(os.sep) + os.sep
+    with _lock:
+        _created_dirs.difference_update([d for d in _created_dirs if d == base or d.startswith(prefix)])
+
+
+class OutputLayout:
+    """The directories one run writes into, keyed by name (usually an output subdir)."""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self._dirs: Dict[str, str] = {}
+        forget_directories(base_dir)
+
+    def register(self, subdir: str) -> str:
+        """Declares `subdir` (relative to the base) and returns its path, without creating it."""
+        path = self._dirs.get(subdir)
+        if path is None:
+            path = self._dirs[subdir] = os.path.join(self.base_dir, subdir)
+        return path
+
+    def ensure(self, subdir: str = "") -> str:
+        """Returns the path of `subdir` (the base itself by default), creating it on first use."""
+        return ensure_directory(self.register(subdir) if subdir else self.base_dir)
+
+    @property
+    def directories(self) -> Dict[str, str]:
+        return dict(self._dirs)
@@ -0,0 +1,226 @@
+"""
+Content-addressed generation manifest.
+
+With `resume` or the root config key `manifest: true`, every generated file
+gets one JSON line in `.synth_manifest.jsonl` under the output base
+directory, recording what it was generated from (hashes of the resolved
+specific config and global settings, the seed, the generator id and
+version) and what was written (size and sha256 checksum). A rerun with
+`resume` enabled skips any work item whose key matches a recorded entry and
+whose output still has the recorded checksum, so reruns after a crash or a
+small config edit only regenerate what actually changed.
+
+Entries are appended as files are written, so a crashed run keeps what it
+recorded; the file is compacted to one line per output when the run closes it.
+Runs writing to an archive (see sinks.py) add the manifest to the archive as
+its last member instead.
+"""
+import hashlib
+import json
+import os
+from collections import deque
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from .events import progress
+
+if TYPE_CHECKING: # execution imports file_checksum from here
+    from .execution import GenerationResult, WorkItem
+
+MANIFEST_FILENAME = ".synth_manifest.jsonl"
+
+
+def manifest_filename(shard: Optional[Tuple[int, int]] = None) -> str:
+    """
+    Name of the manifest file. Sharded runs each keep their own manifest, so
+    shard output directories can be merged without the manifests clobbering
+    each other.
+    """
+    if shard is None:
+        return MANIFEST_FILENAME
+    shard_index, shard_count = shard
+    return f".synth_manifest.shard-{shard_index}-of-{shard_count}.jsonl"
+
+
+def _hash_json(value: Any) -> str:
+    # default=str keeps non-JSON values (e.g. dates from YAML) hashable, if not portable.
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def file_checksum(path: str, chunk_size: int = 1 << 20) -> str:
+    """Returns the hex sha256 of the file at `path`."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GenerationManifest:
+    """
+    Reads and appends the manifest of one output base directory.
+
+    Entries are keyed by output path relative to the base directory; appending
+    a new entry for a path supersedes the older one. A manifest that isn't
+    `enabled` neither reads nor writes anything and never reports an item as
+    up to date. An `in_memory` manifest (for output sinks) starts empty and
+    only collects entries, for `dumps()`.
+    """
+
+    def __init__(self, base_output_dir: str, filename: str = MANIFEST_FILENAME, enabled: bool = True,
+                 in_memory: bool = False):
+        self.base_output_dir = base_output_dir
+        self.filename = filename
+        self.path = os.path.join(base_output_dir, filename)
+        self.in_memory = in_memory
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        self._disabled = not enabled
+        self._lines = 0 # lines in the manifest file, superseded and malformed ones included
+        # Items handed on by track() whose results haven't been recorded yet, by output path.
+        self._pending: Dict[str, Tuple["WorkItem", Dict[str, Any]]] = {}
+        # Results for items track() found up to date, waiting to be reported.
+        self.skipped: deque = deque()
+        if enabled and not in_memory:
+            self._load()
+
+    def _load(self) -> None:
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                self._lines += 1
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry["path"]] = entry
+                except (ValueError, KeyError, TypeError):
+                    # A run killed mid-write can leave a truncated last line.
+                    print(f"Warning: Ignoring malformed manifest line {line_number} in {self.path}.")
+
+    def _relpath(self, output_path: str) -> str:
+        return os.path.relpath(output_path, self.base_output_dir).replace(os.sep, "/")
+
+    @staticmethod
+    def item_fields(item: "WorkItem") -> Dict[str, Any]:
+        """The inputs that determine a work item's output, and the key derived from them."""
+        generator_cls = item.generator_cls
+        fields = {
+            "file_type": item.file_type,
+            "index": item.index,
+            "specific_config_hash": _hash_json(item.specific_config),
+            "global_settings_hash": _hash_json(item.global_settings),
+            "seed": item.seed,
+            "generator": getattr(generator_cls, "GENERATOR_ID", getattr(generator_cls, "__name__", str(generator_cls))),
+            "generator_version": str(getattr(generator_cls, "GENERATOR_VERSION", "")),
+        }
+        fields["key"] = _hash_json(fields)
+        return fields
+
+    def is_current(self, item: "WorkItem", key: Optional[str] = None) -> bool:
+        """
+        True if `item` was generated before from identical inputs and its output
+        file still exists with the recorded size and checksum.
+        """
+        entry = self.entries.get(self._relpath(item.output_path))
+        if entry is None:
+            return False
+        if key is None:
+            key = self.item_fields(item)["key"]
+        if entry.get("key") != key:
+            return False
+        try:
+            return (os.path.getsize(item.output_path) == entry.get("bytes")
+                    and file_checksum(item.output_path) == entry.get("checksum"))
+        except OSError:
+            return False
+
+    def record(self, item: "WorkItem", result: "GenerationResult", fields: Optional[Dict[str, Any]] = None) -> None:
+        """Appends an entry for a successfully generated item. Failures are not recorded."""
+        if self._disabled or not result.ok:
+            return
+        if not self.in_memory and not (isinstance(result.path, str) and os.path.isfile(result.path)):
+            return
+        entry = dict(fields if fields is not None else self.item_fields(item))
+        entry["path"] = self._relpath(item.output_path)
+        entry["bytes"] = result.bytes
+        entry["checksum"] = result.checksum or file_checksum(result.path)
+        if self.in_memory:
+            self.entries[entry["path"]] = entry
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry, sort_keys=True, default=str) + "\n")
+            # Flushed per entry so a crash loses at most the item being written.
+            self._file.flush()
+        except OSError as e:
+            print(f"Warning: Could not write generation manifest {self.path}: {e}. Continuing without it.")
+            self._disabled = True
+            return
+        self._lines += 1
+        self.entries[entry["path"]] = entry
+
+    def track(self, planned: Iterable[Tuple["WorkItem", Any]], resume: bool = False) -> Iterator[Tuple["WorkItem", Any]]:
+        """
+        Passes (WorkItem, generator) pairs through, remembering each item's
+        manifest fields so record_result() can write its entry. With `resume`,
+        items that are already up to date are not passed on; a skipped
+        `GenerationResult` is queued on `self.skipped` for each instead.
+        """
+        from .execution import GenerationResult
+
+        if self._disabled:
+            yield from planned
+            return
+        for item, generator in planned:
+            fields = self.item_fields(item)
+            if resume and self.is_current(item, fields["key"]):
+                entry = self.entries[self._relpath(item.output_path)]
+                progress(f"Skipping {item.file_type} ({item.index}/{item.count}): {item.output_path} (up to date)")
+                self.skipped.append(GenerationResult(item.output_path, item.file_type, item.index, entry["bytes"], 0.0,
+                                                     checksum=entry.get("checksum"), skipped=True))
+                continue
+            self._pending[item.output_path] = (item, fields)
+            yield item, generator
+
+    def drain_skipped(self) -> Iterator["GenerationResult"]:
+        while self.skipped:
+            yield self.skipped.popleft()
+
+    def record_result(self, result: "GenerationResult") -> None:
+        """
+        Records the result of an item handed on by track(), successful or not.
+        Call it with the result's planned output path, i.e. before an output
+        sink renames it.
+        """
+        pending = self._pending.pop(result.path, None)
+        if pending is not None:
+            item, fields = pending
+            self.record(item, result, fields)
+
+    def dumps(self) -> bytes:
+        """The manifest's entries as JSON lines."""
+        return "".join(json.dumps(entry, sort_keys=True, default=str) + "\n" for entry in self.entries.values()).encode("utf-8")
+
+    def close(self) -> None:
+        """Closes the manifest file, compacting it if entries have been superseded."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if not self._disabled and not self.in_memory and self._lines > len(self.entries):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrites the manifest with only the current entry of each output, atomically."""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(self.dumps())
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not compact generation manifest {self.path}: {e}.")
+            return
+        self._lines = len(self.entries)
@@ -0,0 +1,104 @@
+"""
+Parameter matrices: one `file_types` entry, every combination of some settings.
+
+    - type: pdf
+      count: 2                           # documents per case
+      matrix:
+        pdf_variant: [single_column_text, simulated_ocr_high_quality]
+        layout.columns: [1, 2]           # dotted paths reach into nested settings
+      matrix_sample: 3                   # optional: only 3 cases, drawn from the product
+
+Each case is the cartesian product's combination of values, merged over the
+entry's specific config. Cases are produced lazily, one at a time, so a
+product of millions of combinations is never held in memory; with
+`matrix_sample`, the sampled case numbers are drawn without building the
+product either. Sampling is seeded from the entry's identity (and
+`global_settings.base_seed`, or the entry's `matrix_seed`), so every shard,
+resumed run and rerun expands the same cases.
+"""
+import itertools
+import random
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def overrides_for(paths: Sequence[str], values: Sequence[Any]) -> Dict[str, Any]:
+    """Builds the nested override dict that sets each dotted path in `paths` to its value."""
+    overrides: Dict[str, Any] = {}
+    for path, value in zip(paths, values):
+        *parents, leaf = path.split(".")
+        target = overrides
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[leaf] = value
+    return overrides
+
+
+class ConfigMatrix:
+    """The axes of a `matrix:` block and, optionally, how many of its cases to sample."""
+
+    def __init__(self, axes: Dict[str, List[Any]], sample: Optional[int] = None, seed: Any = None):
+        self.paths = list(axes)
+        self.values = [list(axes[path]) for path in self.paths]
+        self.sample = sample
+        self.seed = seed
+
+    @property
+    def size(self) -> int:
+        """Number of combinations in the full product."""
+        size = 1
+        for values in self.values:
+            size *= len(values)
+        return size
+
+    @property
+    def case_count(self) -> int:
+        """Number of cases `cases()` yields."""
+        return self.size if self.sample is None else min(self.sample, self.size)
+
+    def _combination(self, position: int) -> Tuple[Any, ...]:
+        """The `position`-th combination, in itertools.product order."""
+        combination = []
+        for values in reversed(self.values):
+            position, digit = divmod(position, len(values))
+            combination.append(values[digit])
+        return tuple(reversed(combination))
+
+    def cases(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yields (case number, starting at 1, override dict) for each case, lazily and in product order."""
+        if self.sample is None or self.sample >= self.size:
+            combinations = itertools.product(*self.values)
+            numbered = zip(itertools.count(1), combinations)
+        else:
+            # random.sample over a range draws positions without materialising the product.
+            positions = sorted(random.Random(self.seed).sample(range(self.size), self.sample))
+            numbered = ((position + 1, self._combination(position)) for position in positions)
+        for case_number, combination in numbered:
+            yield case_number, overrides_for(self.paths, combination)
+
+
+def parse_matrix(file_type_config: Dict[str, Any], base_seed: Any = None, entry_position: int = 0) -> Optional[ConfigMatrix]:
+    """
+    Returns the `ConfigMatrix` of a `file_types` entry, or None if it has no
+    `matrix` block. Raises ValueError for a malformed block.
+    """
+    axes = file_type_config.get("matrix")
+    if axes is None:
+        return None
+    if not isinstance(axes, dict) or not axes:
+        raise ValueError(f"'matrix' must be a non-empty mapping of setting paths to lists of values, got {axes!r}.")
+    for path, values in axes.items():
+        if not isinstance(path, str) or not path or "" in path.split("."):
+            raise ValueError(f"Invalid matrix setting path {path!r}.")
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Matrix values for '{path}' must be a non-empty list, got {values!r}.")
+    for path in axes:
+        if any(other.startswith(path + ".") for other in axes):
+            raise ValueError(f"Matrix setting path '{path}' overlaps a deeper path of the same matrix.")
+
+    sample = file_type_config.get("matrix_sample")
+    if sample is not None and (not isinstance(sample, int) or isinstance(sample, bool) or sample < 1):
+        raise ValueError(f"'matrix_sample' must be a positive integer, got {sample!r}.")
+    seed = file_type_config.get("matrix_seed")
+    if seed is None:
+        seed = f"{base_seed!r}:{entry_position}:matrix"
+    return ConfigMatrix(axes, sample, seed)
@@ -0,0 +1,129 @@
+"""
+Generator plugins discovered through entry points.
+
+A plugin package registers its generators under the `synth_data_gen.generators`
+entry-point group:
+
+    [project.entry-points."synth_data_gen.generators"]
+    custom_docx = "my_plugin_package.generators:MyCustomDocxGenerator"
+
+`PluginManager` only collects the entry points' metadata (type name ->
+"module:ClassName"); a plugin's module is imported by `GENERATOR_MAP` the
+first time a config uses its type. Discovery itself happens on the first
+lookup of a type that isn't built in, so runs that only use the built-in
+generators never scan installed distributions.
+
+Scanning every installed distribution's metadata is the slow part, so the
+result is saved to a small JSON file (see `default_cache_path`). It is reused
+as long as the interpreter and the modification times of the `sys.path`
+directories are unchanged: installing or removing a distribution changes the
+mtime of the directory holding its metadata. Set SYNTH_DATA_GEN_PLUGIN_CACHE
+to another file, or to "0" to always scan.
+"""
+import json
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from ..exceptions import PluginError
+
+ENTRY_POINT_GROUP = "synth_data_gen.generators"
+PLUGIN_CACHE_ENV = "SYNTH_DATA_GEN_PLUGIN_CACHE"
+CACHE_FORMAT_VERSION = 1
+
+
+def default_cache_path() -> Optional[str]:
+    """The discovery cache file: $SYNTH_DATA_GEN_PLUGIN_CACHE, else under $XDG_CACHE_HOME or ~/.cache. None disables it."""
+    configured = os.environ.get(PLUGIN_CACHE_ENV)
+    if configured is not None:
+        return None if configured in ("", "0") else configured
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "synth_data_gen", "plugins.json")
+
+
+def _environment_key() -> List[object]:
+    """What a discovery result depends on: the interpreter and the sys.path directories' mtimes."""
+    entries: List[Tuple[str, int]] = []
+    for path in sys.path:
+        try:
+            entries.append((path, os.stat(path or ".").st_mtime_ns))
+        except OSError:
+            continue
+    return [sys.executable, sys.version, entries]
+
+
+def _scan_entry_points(group: str) -> Dict[str, str]:
+    from importlib.metadata import entry_points
+
+    found = entry_points()
+    if hasattr(found, "select"): # Python 3.10+
+        selected = found.select(group=group)
+    else: # pragma: no cover - Python 3.8/3.9 return a dict of groups
+        selected = found.get(group, [])
+    return {entry_point.name.lower(): entry_point.value for entry_point in selected}
+
+
+class PluginManager:
+    """Discovers generator plugins registered under `group` and caches the result on disk."""
+
+    def __init__(self, group: str = ENTRY_POINT_GROUP, cache_path: Optional[str] = None, use_cache: bool = True):
+        self.group = group
+        self.cache_path = (cache_path or default_cache_path()) if use_cache else None
+        self._discovered: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def discover(self, refresh: bool = False) -> Dict[str, str]:
+        """
+        Returns {type name: "module:ClassName"} for every registered plugin,
+        from memory, then the disk cache, then a scan of installed
+        distributions. Nothing is imported. `refresh` forces a scan.
+        """
+        with self._lock:
+            if self._discovered is None or refresh:
+                key = _environment_key()
+                plugins = None if refresh else self._read_cache(key)
+                if plugins is None:
+                    plugins = _scan_entry_points(self.group)
+                    self._write_cache(key, plugins)
+                self._discovered = plugins
+            return dict(self._discovered)
+
+    def _read_cache(self, key: List[object]) -> Optional[Dict[str, str]]:
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (isinstance(cached, dict) and cached.get("version") == CACHE_FORMAT_VERSION
+                and cached.get("group") == self.group and cached.get("environment") == json.loads(json.dumps(key))
+                and isinstance(cached.get("plugins"), dict)):
+            return cached["plugins"]
+        return None
+
+    def _write_cache(self, key: List[object], plugins: Dict[str, str]) -> None:
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_FORMAT_VERSION, "group": self.group, "environment": key, "plugins": plugins}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # An unwritable cache directory just means scanning every time.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def load(self, type_name: str):
+        """Imports and returns the generator class of plugin `type_name`. Raises PluginError if that fails."""
+        from .registry import GeneratorRegistry
+
+        reference = self.discover().get(type_name.lower())
+        if reference is None:
+            raise PluginError(f"No generator plugin registered for type '{type_name}' (entry-point group '{self.group}').")
+        return GeneratorRegistry({type_name: reference})[type_name]
@@ -0,0 +1,174 @@
+"""
+On-demand cProfile/tracemalloc capture of individual documents.
+
+A `profiling` config block, or the SYNTH_DATA_GEN_PROFILE environment
+variable, profiles a sample of a run's work items without touching code:
+
+    profiling:
+      cprofile: true            # default; writes <output file>.pstats
+      tracemalloc: true         # writes <output file>.alloc.txt (top allocations)
+      top: 25                   # allocation sites listed per report
+      rate: 500                 # profile 1 in 500 files (default: every file)
+      types: [pdf]              # only these file types ...
+      variants: [simulated_ocr_high_quality]   # ... and these *_variant values
+      output_dir: profiles      # default: <output base>/_profiles
+
+Reports are named after the output file they belong to, mirroring its
+path below the output base (e.g. `_profiles/pdfs/pdf_17.pdf.pstats`); open
+`.pstats` files with `python -m pstats` or snakeviz. The environment variable
+holds the same block as YAML flow style (SYNTH_DATA_GEN_PROFILE='{rate: 500,
+tracemalloc: true}'), merged over the config's block; "1" enables profiling
+with the defaults and "0" disables it.
+
+Which items are sampled depends only on their identity in the config (like
+sharding, see sharding.py), so reruns, worker counts and shards profile the
+same files. tracemalloc slows allocation-heavy code down considerably, so
+keep `rate` high for production configs.
+"""
+import cProfile
+import os
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from .sharding import shard_for
+
+PROFILING_ENV = "SYNTH_DATA_GEN_PROFILE"
+DEFAULT_PROFILE_SUBDIR = "_profiles"
+
+
+@dataclass
+class ProfileSettings:
+    """A parsed `profiling` block. Picklable, so it travels to worker processes with its work items."""
+    cprofile: bool = True
+    tracemalloc: bool = False
+    top: int = 25
+    rate: int = 1
+    types: Optional[List[str]] = None
+    variants: Optional[List[str]] = None
+    output_dir: Optional[str] = None
+
+    def selects(self, item_key: str, file_type: str, specific_config: Dict[str, Any]) -> bool:
+        """True if the item identified by `item_key` (see sharding.shard_key) is to be profiled."""
+        if self.types is not None and file_type.lower() not in self.types:
+            return False
+        if self.variants is not None:
+            variants = {value for key, value in specific_config.items() if key.endswith("_variant")}
+            if not variants.intersection(self.variants):
+                return False
+        return self.rate == 1 or shard_for(f"profile:{item_key}", self.rate) == 0
+
+    def report_base(self, output_path: str, base_output_dir: str) -> str:
+        """The path, without suffix, of an output file's reports."""
+        output_dir = self.output_dir or os.path.join(base_output_dir, DEFAULT_PROFILE_SUBDIR)
+        relpath = os.path.relpath(output_path, base_output_dir)
+        if relpath.startswith(os.pardir):
+            relpath = os.path.basename(output_path)
+        return os.path.join(output_dir, relpath)
+
+
+def _env_block(value: str) -> Optional[Dict[str, Any]]:
+    import yaml
+
+    if value.strip() in ("", "0"):
+        return None
+    try:
+        parsed = yaml.safe_load(value)
+    except yaml.YAMLError as e:
+        raise ValueError(f"{PROFILING_ENV} is not a valid YAML mapping: {e}") from e
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def profiling_from_config(spec: Any, environ: Mapping[str, str] = os.environ) -> Optional[ProfileSettings]:
+    """
+    Builds the `ProfileSettings` of a run from its `profiling` config block and
+    the SYNTH_DATA_GEN_PROFILE environment variable, or returns None if
+    profiling is off. Raises ValueError for a malformed block.
+    """
+    if spec is not None and not isinstance(spec, (dict, bool)):
+        raise ValueError(f"'profiling' must be a mapping, got {spec!r}.")
+    block = dict(spec) if isinstance(spec, dict) else ({} if spec else None)
+    if PROFILING_ENV in environ:
+        env_block = _env_block(environ[PROFILING_ENV])
+        block = None if env_block is None else dict(block or {}, **env_block)
+    if block is None or block.pop("enable", True) is False:
+        return None
+
+    settings = ProfileSettings()
+    for flag in ("cprofile", "tracemalloc"):
+        if flag in block:
+            if not isinstance(block[flag], bool):
+                raise ValueError(f"'profiling.{flag}' must be true or false, got {block[flag]!r}.")
+            setattr(settings, flag, block.pop(flag))
+    for number in ("top", "rate"):
+        if number in block:
+            value = block.pop(number)
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"'profiling.{number}' must be a positive integer, got {value!r}.")
+            setattr(settings, number, value)
+    for selector in ("types", "variants"):
+        if selector in block:
+            values = block.pop(selector)
+            values = [values] if isinstance(values, str) else values
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"'profiling.{selector}' must be a list of strings, got {values!r}.")
+            setattr(settings, selector, [value.lower() for value in values] if selector == "types" else values)
+    if "output_dir" in block:
+        settings.output_dir = str(block.pop("output_dir"))
+    if block:
+        raise ValueError(f"Unknown 'profiling' settings: {', '.join(sorted(map(str, block)))}.")
+    if not (settings.cprofile or settings.tracemalloc):
+        return None
+    return settings
+
+
+def _write_allocation_report(path: str, snapshot: "tracemalloc.Snapshot", peak: int, top: int) -> None:
+    statistics = snapshot.statistics("lineno")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n")
+        f.write(f"Still allocated at the end: {sum(stat.size for stat in statistics) / 1024:.1f} KiB "
+                f"in {sum(stat.count for stat in statistics)} blocks\n\n")
+        f.write(f"Top {top} allocation sites still holding memory:\n")
+        for stat in statistics[:top]:
+            f.write(f"{stat}\n")
+
+
+@contextmanager
+def profiled(settings: Optional[ProfileSettings], report_base: Optional[str]) -> Iterator[None]:
+    """
+    Profiles the enclosed block per `settings` and writes its reports to
+    `report_base` + ".pstats" / ".alloc.txt". Does nothing if `settings` is None.
+    A report that can't be written is reported, never raised.
+    """
+    if settings is None or report_base is None:
+        yield
+        return
+    profiler = cProfile.Profile() if settings.cprofile else None
+    # Another tracer (e.g. a test harness) may already be running; leave it running.
+    started_tracing = settings.tracemalloc and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif settings.tracemalloc and hasattr(tracemalloc, "reset_peak"): # Python 3.9+
+        tracemalloc.reset_peak()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        snapshot = peak = None
+        if settings.tracemalloc:
+            snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            peak = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+        try:
+            os.makedirs(os.path.dirname(report_base) or ".", exist_ok=True)
+            if profiler is not None:
+                profiler.dump_stats(report_base + ".pstats")
+            if snapshot is not None:
+                _write_allocation_report(report_base + ".alloc.txt", snapshot, peak, settings.top)
+        except OSError as e:
+            print(f"Warning: Could not write profile for {report_base}: {e}")
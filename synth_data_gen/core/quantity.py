@@ -0,0 +1,498 @@
+"""
+Compiled Unified Quantity samplers.
+
+A Unified Quantity config value is one of
+
+    3                                            # exact
+    {"min": 1, "max": 5}                         # uniform range (inclusive)
+    {"chance": 0.3, "if_true": {"min": 1, "max": 2}, "if_false": 0, "max_total": 4}   # probabilistic
+    {"chance": 0.1, "per_unit_of": "paragraph", "max_total": 30}                      # per unit
+    {"distribution": "poisson", "lam": 3.5, "max": 12}                                 # distribution
+
+Distributions (all draws are rounded to ints and kept within the optional
+`min` (default 0) and `max` bounds):
+
+    {"distribution": "poisson", "lam": 3.5}
+    {"distribution": "normal", "mean": 8, "std": 3}            # truncated to [min, max] by redrawing
+    {"distribution": "zipf", "a": 1.8, "min": 1, "max": 200}   # P(k) ~ k**-a on [min, max] (max default 1000)
+    {"distribution": "empirical", "values": [1, 2, 5], "weights": [5, 3, 1]}
+    {"distribution": "empirical", "file": "section_counts.yaml"}   # {value: weight} mapping, or a list of observations
+
+`compile_quantity` validates a value once and turns it into a sampler, so
+drawing a count is a method call instead of a walk through the dict. Invalid
+values compile to a constant (warning once, at compile time) with the same
+fallbacks `BaseGenerator._determine_count` has always used.
+
+`sample(rng)` draws one count from `rng` (a `random.Random` or the `random`
+module, i.e. `BaseGenerator.rng`). `sample(rng, n)` draws `n` counts at
+once, consuming `rng` exactly like `n` single draws, so a seeded document
+comes out the same whether or not NumPy is installed. Callers that own a
+NumPy generator (`numpy.random.default_rng(seed)`) can pass it instead to
+get each batch from one vectorised call; NumPy is optional otherwise.
+
+A probabilistic value with `per_unit_of` flips its coin once per unit
+("paragraph", "section", "chapter", ...) rather than once per call. Generators
+declare how many units of each kind the current scope holds with
+`unit_scope(paragraph=n)`; `sample_units(rng, n)` then draws the hit count as
+one binomial (O(hits) draws, not one per unit), and `sample_per_parent` draws
+the counts of many parents (e.g. notes per chapter from sections per chapter),
+applying `max_total` to their running total. Units the scope doesn't declare, and
+"document", count as one unit, i.e. a single coin as before.
+"""
+import bisect
+import math
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import yaml
+
+# NumPy is imported on the first batch draw rather than with the package; see _numpy().
+_NOT_IMPORTED = object()
+np: Any = _NOT_IMPORTED
+
+
+def _numpy() -> Any:
+    """The numpy module (importing it on first use), or None if it isn't installed."""
+    global np
+    if np is _NOT_IMPORTED:
+        try:
+            import numpy
+        except ImportError: # pragma: no cover - exercised only without numpy
+            numpy = None
+        np = numpy
+    return np
+
+
+# Unit counts of the scope being generated on this thread (see unit_scope).
+_scope = threading.local()
+
+
+@contextmanager
+def unit_scope(**units: int) -> Iterator[Dict[str, int]]:
+    """
+    Declares how many units of each kind (e.g. paragraph=40) the enclosed
+    block generates into. Nested scopes inherit and override outer counts.
+    """
+    previous = getattr(_scope, "units", {})
+    _scope.units = dict(previous, **units)
+    try:
+        yield _scope.units
+    finally:
+        _scope.units = previous
+
+
+def units_in_scope(unit: Optional[str]) -> int:
+    """How many `unit`s the current scope declares; 1 for undeclared units and "document"."""
+    if not unit or unit == "document":
+        return 1
+    return max(int(getattr(_scope, "units", {}).get(unit, 1)), 0)
+
+
+def _is_numpy_generator(rng: Any) -> bool:
+    # Duck-typed so that checking a random.Random doesn't import NumPy.
+    return hasattr(rng, "bit_generator") and _numpy() is not None
+
+
+def _binomial(rng: Any, n: int, p: float) -> int:
+    """Binomial(n, p) from `rng` alone, by geometric skips from hit to hit: O(n * min(p, 1 - p)) draws."""
+    if n <= 0 or p <= 0:
+        return 0
+    if p >= 1:
+        return n
+    if p > 0.5:
+        return n - _binomial(rng, n, 1 - p)
+    log_miss = math.log1p(-p)
+    hits = position = 0
+    while True:
+        position += int(math.log(1.0 - rng.random()) / log_miss) + 1
+        if position > n:
+            return hits
+        hits += 1
+
+
+class QuantitySampler:
+    """Draws element counts for one compiled Unified Quantity value."""
+
+    per_unit_of: Optional[str] = None
+
+    def sample(self, rng: Any, n: Optional[int] = None):
+        """One count from `rng`, or a list of `n` counts if `n` is given (see the module docstring)."""
+        if n is None:
+            return self._draw(rng)
+        if n <= 0:
+            return []
+        if _is_numpy_generator(rng):
+            return self._draw_many(rng, n).tolist()
+        return [self._draw(rng) for _ in range(n)]
+
+    def sample_units(self, rng: Any, units: int) -> int:
+        """The count for a scope holding `units` of this value's `per_unit_of` unit."""
+        return self.sample(rng)
+
+    def sample_in_scope(self, rng: Any) -> int:
+        """One count for the current unit_scope."""
+        if self.per_unit_of is None:
+            return self.sample(rng)
+        return self.sample_units(rng, units_in_scope(self.per_unit_of))
+
+    def sample_per_parent(self, rng: Any, units_per_parent: Sequence[int]) -> List[int]:
+        """
+        Counts for several parents at once, given how many units each holds
+        (e.g. paragraphs per chapter). Values without `per_unit_of` draw one
+        count per parent.
+        """
+        return self.sample(rng, len(units_per_parent))
+
+    def _draw(self, rng: Any) -> int:
+        raise NotImplementedError
+
+    def _draw_many(self, np_rng: Any, n: int):
+        raise NotImplementedError
+
+
+class ExactQuantity(QuantitySampler):
+    def __init__(self, value: int):
+        self.value = value
+
+    def sample(self, rng: Any, n: Optional[int] = None):
+        # No randomness: don't consume a draw from `rng` for batches either.
+        return self.value if n is None else [self.value] * max(n, 0)
+
+    def __repr__(self) -> str:
+        return f"ExactQuantity({self.value!r})"
+
+
+class RangeQuantity(QuantitySampler):
+    def __init__(self, min_val: int, max_val: int):
+        self.min_val = min_val
+        self.max_val = max_val
+
+    def _draw(self, rng: Any) -> int:
+        return rng.randint(self.min_val, self.max_val)
+
+    def _draw_many(self, np_rng: Any, n: int):
+        return np_rng.integers(self.min_val, self.max_val + 1, size=n)
+
+    def __repr__(self) -> str:
+        return f"RangeQuantity({self.min_val!r}, {self.max_val!r})"
+
+
+class DistributionQuantity(QuantitySampler):
+    """Base for `distribution` values: draws are rounded and kept within [min_val, max_val]."""
+
+    def __init__(self, min_val: int = 0, max_val: Optional[int] = None):
+        self.min_val = min_val
+        self.max_val = max_val
+
+    def _clip(self, value: int) -> int:
+        value = max(value, self.min_val)
+        return value if self.max_val is None else min(value, self.max_val)
+
+    def _clip_many(self, values):
+        return np.clip(values, self.min_val, self.max_val).astype(np.int64)
+
+
+class PoissonQuantity(DistributionQuantity):
+    def __init__(self, lam: float, min_val: int = 0, max_val: Optional[int] = None):
+        super().__init__(min_val, max_val)
+        self.lam = lam
+
+    def _draw(self, rng: Any) -> int:
+        if self.lam > 30:
+            # Normal approximation; Knuth's method below is O(lam) and underflows for large lam.
+            return self._clip(max(int(round(rng.gauss(self.lam, math.sqrt(self.lam)))), 0))
+        limit, k, product = math.exp(-self.lam), 0, rng.random()
+        while product > limit:
+            k += 1
+            product *= rng.random()
+        return self._clip(k)
+
+    def _draw_many(self, np_rng: Any, n: int):
+        return self._clip_many(np_rng.poisson(self.lam, size=n))
+
+    def __repr__(self) -> str:
+        return f"PoissonQuantity({self.lam!r}, {self.min_val!r}, {self.max_val!r})"
+
+
+class NormalQuantity(DistributionQuantity):
+    """Normal distribution truncated to [min_val, max_val] by redrawing out-of-range values."""
+
+    MAX_REDRAWS = 100 # after which remaining out-of-range draws are clipped
+
+    def __init__(self, mean: float, std: float, min_val: int = 0, max_val: Optional[int] = None):
+        super().__init__(min_val, max_val)
+        self.mean = mean
+        self.std = std
+
+    def _in_range(self, value: int) -> bool:
+        return value >= self.min_val and (self.max_val is None or value <= self.max_val)
+
+    def _draw(self, rng: Any) -> int:
+        for _ in range(self.MAX_REDRAWS):
+            value = int(round(rng.gauss(self.mean, self.std)))
+            if self._in_range(value):
+                return value
+        return self._clip(value)
+
+    def _draw_many(self, np_rng: Any, n: int):
+        values = np.rint(np_rng.normal(self.mean, self.std, size=n))
+        for _ in range(self.MAX_REDRAWS):
+            out = values < self.min_val
+            if self.max_val is not None:
+                out |= values > self.max_val
+            count = int(out.sum())
+            if not count:
+                break
+            values[out] = np.rint(np_rng.normal(self.mean, self.std, size=count))
+        return self._clip_many(values)
+
+    def __repr__(self) -> str:
+        return f"NormalQuantity({self.mean!r}, {self.std!r}, {self.min_val!r}, {self.max_val!r})"
+
+
+class TableQuantity(DistributionQuantity):
+    """Draws from a finite set of values with the given weights (empirical histograms, bounded Zipf)."""
+
+    def __init__(self, values: Sequence[int], weights: Sequence[float], min_val: int = 0, max_val: Optional[int] = None):
+        super().__init__(min_val, max_val)
+        self.values = list(values)
+        self.cumulative = []
+        total = 0.0
+        for weight in weights:
+            total += weight
+            self.cumulative.append(total)
+        self.total = total
+        self._np_tables = None # (values, cumulative weights) as arrays, built on the first vectorised draw
+
+    def _draw(self, rng: Any) -> int:
+        position = bisect.bisect_right(self.cumulative, rng.random() * self.total)
+        return self._clip(self.values[min(position, len(self.values) - 1)])
+
+    def _draw_many(self, np_rng: Any, n: int):
+        if self._np_tables is None:
+            self._np_tables = (np.asarray(self.values, dtype=np.int64), np.asarray(self.cumulative))
+        values, cumulative = self._np_tables
+        positions = np.searchsorted(cumulative, np_rng.random(n) * self.total, side="right")
+        return self._clip_many(values[np.minimum(positions, len(self.values) - 1)])
+
+    def __repr__(self) -> str:
+        return f"TableQuantity({len(self.values)} values, {self.min_val!r}, {self.max_val!r})"
+
+
+# Largest support a bounded Zipf table may have.
+MAX_ZIPF_SUPPORT = 1_000_000
+
+
+def _load_histogram(path: str) -> Dict[int, float]:
+    """Reads an empirical histogram: a YAML/JSON {value: weight} mapping or a list of observed values."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    if isinstance(data, dict):
+        return {int(value): float(weight) for value, weight in data.items()}
+    if isinstance(data, list):
+        histogram: Dict[int, float] = {}
+        for value in data:
+            histogram[int(value)] = histogram.get(int(value), 0.0) + 1.0
+        return histogram
+    raise ValueError("expected a {value: weight} mapping or a list of values")
+
+
+def _compile_distribution(value: Dict[str, Any], name: str) -> QuantitySampler:
+    kind = str(value.get("distribution", "")).lower()
+    min_val = value.get("min", 0)
+    max_val = value.get("max")
+    if not (isinstance(min_val, int) and min_val >= 0 and (max_val is None or (isinstance(max_val, int) and max_val >= min_val))):
+        print(f"Warning: Invalid min/max for {kind or 'distribution'} config '{name}': {value}. Defaulting to 0.")
+        return ExactQuantity(0)
+
+    def number(key: str, default: Any = None, positive: bool = False) -> Optional[float]:
+        raw = value.get(key, default)
+        if isinstance(raw, bool) or not isinstance(raw, (int, float)) or (positive and raw <= 0) or raw < 0:
+            return None
+        return float(raw)
+
+    if kind == "poisson":
+        lam = number("lam")
+        if lam is not None:
+            return PoissonQuantity(lam, min_val, max_val)
+    elif kind == "normal":
+        mean, std = number("mean"), number("std", positive=True)
+        if mean is not None and std is not None:
+            return NormalQuantity(mean, std, min_val, max_val)
+    elif kind == "zipf":
+        a = number("a", positive=True)
+        low, high = max(min_val, 1), max_val if max_val is not None else 1000
+        # Zipf's support starts at 1, so `max: 0` leaves nothing to draw from.
+        if a is not None and low <= high and high - low < MAX_ZIPF_SUPPORT:
+            support = range(low, high + 1)
+            return TableQuantity(support, [k ** -a for k in support], min_val, max_val)
+    elif kind == "empirical":
+        try:
+            if "file" in value:
+                histogram = _load_histogram(value["file"])
+                values, weights = list(histogram), list(histogram.values())
+            else:
+                values = [int(v) for v in value.get("values", [])]
+                weights = [float(w) for w in value.get("weights", [1.0] * len(values))]
+        except (OSError, ValueError, TypeError, yaml.YAMLError) as e:
+            print(f"Warning: Could not load empirical distribution for '{name}': {e}. Defaulting to 0.")
+            return ExactQuantity(0)
+        if values and len(values) == len(weights) and all(w >= 0 for w in weights) and sum(weights) > 0:
+            return TableQuantity(values, weights, min_val, max_val)
+    else:
+        print(f"Warning: Unknown distribution '{kind}' for count config '{name}'. Expected poisson, normal, zipf or empirical. Defaulting to 0.")
+        return ExactQuantity(0)
+    print(f"Warning: Invalid parameters for {kind} distribution config '{name}': {value}. Defaulting to 0.")
+    return ExactQuantity(0)
+
+
+class ProbabilisticQuantity(QuantitySampler):
+    def __init__(self, chance: float, if_true: QuantitySampler, if_false: QuantitySampler, per_unit_of: Optional[str] = None):
+        self.chance = chance
+        self.if_true = if_true
+        self.if_false = if_false
+        self.per_unit_of = None if per_unit_of == "document" else per_unit_of
+
+    def _draw(self, rng: Any) -> int:
+        branch = self.if_true if rng.random() < self.chance else self.if_false
+        return branch.sample(rng)
+
+    def _draw_many(self, np_rng: Any, n: int):
+        hits = np_rng.random(n) < self.chance
+        return np.where(hits, _draw_array(self.if_true, np_rng, n), _draw_array(self.if_false, np_rng, n))
+
+    def sample_units(self, rng: Any, units: int) -> int:
+        if units == 1:
+            return self._draw(rng) # one coin, consuming the stream exactly as a plain probabilistic value
+        if units <= 0:
+            return 0
+        hits = _binomial(rng, units, self.chance)
+        return _branch_total(self.if_true, rng, hits) + _branch_total(self.if_false, rng, units - hits)
+
+    def sample_per_parent(self, rng: Any, units_per_parent: Sequence[int]) -> List[int]:
+        if not _is_numpy_generator(rng):
+            return [self.sample_units(rng, units) for units in units_per_parent]
+        units = np.asarray(units_per_parent, dtype=np.int64)
+        hits = rng.binomial(units, self.chance)
+        return (_branch_totals(self.if_true, rng, hits) + _branch_totals(self.if_false, rng, units - hits)).tolist()
+
+    def __repr__(self) -> str:
+        return f"ProbabilisticQuantity({self.chance!r}, {self.if_true!r}, {self.if_false!r}, per_unit_of={self.per_unit_of!r})"
+
+
+def _branch_total(branch: QuantitySampler, rng: Any, k: int) -> int:
+    """Sum of `k` draws from an if_true/if_false branch."""
+    if k <= 0:
+        return 0
+    if isinstance(branch, ExactQuantity):
+        return branch.value * k
+    return sum(branch.sample(rng, k))
+
+
+def _branch_totals(branch: QuantitySampler, np_rng: Any, ks: Any):
+    """Per-parent sums of ks[i] draws from a branch, in one vectorised draw."""
+    if isinstance(branch, ExactQuantity):
+        return ks * branch.value
+    draws = branch._draw_many(np_rng, int(ks.sum()))
+    return np.bincount(np.repeat(np.arange(len(ks)), ks), weights=draws, minlength=len(ks)).astype(np.int64)
+
+
+class CappedQuantity(QuantitySampler):
+    """Caps another sampler's counts at `max_total`."""
+
+    def __init__(self, inner: QuantitySampler, max_total: int):
+        self.inner = inner
+        self.max_total = max_total
+        self.per_unit_of = inner.per_unit_of
+
+    def _draw(self, rng: Any) -> int:
+        return min(self.inner.sample(rng), self.max_total)
+
+    def _draw_many(self, np_rng: Any, n: int):
+        return np.minimum(_draw_array(self.inner, np_rng, n), self.max_total)
+
+    def sample_units(self, rng: Any, units: int) -> int:
+        return min(self.inner.sample_units(rng, units), self.max_total)
+
+    def sample_per_parent(self, rng: Any, units_per_parent: Sequence[int]) -> List[int]:
+        """Applies `max_total` to the running total over all parents, not to each parent."""
+        counts = self.inner.sample_per_parent(rng, units_per_parent)
+        capped, remaining = [], self.max_total
+        for count in counts:
+            take = min(count, remaining)
+            capped.append(take)
+            remaining -= take
+        return capped
+
+    def __repr__(self) -> str:
+        return f"CappedQuantity({self.inner!r}, {self.max_total!r})"
+
+
+def _draw_array(sampler: QuantitySampler, np_rng: Any, n: int):
+    if isinstance(sampler, ExactQuantity):
+        return np.full(n, sampler.value)
+    return sampler._draw_many(np_rng, n)
+
+
+def _is_valid_range(min_val: Any, max_val: Any) -> bool:
+    return isinstance(min_val, int) and isinstance(max_val, int) and 0 <= min_val <= max_val
+
+
+def _compile_branch(value: Any, name: str, branch: str, default: int) -> QuantitySampler:
+    """Compiles the if_true/if_false part of a probabilistic value (an int, a range or a distribution)."""
+    if isinstance(value, int):
+        return ExactQuantity(value)
+    if isinstance(value, dict) and "distribution" in value:
+        return _compile_distribution(value, name)
+    if isinstance(value, dict) and "min" in value and "max" in value:
+        min_val, max_val = value.get("min", 0), value.get("max", 0)
+        if _is_valid_range(min_val, max_val):
+            return RangeQuantity(min_val, max_val)
+        print(f"Warning: Invalid range in {branch} for probabilistic config '{name}': {value}. Defaulting to {default}.")
+        return ExactQuantity(default)
+    print(f"Warning: Invalid {branch} structure in probabilistic config '{name}': {value}. Defaulting to {default}.")
+    return ExactQuantity(default)
+
+
+def compile_quantity(value: Any, name: str = "element") -> QuantitySampler:
+    """
+    Compiles a Unified Quantity config value into a sampler. `name` describes
+    the element being counted and is only used in warnings.
+    """
+    if isinstance(value, int):
+        return ExactQuantity(value)
+    if not isinstance(value, dict):
+        print(f"Warning: Invalid type for count config '{name}': {type(value)}. Defaulting to 0.")
+        return ExactQuantity(0)
+
+    if "distribution" in value:
+        return _compile_distribution(value, name)
+
+    if "min" in value and "max" in value:
+        min_val, max_val = value.get("min", 0), value.get("max", 0)
+        if not _is_valid_range(min_val, max_val):
+            print(f"Warning: Invalid range config for '{name}': {value}. Defaulting to 0.")
+            return ExactQuantity(0)
+        return RangeQuantity(min_val, max_val)
+
+    if "chance" in value:
+        chance = value.get("chance", 0.0)
+        if_false = _compile_branch(value.get("if_false", 0), name, "if_false", 0)
+        max_total = value.get("max_total")
+        if max_total is not None and not (isinstance(max_total, int) and max_total >= 0):
+            print(f"Warning: Invalid max_total value for probabilistic config '{name}': {max_total}. Ignoring max_total.")
+            max_total = None
+        if not (isinstance(chance, float) and 0.0 <= chance <= 1.0):
+            print(f"Warning: Invalid chance value for probabilistic config '{name}': {chance}. Defaulting to determined if_false value.")
+            sampler = if_false
+        else:
+            per_unit_of = value.get("per_unit_of")
+            if per_unit_of is not None and not isinstance(per_unit_of, str):
+                print(f"Warning: Invalid per_unit_of for probabilistic config '{name}': {per_unit_of}. Using 'document'.")
+                per_unit_of = None
+            sampler = ProbabilisticQuantity(chance, _compile_branch(value.get("if_true", 1), name, "if_true", 1), if_false, per_unit_of)
+        return CappedQuantity(sampler, max_total) if max_total is not None else sampler
+
+    print(f"Warning: Unknown dictionary structure for count config '{name}': {value}. Defaulting to 0.")
+    return ExactQuantity(0)
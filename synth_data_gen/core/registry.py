@@ -0,0 +1,106 @@
+"""
+Lazily resolved generator registry.
+
+`GENERATOR_MAP` maps type strings ("pdf", "epub", ...) to generator classes.
+Importing a generator module pulls in its rendering library (reportlab,
+ebooklib and lxml), which dominates the start-up time of short runs, so the
+registry holds "module:ClassName" references and only imports a module the
+first time its type is looked up. Classes can also be registered directly.
+
+A registry can be given a `discover` callable (see core/plugins.py) that
+returns more references; it is called once, on the first lookup of a type
+the registry doesn't already know (or when the registry is listed).
+Discovered entries never replace ones registered explicitly.
+"""
+import importlib
+import threading
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional, Type, Union
+
+from ..exceptions import PluginError
+from .base import BaseGenerator
+
+GeneratorRef = Union[str, Type[BaseGenerator]]
+
+
+def load_reference(reference: str) -> Any:
+    """Imports "package.module:attr" and returns the attribute."""
+    module_name, _, attr = reference.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Invalid reference '{reference}'. Expected 'package.module:ClassName'.")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class GeneratorRegistry(MutableMapping):
+    """A dict-like map of type strings to generator classes whose modules are imported on first lookup."""
+
+    def __init__(self, entries: Dict[str, GeneratorRef] = None, discover: Optional[Callable[[], Dict[str, str]]] = None):
+        self._entries: Dict[str, GeneratorRef] = dict(entries or {})
+        self._lock = threading.Lock()
+        self._discover = discover
+
+    def _run_discovery(self) -> None:
+        if self._discover is None:
+            return
+        with self._lock:
+            discover, self._discover = self._discover, None
+            if discover is None:
+                return
+            for type_name, reference in discover().items():
+                self._entries.setdefault(type_name, reference)
+
+    def __getitem__(self, type_name: str) -> Type[BaseGenerator]:
+        if type_name not in self._entries:
+            self._run_discovery()
+        entry = self._entries[type_name]
+        if isinstance(entry, str):
+            with self._lock:
+                entry = self._entries[type_name]
+                if isinstance(entry, str):
+                    entry = self._entries[type_name] = self._load(type_name, entry)
+        return entry
+
+    @staticmethod
+    def _load(type_name: str, reference: str) -> Type[BaseGenerator]:
+        try:
+            generator_cls = load_reference(reference)
+        except (ImportError, AttributeError, ValueError) as e:
+            raise PluginError(f"Could not load the generator for type '{type_name}' from '{reference}': {e}") from e
+        if not (isinstance(generator_cls, type) and issubclass(generator_cls, BaseGenerator)):
+            raise PluginError(f"'{reference}' (type '{type_name}') is not a BaseGenerator subclass.")
+        return generator_cls
+
+    def __setitem__(self, type_name: str, entry: GeneratorRef) -> None:
+        self._entries[type_name] = entry
+
+    def __delitem__(self, type_name: str) -> None:
+        del self._entries[type_name]
+
+    def __iter__(self) -> Iterator[str]:
+        self._run_discovery()
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        self._run_discovery()
+        return len(self._entries)
+
+    def __contains__(self, type_name: object) -> bool:
+        # Membership may discover plugins, but never imports one.
+        if type_name not in self._entries:
+            self._run_discovery()
+        return type_name in self._entries
+
+    def is_loaded(self, type_name: str) -> bool:
+        """True if `type_name`'s class has been imported already."""
+        return not isinstance(self._entries.get(type_name), str)
+
+    def reference(self, type_name: str) -> str:
+        """The "module:ClassName" reference of `type_name`, without importing it."""
+        entry = self._entries[type_name]
+        return entry if isinstance(entry, str) else f"{entry.__module__}:{entry.__qualname__}"
+
+    def copy(self) -> Dict[str, Type[BaseGenerator]]:
+        """A plain dict of every type and its (now imported) class."""
+        return {type_name: self[type_name] for type_name in self}
+
+    def __repr__(self) -> str:
+        return f"GeneratorRegistry({self._entries!r})"
@@ -0,0 +1,238 @@
+"""
+JSON Schemas for the config and its generator sections, compiled once.
+
+`jsonschema.validate` checks the schema and builds a new validator on every
+call. Here each schema is compiled into a `Draft7Validator` (with a format
+checker) the first time it is used and the validator is reused afterwards,
+so validating a section costs one pass over the instance, which matters when
+thousands of per-document overrides are validated in one run.
+
+The shipped schemas are deliberately permissive: they type-check the keys
+the generators read (Unified Quantity values, flags, nested sections) and
+allow any other key, so configs written for newer or experimental options
+keep loading.
+"""
+import json
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Tuple
+
+if TYPE_CHECKING:
+    # jsonschema is imported when the first validator is built, not with the package.
+    from jsonschema import Draft7Validator
+
+# A Unified Quantity value (see core/quantity.py): an exact count or a dict.
+# Only the keys' types are checked; which form a dict takes is up to compile_quantity.
+QUANTITY_SCHEMA: Dict[str, Any] = {
+    "anyOf": [
+        {"type": "integer", "minimum": 0},
+        {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "minimum": 0},
+                "min": {"type": "integer", "minimum": 0},
+                "max": {"type": "integer", "minimum": 0},
+                "chance": {"type": "number", "minimum": 0, "maximum": 1},
+                "per_unit_of": {"type": "string"},
+                "max_total": {"type": "integer", "minimum": 0},
+                "distribution": {"enum": ["poisson", "normal", "zipf", "empirical"]},
+            },
+        },
+    ]
+}
+
+_PROBABILITY = {"type": "number", "minimum": 0, "maximum": 1}
+_FLAG = {"type": "boolean"}
+_ENABLE = {"type": "object", "properties": {"enable": _FLAG}}
+
+EPUB_SPECIFIC_SETTINGS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "chapters_config": QUANTITY_SCHEMA,
+        "sections_per_chapter_config": QUANTITY_SCHEMA,
+        "epigraph_config": QUANTITY_SCHEMA,
+        "author": {"type": "string"},
+        "title": {"type": "string"},
+        "title_prefix": {"type": "string"},
+        "language": {"type": "string"},
+        "publisher": {"type": "string"},
+        "epub_version": {"type": ["integer", "number", "string"]},
+        "include_ncx": {"enum": [True, False, "auto"]},
+        "include_nav_doc": {"enum": [True, False, "auto"]},
+        "font_embedding": _ENABLE,
+        "toc_settings": {
+            "type": "object",
+            "properties": {
+                "style": {"type": "string"},
+                "max_depth": {"type": "integer", "minimum": 1},
+                "include_landmarks": _FLAG,
+                "include_page_list_in_toc": _FLAG,
+            },
+        },
+        "notes_system": {
+            "type": "object",
+            "properties": {"type": {"type": "string"}, "notes_config": QUANTITY_SCHEMA},
+        },
+        "multimedia": {
+            "type": "object",
+            "properties": {"include_images": _FLAG, "images_config": QUANTITY_SCHEMA},
+        },
+        "content_elements": {
+            "type": "object",
+            "properties": {
+                "paragraph_styles": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"class_name": {"type": "string"}, "chance": _PROBABILITY},
+                    },
+                },
+                "list_styles": {
+                    "type": "object",
+                    "properties": {
+                        "list_items_config": QUANTITY_SCHEMA,
+                        "max_list_nesting_depth": {"type": "integer", "minimum": 0},
+                    },
+                },
+            },
+        },
+        "typography_layout": {
+            "type": "object",
+            "properties": {
+                "base_font_family": {"type": ["string", "array"], "items": {"type": "string"}},
+                "line_spacing_multiplier": {"type": "number", "exclusiveMinimum": 0},
+                "text_alignment": {"type": "string"},
+            },
+        },
+        "edge_cases": {"type": "object"},
+    },
+}
+
+PDF_SPECIFIC_SETTINGS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "pdf_variant": {"type": "string"},
+        "generation_method": {"type": "string"},
+        "page_count_config": QUANTITY_SCHEMA,
+        "chapters_config": QUANTITY_SCHEMA,
+        "sections_per_chapter_config": QUANTITY_SCHEMA,
+        "pdf_tables_occurrence_config": QUANTITY_SCHEMA,
+        "pdf_figures_occurrence_config": QUANTITY_SCHEMA,
+        "author": {"type": "string"},
+        "title": {"type": "string"},
+        "base_font_family": {"type": "string"},
+        "base_font_size_pt": {"type": "number", "exclusiveMinimum": 0},
+        "layout": {
+            "type": "object",
+            "properties": {
+                "columns": {"type": "integer", "minimum": 1},
+                "margins_mm": {
+                    "type": "object",
+                    "additionalProperties": {"type": "number", "minimum": 0},
+                },
+            },
+        },
+        "running_header": _ENABLE,
+        "running_footer": _ENABLE,
+        "visual_toc": {
+            "type": "object",
+            "properties": {"enable": _FLAG, "max_depth": {"type": "integer", "minimum": 1}},
+        },
+        "notes_system": {"type": "object", "properties": {"notes_config": QUANTITY_SCHEMA}},
+        "multimedia": {
+            "type": "object",
+            "properties": {"include_images": _FLAG, "images_config": QUANTITY_SCHEMA},
+        },
+        "include_handwritten_annotations_chance": _PROBABILITY,
+        "mixed_page_sizes_orientations_chance": _PROBABILITY,
+    },
+}
+
+MARKDOWN_SPECIFIC_SETTINGS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "md_variant": {"type": "string"},
+        "headings_config": QUANTITY_SCHEMA,
+        "md_list_items_config": QUANTITY_SCHEMA,
+        "md_images_config": QUANTITY_SCHEMA,
+        "include_emphasis_styles": _FLAG,
+        "include_links": _FLAG,
+        "include_blockquotes": _FLAG,
+        "gfm_features": {
+            "type": "object",
+            "properties": {
+                "md_tables_occurrence_config": QUANTITY_SCHEMA,
+                "md_footnotes_occurrence_config": QUANTITY_SCHEMA,
+                "md_task_lists_occurrence_config": QUANTITY_SCHEMA,
+                "md_code_blocks_config": QUANTITY_SCHEMA,
+            },
+        },
+        "frontmatter": {
+            "type": "object",
+            "properties": {
+                "include_chance": _PROBABILITY,
+                "style": {"type": "string"},
+                "fields": {"type": "object"},
+            },
+        },
+    },
+}
+
+SECTION_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "epub_specific_settings": EPUB_SPECIFIC_SETTINGS_SCHEMA,
+    "pdf_specific_settings": PDF_SPECIFIC_SETTINGS_SCHEMA,
+    "markdown_specific_settings": MARKDOWN_SPECIFIC_SETTINGS_SCHEMA,
+}
+
+# Compiled validators by schema identity (the schema is kept alive alongside,
+# so its id can't be reused) and by content, for equal schemas built anew.
+_MAX_VALIDATORS = 256
+_by_identity: Dict[int, Tuple[Mapping[str, Any], "Draft7Validator"]] = {}
+_by_content: Dict[str, "Draft7Validator"] = {}
+_lock = threading.Lock()
+
+
+def get_validator(schema: Mapping[str, Any]) -> "Draft7Validator":
+    """
+    Returns the compiled validator for `schema`, building (and checking) it on
+    first use. The validator class follows the schema's `$schema`, defaulting
+    to Draft 7, like `jsonschema.validate`.
+    """
+    entry = _by_identity.get(id(schema))
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+    key = json.dumps(schema, sort_keys=True, default=repr)
+    validator = _by_content.get(key)
+    if validator is None:
+        from jsonschema import Draft7Validator, validators
+
+        validator_cls = validators.validator_for(schema, default=Draft7Validator)
+        validator_cls.check_schema(schema)
+        validator = validator_cls(schema, format_checker=validator_cls.FORMAT_CHECKER)
+    with _lock:
+        if len(_by_content) >= _MAX_VALIDATORS:
+            _by_content.clear()
+            _by_identity.clear()
+        _by_content[key] = validator
+        _by_identity[id(schema)] = (schema, validator)
+    return validator
+
+
+def validate(instance: Any, schema: Mapping[str, Any]) -> None:
+    """Drop-in for `jsonschema.validate` using the cached validator; raises the same best-matching `ValidationError`."""
+    from jsonschema.exceptions import best_match
+
+    error = best_match(get_validator(schema).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def section_errors(section_name: str, config: Any) -> List[str]:
+    """
+    Validates a generator section (e.g. "epub_specific_settings") and returns
+    one readable message per problem, empty if it is valid or has no schema.
+    """
+    schema = SECTION_SCHEMAS.get(section_name)
+    if schema is None:
+        return []
+    errors = sorted(get_validator(schema).iter_errors(config), key=lambda e: [str(p) for p in e.absolute_path])
+    return [f"{'.'.join([section_name, *map(str, e.absolute_path)])}: {e.message}" for e in errors]
@@ -0,0 +1,53 @@
+"""
+Per-file RNG streams derived from `global_settings.base_seed`.
+
+Every work item gets its own seed, derived from `base_seed` and the item's
+identity in the config (its position in `file_types`, its type and index; the
+same key used for sharding). Generators draw all randomness from
+`BaseGenerator.rng`, which is the item's `random.Random` stream while the
+item is being generated, so a file's content depends only on `base_seed` and
+its identity: not on worker count, shard count or execution order.
+
+Without a `base_seed`, `rng` is the module-level `random`, as before.
+"""
+import hashlib
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+# The stream of the item being generated on this thread. Each thread (and
+# worker process) generates one item at a time, so a thread-local is enough
+# even when several threads share one generator instance.
+_active = threading.local()
+
+
+def derive_seed(base_seed: Any, *parts: Any) -> int:
+    """Derives a stable 64-bit seed from `base_seed` and the given identity parts."""
+    material = "\x1f".join(repr(part) for part in (base_seed,) + parts)
+    return int.from_bytes(hashlib.sha256(material.encode("utf-8")).digest()[:8], "big")
+
+
+def current_rng():
+    """The active item's `random.Random`, or the `random` module if none is active."""
+    return getattr(_active, "rng", random)
+
+
+def current_seed() -> Optional[int]:
+    """The active item's seed, or None for unseeded generation."""
+    return getattr(_active, "seed", None)
+
+
+@contextmanager
+def seeded(seed: Optional[int]) -> Iterator[Any]:
+    """
+    Makes `seed`'s stream the active RNG on this thread for the duration of
+    the block. A seed of None keeps the module-level `random`.
+    """
+    previous = (getattr(_active, "rng", random), getattr(_active, "seed", None))
+    _active.rng = random.Random(seed) if seed is not None else random
+    _active.seed = seed
+    try:
+        yield _active.rng
+    finally:
+        _active.rng, _active.seed = previous
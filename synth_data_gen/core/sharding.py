@@ -0,0 +1,42 @@
+"""
+Deterministic partitioning of the (file_type, index) space across nodes.
+
+Each work item is assigned to a shard by hashing a key that identifies it
+within the config (its position in `file_types`, its type and its index), so
+every node running the same config with a different `shard_index` produces a
+disjoint subset without any coordination, and the union of all shards is
+exactly the single-node corpus. Filenames do not depend on the shard count.
+"""
+import hashlib
+from typing import Any, Optional, Tuple
+
+
+def shard_key(entry_position: int, file_type: str, index: int) -> str:
+    return f"{entry_position}:{file_type}:{index}"
+
+
+def shard_for(key: str, shard_count: int) -> int:
+    """Returns the shard (0 <= shard < shard_count) that owns `key`."""
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def resolve_shard(shard_index: Any, shard_count: Any) -> Optional[Tuple[int, int]]:
+    """
+    Validates `shard_index`/`shard_count` and returns them as a pair, or None
+    if sharding is off (both unset, or a shard count of 1).
+    Raises ValueError for inconsistent settings, since silently falling back
+    to a full run on every node would duplicate the whole corpus.
+    """
+    if shard_index is None and shard_count is None:
+        return None
+    if shard_count is None or shard_index is None:
+        raise ValueError(f"'shard_index' and 'shard_count' must be given together (got {shard_index!r}, {shard_count!r}).")
+    for name, value in (("shard_index", shard_index), ("shard_count", shard_count)):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"'{name}' must be an integer, got {value!r}.")
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index} of {shard_count}: need shard_count >= 1 and 0 <= shard_index < shard_count.")
+    if shard_count == 1:
+        return None
+    return shard_index, shard_count
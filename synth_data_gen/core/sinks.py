@@ -0,0 +1,187 @@
+"""
+Output sinks: where generated documents end up.
+
+By default generators write their files straight into `output_directory_base`
+(`DirectorySink` is the equivalent for documents rendered in memory). The
+archive sinks instead collect a whole corpus into one sequentially written
+tar or zip file, which is far kinder to filesystems and object stores than
+millions of small files. `TarSink` can also stream to stdout ("-"), e.g.
+`... | aws s3 cp - s3://bucket/corpus.tar`.
+
+Sinks receive documents as bytes (see `BaseGenerator.render`) together with
+their path relative to the output base, and are written from a single thread
+of the parent process.
+"""
+import io
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Callable, Dict, Optional, Set, Tuple, Union
+
+
+class OutputSink(ABC):
+    """Receives generated documents. Use as a context manager, or call close()."""
+
+    @abstractmethod
+    def write(self, relpath: str, data: bytes) -> str:
+        """
+        Stores one document under `relpath` ("/"-separated, relative to the
+        output base) and returns where it went: a filesystem path or, for
+        archives, the member name.
+        """
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class DirectorySink(OutputSink):
+    """Writes each document to its own file under `base_dir` (today's layout)."""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self._created_dirs: Set[str] = set()
+
+    def write(self, relpath: str, data: bytes) -> str:
+        path = os.path.join(self.base_dir, *relpath.split("/"))
+        parent = os.path.dirname(path)
+        if parent not in self._created_dirs:
+            os.makedirs(parent, exist_ok=True)
+            self._created_dirs.add(parent)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+
+# Duplicate of the process's original stdout, once an archive has claimed it.
+_archive_stdout_fd: Optional[int] = None
+
+
+def _claim_stdout() -> BinaryIO:
+    """
+    Returns the process's stdout as a binary stream for an archive. The first
+    call points file descriptor 1 at stderr for the rest of the process, so
+    progress messages (including those printed by pool workers, which inherit
+    the descriptor, and anything printed after the archive is finished) can't
+    end up inside or after the archive.
+    """
+    global _archive_stdout_fd
+    if _archive_stdout_fd is None:
+        sys.stdout.flush()
+        _archive_stdout_fd = os.dup(1)
+        os.dup2(2, 1)
+    return os.fdopen(os.dup(_archive_stdout_fd), "wb")
+
+
+def _open_target(target: Union[str, BinaryIO]) -> Tuple[BinaryIO, Callable[[], None]]:
+    """
+    Returns (binary file object, finalizer) for a path, "-" (stdout) or an
+    already open binary file object. The finalizer closes what this module
+    opened and only flushes file objects owned by the caller.
+    """
+    if target == "-":
+        stream = _claim_stdout()
+        return stream, stream.close
+    if isinstance(target, str):
+        parent = os.path.dirname(target)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        fileobj = open(target, "wb")
+        return fileobj, fileobj.close
+    return target, target.flush
+
+
+class TarSink(OutputSink):
+    """
+    Streams documents into a tar archive, written strictly sequentially (no
+    seeking), so it can go to a pipe or stdout. Targets ending in .tar.gz/.tgz
+    are gzip-compressed unless `compression` says otherwise ("", "gz", "bz2", "xz").
+    Every member gets the same `mtime` (default: when the sink was opened).
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], compression: Optional[str] = None, mtime: Optional[float] = None):
+        if compression is None:
+            compression = "gz" if isinstance(target, str) and target.endswith((".tar.gz", ".tgz")) else ""
+        self.name = target if isinstance(target, str) else getattr(target, "name", "<stream>")
+        self._fileobj, self._finalize = _open_target(target)
+        self._tar = tarfile.open(fileobj=self._fileobj, mode=f"w|{compression}")
+        self.mtime = int(time.time() if mtime is None else mtime)
+
+    def write(self, relpath: str, data: bytes) -> str:
+        info = tarfile.TarInfo(relpath)
+        info.size = len(data)
+        info.mtime = self.mtime
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+        return relpath
+
+    def close(self) -> None:
+        if self._tar is None:
+            return
+        self._tar.close()
+        self._tar = None
+        self._finalize()
+
+
+class ZipSink(OutputSink):
+    """
+    Writes documents into a zip archive. zipfile can write to unseekable
+    streams too, so "-" (stdout) works, at the cost of data descriptors.
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], compression: int = zipfile.ZIP_DEFLATED, mtime: Optional[float] = None):
+        self.name = target if isinstance(target, str) else getattr(target, "name", "<stream>")
+        self._fileobj, self._finalize = _open_target(target)
+        self._zip = zipfile.ZipFile(self._fileobj, "w", compression=compression)
+        self.date_time = time.localtime(time.time() if mtime is None else mtime)[:6]
+
+    def write(self, relpath: str, data: bytes) -> str:
+        info = zipfile.ZipInfo(relpath, date_time=self.date_time)
+        info.compress_type = self._zip.compression
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, data)
+        return relpath
+
+    def close(self) -> None:
+        if self._zip is None:
+            return
+        self._zip.close()
+        self._zip = None
+        self._finalize()
+
+
+def open_sink(spec: Optional[Dict[str, Any]]) -> Optional[OutputSink]:
+    """
+    Builds a sink from an `output_sink` config block:
+
+        output_sink: {type: tar, path: corpus.tar.gz}    # or path: "-" for stdout
+        output_sink: {type: zip, path: corpus.zip}
+        output_sink: {type: directory}                   # same as no block
+
+    Returns None for plain directory output, where generators write their own
+    files as before. Relative archive paths are taken relative to the current
+    directory, not the output base.
+    """
+    if not spec:
+        return None
+    if not isinstance(spec, dict):
+        raise ValueError(f"'output_sink' must be a mapping, got {spec!r}.")
+    sink_type = str(spec.get("type", "directory")).lower()
+    if sink_type == "directory":
+        return None
+    path = spec.get("path")
+    if not path:
+        raise ValueError(f"'output_sink' of type '{sink_type}' needs a 'path' (or \"-\" for stdout).")
+    if sink_type == "tar":
+        return TarSink(path, compression=spec.get("compression"))
+    if sink_type == "zip":
+        return ZipSink(path)
+    raise ValueError(f"Unknown output_sink type '{sink_type}'. Expected 'directory', 'tar' or 'zip'.")
@@ -0,0 +1,137 @@
+"""
+Chrome trace-event export of a run's phases.
+
+With a trace path (`generate_data(..., trace_path=...)`, a `trace` config key
+or `synth-data-gen generate --trace`), a run records nested spans: config
+loading, planning and config validation in the parent process, and for each
+file its generation, rendering, per-chapter content, ToC, PDF layout, OCR
+noise, writing and EPUBCheck, in whichever process or thread produced it.
+The result is trace-event JSON that chrome://tracing and ui.perfetto.dev open
+directly; every worker process is its own track.
+
+Spans are recorded into a per-thread list only while one is being collected
+(`recording`), and otherwise cost an attribute lookup. Each work item collects
+its own spans, which travel back with its `GenerationResult` (like its
+metrics, see events.py); the parent process appends them to the trace file
+as results arrive, so memory stays flat for long runs. Timestamps come from
+`time.perf_counter_ns`, a system-wide monotonic clock, so spans of different
+worker processes line up.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+# The span list being collected on this thread, if any.
+_active = threading.local()
+
+Span = Dict[str, Any]
+
+
+def current_spans() -> Optional[List[Span]]:
+    return getattr(_active, "spans", None)
+
+
+@contextmanager
+def recording(enabled: bool = True) -> Iterator[Optional[List[Span]]]:
+    """Collects the spans of the enclosed block into a new list (None if not `enabled`)."""
+    if not enabled:
+        yield None
+        return
+    previous = getattr(_active, "spans", None)
+    _active.spans = spans = []
+    try:
+        yield spans
+    finally:
+        _active.spans = previous
+
+
+def add_span(spans: List[Span], name: str, start_ns: int, end_ns: int, category: str = "generation",
+             args: Optional[Dict[str, Any]] = None) -> None:
+    """Appends a complete ("X") event for a span that started and ended at the given perf_counter_ns times."""
+    event = {"name": name, "cat": category, "ph": "X", "ts": start_ns / 1000, "dur": (end_ns - start_ns) / 1000,
+             "pid": os.getpid(), "tid": threading.get_ident()}
+    if args:
+        event["args"] = args
+    spans.append(event)
+
+
+@contextmanager
+def span(name: str, category: str = "generation", **args: Any) -> Iterator[None]:
+    """Records the enclosed block as span `name` if spans are being collected on this thread."""
+    spans = getattr(_active, "spans", None)
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        add_span(spans, name, start, time.perf_counter_ns(), category, args)
+
+
+class TraceWriter:
+    """
+    Streams spans to a trace-event JSON file:
+
+        {"traceEvents": [ ... ], "displayTimeUnit": "ms"}
+
+    The file is complete once `close()` has been called; a trace cut short
+    is still readable by Perfetto, which tolerates the missing tail.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        self._first = True
+        self._named_pids: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def _write_event(self, event: Span) -> None:
+        if not self._first:
+            self._file.write(",\n")
+        self._first = False
+        self._file.write(json.dumps(event, default=str))
+
+    def write(self, spans: Optional[List[Span]]) -> None:
+        """Appends `spans`, naming each process's track the first time it appears."""
+        if not spans:
+            return
+        with self._lock:
+            for event in spans:
+                pid = event["pid"]
+                if pid not in self._named_pids:
+                    self._named_pids.add(pid)
+                    name = "synth_data_gen" if pid == os.getpid() else f"worker {pid}"
+                    self._write_event({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}})
+                self._write_event(event)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write("\n]}\n")
+            self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def traced_plan(planned: Iterator[Any], writer: TraceWriter) -> Iterator[Any]:
+    """Hands on `planned`'s items, recording the planning of each one as a "plan" span."""
+    planned = iter(planned)
+    while True:
+        with recording() as spans:
+            with span("plan", category="setup"):
+                item = next(planned, None)
+        writer.write(spans)
+        if item is None:
+            return
+        yield item
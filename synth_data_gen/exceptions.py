@@ -0,0 +1,20 @@
+"""
+Custom exceptions (as defined in the spec). Re-exported by the package.
+"""
+
+
+class InvalidConfigError(ValueError):
+    """Raised for issues with the configuration structure or values."""
+
+
+class GeneratorError(RuntimeError):
+    """Base class for errors occurring within a specific generator."""
+
+
+class EpubGenerationError(GeneratorError): pass
+class PdfGenerationError(GeneratorError): pass
+class MarkdownGenerationError(GeneratorError): pass
+
+
+class PluginError(RuntimeError):
+    """Raised for issues related to discovering or loading generator plugins."""
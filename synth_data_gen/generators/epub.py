@@ -1,14 +1,20 @@
 import os
 import subprocess
+import io
 import re
-import random # Added import
-from typing import Any, Dict, List
+import uuid
+import zipfile
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Union
 from ebooklib import epub
 
 from ..core.base import BaseGenerator
+from ..core.budget import document_scoped
+from ..core.events import phase, warn
+from ..core.tracing import span
 # Assuming utils.py contains the necessary helper functions.
 # Adjust if these were moved/refactored elsewhere during initial migration.
-from ..common.utils import ensure_output_directories #, _create_epub_book, _add_epub_chapters, _write_epub_file
+from ..core.layout import ensure_directory
 
 # Import epub_components - these might be refactored into helper classes or methods
 from .epub_components import (
@@ -22,11 +28,40 @@ from .epub_components import (
     toc,
 )
 
+SEEDED_EPUB_MTIME = datetime(2000, 1, 1)
+
+
+def _normalize_zip_timestamps(path: Union[str, BinaryIO]) -> None:
+    """
+    Rewrites the zip at `path` (a filename or a seekable binary file object)
+    with every entry dated SEEDED_EPUB_MTIME, so a seeded EPUB is
+    byte-identical no matter when it was written.
+    Entry order and compression (e.g. the stored `mimetype` first) are kept.
+    """
+    fixed_date_time = SEEDED_EPUB_MTIME.timetuple()[:6]
+    buffer = io.BytesIO()
+    if not isinstance(path, str):
+        path.seek(0)
+    with zipfile.ZipFile(path, "r") as source, zipfile.ZipFile(buffer, "w") as target:
+        for info in source.infolist():
+            normalized = zipfile.ZipInfo(info.filename, date_time=fixed_date_time)
+            normalized.compress_type = info.compress_type
+            normalized.external_attr = info.external_attr
+            target.writestr(normalized, source.read(info.filename))
+    if isinstance(path, str):
+        with open(path, "wb") as f:
+            f.write(buffer.getvalue())
+    else:
+        path.seek(0)
+        path.truncate()
+        path.write(buffer.getvalue())
+
 class EpubGenerator(BaseGenerator):
     """
     Generator for EPUB files.
     """
     GENERATOR_ID = "epub"
+    SETTINGS_SECTION = "epub_specific_settings"
 
     def get_default_specific_config(self) -> Dict[str, Any]:
         """
@@ -75,59 +110,18 @@ class EpubGenerator(BaseGenerator):
             print("Warning: epub_version not found in specific_config, using default.")
             # Or raise InvalidConfigError
         
-        # Add more detailed validation based on epub_specific_settings schema
-        # For example, check types, ranges, allowed values for various keys.
-        # This is a placeholder for more comprehensive validation.
+        # Types and ranges are checked against the epub_specific_settings schema by super().
         return True
 
-    def _determine_count(self, config_value: Any, element_name_for_logging: str = "element") -> int:
-        """
-        Determines the count of an element based on its configuration value.
-        Handles integer, range object, or probabilistic object.
-        """
-        if isinstance(config_value, int):
-            return config_value
-        elif isinstance(config_value, dict):
-            if "min" in config_value and "max" in config_value:
-                min_val = config_value.get("min", 0)
-                max_val = config_value.get("max", 0)
-                if not (isinstance(min_val, int) and isinstance(max_val, int) and min_val <= max_val):
-                    print(f"Warning: Invalid range for {element_name_for_logging}: {config_value}. Defaulting to 0.")
-                    return 0
-                return random.randint(min_val, max_val)
-            elif "chance" in config_value:
-                chance = config_value.get("chance", 0.0)
-                # per_unit_of = config_value.get("per_unit_of", "document") # Not used in this simplified version yet
-                max_total = config_value.get("max_total", 1) # Default to generating 1 if chance met
-                
-                if not (isinstance(chance, float) and 0.0 <= chance <= 1.0):
-                    print(f"Warning: Invalid chance for {element_name_for_logging}: {chance}. Defaulting to 0.")
-                    return 0
-                
-                if random.random() < chance:
-                    # For simplicity, if chance hits, generate 1 up to max_total.
-                    # A more complex version might involve another random number for count.
-                    return min(1, max_total) if isinstance(max_total, int) and max_total >=0 else 1
-                return 0
-            else:
-                print(f"Warning: Unknown dictionary structure for {element_name_for_logging} count: {config_value}. Defaulting to 0.")
-                return 0
-        else:
-            print(f"Warning: Unknown config type for {element_name_for_logging} count: {config_value}. Defaulting to 0.")
-            return 0
-
-    def _create_chapter_content(self, book: epub.EpubBook, chapter_number: int, chapter_title: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> epub.EpubHtml:
+    def _create_chapter_content(self, book: epub.EpubBook, chapter_number: int, chapter_title: str, specific_config: Dict[str, Any], global_config: Dict[str, Any],
+                                num_sections: int, num_notes: int) -> epub.EpubHtml:
         """
         Creates and adds a single chapter's content to the EPUB book.
         This is a placeholder and will be expanded with epub_components.
+        `num_sections` and `num_notes` are drawn for every chapter at once by `_build_book`.
         """
         # Placeholder content generation
         chapter_content_html = f"<h1>{chapter_title}</h1>"
-        
-        # Simulate sections using _determine_count
-        default_sections_config = self.get_default_specific_config().get("content_elements", {}).get("sections_per_chapter_config", 1)
-        sections_config = specific_config.get("sections_per_chapter_config", default_sections_config)
-        num_sections = self._determine_count(sections_config, f"sections_in_chapter_{chapter_number}")
 
         for j in range(num_sections):
             section_number = j + 1
@@ -143,11 +137,6 @@ class EpubGenerator(BaseGenerator):
         # Add content from content_types.py (e.g., blockquotes, lists)
         # Example: chapter_content_html += content_types.generate_blockquote(specific_config.get("content_elements", {}).get("blockquote_styles", {}))
 
-        # Notes generation for the chapter
-        notes_system_config = specific_config.get("notes_system", self.get_default_specific_config()["notes_system"])
-        notes_config_value = notes_system_config.get("notes_config", 0) # Default to 0 if not present
-        num_notes = self._determine_count(notes_config_value, f"notes_in_chapter_{chapter_number}")
-
         # Create the chapter EpubHtml item
         # Content before citations and notes
         current_chapter_html_content = chapter_content_html
@@ -174,13 +163,19 @@ class EpubGenerator(BaseGenerator):
         include_images = multimedia_config.get("include_images", False)
         if include_images:
             images_config_value = multimedia_config.get("images_config", 0)
-            num_images = self._determine_count(images_config_value, f"images_in_chapter_{chapter_number}")
+            with self.unit_scope(**self._chapter_units(num_sections)):
+                num_images = self._determine_count(images_config_value, f"images_in_chapter_{chapter_number}")
             if num_images > 0:
                 self._add_images_to_chapter(book, c, chapter_number, num_images, specific_config, global_config)
 
         book.add_item(c)
         return c
 
+    @staticmethod
+    def _chapter_units(num_sections: int) -> Dict[str, int]:
+        """The units of a chapter that `per_unit_of` counts are drawn over; each section renders one paragraph."""
+        return {"chapter": 1, "section": num_sections, "paragraph": num_sections}
+
     def _add_notes_to_chapter(self, book: epub.EpubBook, chapter_item: epub.EpubHtml, chapter_number: int, num_notes: int, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
         """
         Adds notes to a given chapter based on the configuration.
@@ -283,10 +278,10 @@ class EpubGenerator(BaseGenerator):
                         processed_keys.add(image_key)
                         return f'<img src="{epub_image_path}" alt="{alt_text}" />'
                     except IOError as e:
-                        print(f"Warning: Could not read image file {img_path_on_disk}: {e}")
+                        warn(f"Warning: Could not read image file {img_path_on_disk}: {e}")
                         return match.group(0) # Return original marker on error
                 else:
-                    print(f"Warning: Image path {img_path_on_disk} for key '{image_key}' not found.")
+                    warn(f"Warning: Image path {img_path_on_disk} for key '{image_key}' not found.")
                     return match.group(0) # Return original marker if path not found
             return match.group(0)
 
@@ -361,12 +356,34 @@ class EpubGenerator(BaseGenerator):
         Generates a single EPUB file.
         """
         # Ensure output directory exists
-        ensure_output_directories(os.path.dirname(output_path))
+        ensure_directory(os.path.dirname(output_path))
+
+        with phase("build"):
+            book = self._build_book(specific_config, global_config)
+        with phase("write"):
+            self._write_book(book, output_path)
+        self._run_epubcheck(specific_config, output_path)
+        return output_path
 
+    def render(self, specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> bytes:
+        """
+        Generates a single EPUB in memory and returns its bytes. Nothing is
+        written to disk, so EPUBCheck validation (which needs a file) is skipped.
+        """
+        with phase("build"):
+            book = self._build_book(specific_config, global_config)
+        buffer = io.BytesIO()
+        with phase("write"):
+            self._write_book(book, buffer)
+        return buffer.getvalue()
+
+    @document_scoped
+    def _build_book(self, specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> epub.EpubBook:
+        """Builds the complete EpubBook (metadata, chapters, navigation, styles) without writing it."""
         book = epub.EpubBook()
 
         # 1. Set Metadata (from global_config and specific_config)
-        book.set_identifier(specific_config.get("isbn", f"urn:uuid:{os.urandom(16).hex()}"))
+        book.set_identifier(specific_config.get("isbn", f"urn:uuid:{uuid.UUID(int=self.rng.getrandbits(128), version=4)}"))
         title = specific_config.get('title', 'Untitled')
         title_prefix = specific_config.get('title_prefix')
         if title_prefix:
@@ -399,6 +416,13 @@ class EpubGenerator(BaseGenerator):
         default_chapters_config = self.get_default_specific_config()["chapters_config"]
         chapters_config_value = specific_config.get("chapters_config", default_chapters_config)
         num_chapters = self._determine_count(chapters_config_value, "chapters")
+        default_sections_config = self.get_default_specific_config().get("content_elements", {}).get("sections_per_chapter_config", 1)
+        sections_config = specific_config.get("sections_per_chapter_config", default_sections_config)
+        sections_per_chapter = self._determine_counts(sections_config, "sections_in_chapter", num_chapters)
+        notes_system_config = specific_config.get("notes_system", self.get_default_specific_config()["notes_system"])
+        notes_config_value = notes_system_config.get("notes_config", 0) # Default to 0 if not present
+        notes_per_chapter = self._determine_counts_per_unit(notes_config_value, "notes_in_chapter",
+                                                            [self._chapter_units(n) for n in sections_per_chapter])
 
         chapters_content: List[epub.EpubHtml] = []
         for i in range(num_chapters):
@@ -406,7 +430,9 @@ class EpubGenerator(BaseGenerator):
             chapter_title = f"Chapter {chapter_number}" # Placeholder title
             # Actual title generation will be more complex, possibly using epub_components.structure
             
-            chapter_item = self._create_chapter_content(book, chapter_number, chapter_title, specific_config, global_config)
+            with span("chapter", number=chapter_number):
+                chapter_item = self._create_chapter_content(book, chapter_number, chapter_title, specific_config, global_config,
+                                                            sections_per_chapter[i], notes_per_chapter[i])
             chapters_content.append(chapter_item)
             # book.add_item(chapter_item) # Already added in _create_chapter_content
 
@@ -439,17 +465,18 @@ class EpubGenerator(BaseGenerator):
         # If include_ncx_flag is True (explicitly), actual_include_ncx is True.
         # If include_ncx_flag is False (explicitly), actual_include_ncx remains False.
         
-        if actual_include_ncx:
-            toc.create_ncx(book, chapters_content, toc_settings)
-            # create_ncx is expected to set book.toc and add the NCX item
-
-        if actual_include_nav_doc:
-            # toc.create_nav_document expects epub_version as a string like "3.0"
-            # epub_version_str is already defined and used for logic above.
-            nav_item = toc.create_nav_document(book, chapters_content, toc_settings, epub_version_str)
-            if nav_item:
-                book.add_item(nav_item)
-            # create_nav_document is expected to add the NavDoc item
+        with phase("toc"):
+            if actual_include_ncx:
+                toc.create_ncx(book, chapters_content, toc_settings)
+                # create_ncx is expected to set book.toc and add the NCX item
+
+            if actual_include_nav_doc:
+                # toc.create_nav_document expects epub_version as a string like "3.0"
+                # epub_version_str is already defined and used for logic above.
+                nav_item = toc.create_nav_document(book, chapters_content, toc_settings, epub_version_str)
+                if nav_item:
+                    book.add_item(nav_item)
+                # create_nav_document is expected to add the NavDoc item
         
         if not actual_include_ncx and not actual_include_nav_doc:
             book.toc = () # Ensure toc is empty if no ToC was generated
@@ -510,7 +537,7 @@ class EpubGenerator(BaseGenerator):
                         )
                         book.add_item(font_item)
                     except IOError as e:
-                        print(f"Warning: Could not read font file {font_path}: {e}")
+                        warn(f"Warning: Could not read font file {font_path}: {e}")
         
         style = 'BODY {color: black;}' # Basic style
         # Potentially add @font-face rules here if fonts were embedded
@@ -518,30 +545,34 @@ class EpubGenerator(BaseGenerator):
         nav_css = epub.EpubItem(uid="style_nav", file_name="style/nav.css", media_type="text/css", content=style)
         book.add_item(nav_css)
 
-        # 6. Write EPUB file
-        epub.write_epub(output_path, book, {})
+        return book
+
+    def _write_book(self, book: epub.EpubBook, target: Union[str, BinaryIO]) -> None:
+        """Writes `book` to a path or a binary file object."""
+        # Seeded books get a fixed dcterms:modified instead of the current time.
+        epub.write_epub(target, book, {"mtime": SEEDED_EPUB_MTIME} if self.deterministic else {})
+        if self.deterministic:
+            _normalize_zip_timestamps(target)
 
+    def _run_epubcheck(self, specific_config: Dict[str, Any], output_path: str) -> None:
         validation_settings = specific_config.get("validation", {})
         if validation_settings.get("run_epubcheck"):
             epubcheck_path = validation_settings.get("epubcheck_path")
             if epubcheck_path and os.path.exists(epubcheck_path):
                 try:
-                    result = subprocess.run(
-                        ['java', '-jar', epubcheck_path, output_path],
-                        capture_output=True, text=True, check=False
-                    )
+                    with phase("epubcheck"):
+                        result = subprocess.run(
+                            ['java', '-jar', epubcheck_path, output_path],
+                            capture_output=True, text=True, check=False
+                        )
                     if result.returncode != 0:
-                        print(f"EPUBCheck for {output_path} found issues:\n{result.stderr}")
-                    else:
-                        print(f"EPUBCheck for {output_path} passed.")
+                        warn(f"EPUBCheck for {output_path} found issues:\n{result.stderr}")
                 except Exception as e:
-                    print(f"Error running EPUBCheck for {output_path}: {e}")
+                    warn(f"Error running EPUBCheck for {output_path}: {e}")
             elif epubcheck_path:
-                print(f"Warning: EPUBCheck path '{epubcheck_path}' not found. Skipping validation.")
+                warn(f"Warning: EPUBCheck path '{epubcheck_path}' not found. Skipping validation.")
             else:
-                print("Warning: EPUBCheck path not configured. Skipping validation.")
-        
-        return output_path
+                warn("Warning: EPUBCheck path not configured. Skipping validation.")
 
 # Example of how epub_components might be used (conceptual)
 # This would be inside the generate method or helper methods within EpubGenerator
@@ -1,16 +1,18 @@
 import os
 import json # For JSON frontmatter
-import random
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from ..core.base import BaseGenerator
-from ..common.utils import ensure_output_directories # Assuming MD_DIR is handled by output_path
+from ..core.budget import document_scoped
+from ..core.events import phase, warn
+from ..core.layout import ensure_directory
 
 class MarkdownGenerator(BaseGenerator):
     """
     Generator for Markdown files.
     """
     GENERATOR_ID = "markdown"
+    SETTINGS_SECTION = "markdown_specific_settings"
 
     def get_default_specific_config(self) -> Dict[str, Any]:
         """
@@ -101,19 +103,33 @@ class MarkdownGenerator(BaseGenerator):
         """
         Generates a single Markdown file.
         """
-        ensure_output_directories(os.path.dirname(output_path))
-        
+        with phase("render"):
+            content = self.render_content(specific_config, global_config)
+        return self.write_content(content, output_path)
+
+    def render(self, specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> bytes:
+        """Generates a single Markdown document in memory and returns it UTF-8 encoded."""
+        with phase("render"):
+            return self.render_content(specific_config, global_config).encode("utf-8")
+
+    @document_scoped
+    def render_content(self, specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> str:
+        """
+        Renders the Markdown document text without touching the filesystem.
+        Split from generate() so async callers can overlap one document's write
+        with the rendering of the next.
+        """
         content = ""
         fm_config = specific_config.get("frontmatter", {})
         # Check include_chance before calling _generate_frontmatter
-        # Handles float chance vs random.random(), and exact 1.0 for definite inclusion, 0.0 for definite exclusion.
+        # Handles float chance vs self.rng.random(), and exact 1.0 for definite inclusion, 0.0 for definite exclusion.
         should_include_frontmatter_val = fm_config.get("include_chance", 0.0)
         
         if isinstance(should_include_frontmatter_val, float):
             if should_include_frontmatter_val == 1.0: # Definite include
                 content = self._generate_frontmatter(specific_config, global_config)
             elif should_include_frontmatter_val > 0.0: # Probabilistic include (chance > 0)
-                if should_include_frontmatter_val >= random.random():
+                if should_include_frontmatter_val >= self.rng.random():
                     content = self._generate_frontmatter(specific_config, global_config)
             # If should_include_frontmatter_val is 0.0 (or less, though not expected), do nothing.
         elif isinstance(should_include_frontmatter_val, int) and should_include_frontmatter_val == 1: # Handles integer 1
@@ -151,14 +167,18 @@ The YAML frontmatter above contains intentional syntax errors.
         elif variant == "with_latex":
             content += self._create_md_with_latex_content(specific_config, global_config)
         else:
-            print(f"Warning: Unknown Markdown variant '{variant}'. Generating basic elements.")
+            warn(f"Warning: Unknown Markdown variant '{variant}'. Generating basic elements.")
             content += self._create_md_basic_elements_content(specific_config, global_config)
+        return content
 
+    def write_content(self, content: str, output_path: str) -> str:
+        """Writes rendered Markdown text to output_path."""
+        ensure_directory(os.path.dirname(output_path))
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
+            with phase("write"), open(output_path, 'w', encoding='utf-8') as f:
                 f.write(content)
         except Exception as e:
-            print(f"Error creating Markdown {output_path}: {e}") # Consider raising GeneratorError
+            warn(f"Error creating Markdown {output_path}: {e}") # Consider raising GeneratorError
             # Or return an error status/message
         return output_path
 
@@ -169,15 +189,20 @@ The YAML frontmatter above contains intentional syntax errors.
         num_headings_to_generate = self._determine_count(headings_config, "headings")
         max_depth = headings_config.get("max_depth", 3)
 
+        # One paragraph per heading plus the fixed body paragraph; `per_unit_of` counts are drawn over these.
+        document_units = {"heading": num_headings_to_generate, "paragraph": num_headings_to_generate + 1}
+
         list_items_config = specific_config.get("md_list_items_config", {"count": 0, "include_lists": False})
         num_list_items = 0
         if list_items_config.get("include_lists", False):
-            num_list_items = self._determine_count(list_items_config, "md_list_items")
+            with self.unit_scope(**document_units):
+                num_list_items = self._determine_count(list_items_config, "md_list_items")
 
         images_config = specific_config.get("md_images_config", {"count": 0, "include_images": False})
         num_images = 0
         if images_config.get("include_images", False):
-            num_images = self._determine_count(images_config, "md_images")
+            with self.unit_scope(**document_units):
+                num_images = self._determine_count(images_config, "md_images")
 
         # If no dynamic elements are to be generated, return empty string to avoid static content
         if num_headings_to_generate == 0 and num_list_items == 0 and num_images == 0:
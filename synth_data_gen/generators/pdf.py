@@ -1,24 +1,60 @@
+import copy
+import io
 import os
-from typing import Any, Dict, List
-import random
+from typing import Any, BinaryIO, Dict, List, Union
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib import colors # Added import
 from reportlab.lib.pagesizes import letter, A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.platypus import Paragraph, Spacer, SimpleDocTemplate, Table, TableStyle, Flowable, PageBreak
 from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT, TA_CENTER
 from reportlab.lib import colors
 
 from ..core.base import BaseGenerator
-from ..common.utils import ensure_output_directories # Assuming PDF_DIR is handled by output_path logic
+from ..core.budget import document_scoped
+from ..core.events import phase, warn
+from ..core.tracing import span
+from ..core.layout import ensure_directory
+
+def _copy_style_sheet(template: StyleSheet1) -> StyleSheet1:
+    """
+    Returns an independent copy of `template` that can be mutated freely.
+    ParagraphStyle copies its parent's attributes when created, so shallow
+    copies with parent links re-pointed at the copies behave exactly like a
+    fresh getSampleStyleSheet(), at a fraction of the cost.
+    """
+    sheet = StyleSheet1()
+    copies = {}
+    for name, style in template.byName.items():
+        copies[id(style)] = sheet.byName[name] = copy.copy(style)
+    for style_copy in copies.values():
+        if style_copy.parent is not None:
+            style_copy.parent = copies.get(id(style_copy.parent), style_copy.parent)
+    for alias, style in template.byAlias.items():
+        sheet.byAlias[alias] = copies[id(style)]
+    return sheet
+
 
 class PdfGenerator(BaseGenerator):
     """
     Generator for PDF files.
     """
     GENERATOR_ID = "pdf"
+    SETTINGS_SECTION = "pdf_specific_settings"
+    _style_sheet_template: StyleSheet1 = None
+
+    def _style_sheet(self) -> StyleSheet1:
+        """
+        A private copy of the sample stylesheet for one document (or chapter).
+        The template is built once per generator instance, so long-lived
+        instances (worker processes, GenerationSession) don't rebuild it for
+        every document.
+        """
+        if self._style_sheet_template is None:
+            self._style_sheet_template = getSampleStyleSheet()
+        return _copy_style_sheet(self._style_sheet_template)
 
     def get_default_specific_config(self) -> Dict[str, Any]:
         """
@@ -60,8 +96,27 @@ class PdfGenerator(BaseGenerator):
         """
         Generates a single PDF file based on the chosen variant in specific_config.
         """
-        ensure_output_directories(os.path.dirname(output_path))
-        
+        ensure_directory(os.path.dirname(output_path))
+        with phase("render"):
+            self._write_variant(output_path, specific_config, global_config)
+        return output_path
+
+    def render(self, specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> bytes:
+        """
+        Generates a single PDF in memory and returns its bytes; nothing is
+        written to disk.
+        """
+        buffer = io.BytesIO()
+        with phase("render"):
+            self._write_variant(buffer, specific_config, global_config)
+        return buffer.getvalue()
+
+    @document_scoped
+    def _write_variant(self, output_path: Union[str, BinaryIO], specific_config: Dict[str, Any], global_config: Dict[str, Any]) -> None:
+        """
+        Writes the PDF variant chosen in specific_config to `output_path`, a
+        filename or a binary file object (reportlab accepts either).
+        """
         variant = specific_config.get("pdf_variant", "single_column_text")
         # For simplicity, we'll call the old functions directly, adapting them slightly.
         # In a full refactor, their logic would be integrated more deeply.
@@ -92,7 +147,7 @@ class PdfGenerator(BaseGenerator):
                 self._create_pdf_visual_toc_hyperlinked(output_path, specific_config, global_config)
             else:
                 # Fallback if ToC is explicitly disabled for this variant
-                print(f"Info: Visual ToC variant selected but 'visual_toc.enable' is false. Generating single_column_text instead.")
+                warn(f"Info: Visual ToC variant selected but 'visual_toc.enable' is false. Generating single_column_text instead.")
                 self._create_pdf_text_single_column(output_path, specific_config, global_config)
         elif variant == "running_headers_footers":
             self._create_pdf_running_headers_footers(output_path, specific_config, global_config)
@@ -102,13 +157,17 @@ class PdfGenerator(BaseGenerator):
             self._create_pdf_simple_table(output_path, specific_config, global_config)
         else:
             # Default to single column or raise an error for unknown variant
-            print(f"Warning: Unknown PDF variant '{variant}'. Generating single_column_text instead.")
+            warn(f"Warning: Unknown PDF variant '{variant}'. Generating single_column_text instead.")
             self._create_pdf_text_single_column(output_path, specific_config, global_config)
             # Or raise GeneratorError(f"Unknown PDF variant: {variant}")
 
-        return output_path
-
     # --- Helper methods adapted from the original functions ---
+
+    @staticmethod
+    def _build_document(doc: SimpleDocTemplate, story: List[Flowable], **page_handlers) -> None:
+        """Lays out and writes `story` (SimpleDocTemplate.build), timed as the "build" phase."""
+        with phase("build"):
+            doc.build(story, **page_handlers)
     # Note: These methods are made private and adapted to take config and full output_path
 
     def _create_pdf_text_single_column(self, filepath: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
@@ -129,18 +188,16 @@ class PdfGenerator(BaseGenerator):
         rotation = page_setup_config.get("rotation", 0)
 
         mixed_chance = specific_config.get("mixed_page_sizes_orientations_chance", 0.0)
-        if random.random() < mixed_chance:
+        if self.rng.random() < mixed_chance:
             possible_page_sizes = ["letter", "a4"]
             possible_orientations = ["portrait", "landscape"]
             possible_rotations = [0, 90, 180, 270] # Add 180 if SUT handles it later
 
-            page_size_name = random.choice(possible_page_sizes)
-            orientation = random.choice(possible_orientations)
-            rotation = random.choice(possible_rotations)
-            # Update page_setup_config for consistency if other parts of SUT use it later
-            page_setup_config["page_size"] = page_size_name
-            page_setup_config["orientation"] = orientation
-            page_setup_config["rotation"] = rotation
+            page_size_name = self.rng.choice(possible_page_sizes)
+            orientation = self.rng.choice(possible_orientations)
+            rotation = self.rng.choice(possible_rotations)
+            # Rebind (configs are read-only and shared) so later uses in this document see the choice
+            page_setup_config = dict(page_setup_config, page_size=page_size_name, orientation=orientation, rotation=rotation)
 
 
         if page_size_name == "a4":
@@ -166,7 +223,8 @@ class PdfGenerator(BaseGenerator):
             leftMargin=left_margin_pt,
             rightMargin=right_margin_pt,
             topMargin=top_margin_pt,
-            bottomMargin=bottom_margin_pt
+            bottomMargin=bottom_margin_pt,
+            invariant=self.deterministic # no timestamps or random ids in seeded output
         )
         
         # Set additional metadata if provided in config
@@ -177,7 +235,7 @@ class PdfGenerator(BaseGenerator):
         if "creator_tool" in specific_config:
             doc.creator = specific_config["creator_tool"]
             
-        styles = getSampleStyleSheet()
+        styles = self._style_sheet()
         styleN = styles['Normal']
         styleH1 = styles['h1']
         # styleH2 = styles['h2'] # Defined in _add_pdf_chapter_content now
@@ -207,7 +265,8 @@ class PdfGenerator(BaseGenerator):
         # Add Visual ToC if enabled
         visual_toc_config = specific_config.get("visual_toc", {})
         if visual_toc_config.get("enable", False):
-            toc_flowables = self.get_visual_toc_flowables(specific_config, global_config)
+            with phase("toc"):
+                toc_flowables = self.get_visual_toc_flowables(specific_config, global_config)
             story.extend(toc_flowables)
             story.append(PageBreak()) # Add a page break after ToC
 
@@ -216,7 +275,8 @@ class PdfGenerator(BaseGenerator):
 
         for i in range(num_chapters_to_generate):
             chapter_title_str = f"Chapter {i+1}: A Synthetic Exploration"
-            self._add_pdf_chapter_content(story, i + 1, chapter_title_str, specific_config, global_config)
+            with span("chapter", number=i + 1):
+                self._add_pdf_chapter_content(story, i + 1, chapter_title_str, specific_config, global_config)
             if i < num_chapters_to_generate -1: # Add spacer between chapters, but not after the last one
                  story.append(Spacer(1, 0.2*inch))
 
@@ -324,22 +384,22 @@ class PdfGenerator(BaseGenerator):
 
         try:
             if on_first_page_handler and on_later_pages_handler:
-                doc.build(story, onFirstPage=on_first_page_handler, onLaterPages=on_later_pages_handler)
+                self._build_document(doc, story, onFirstPage=on_first_page_handler, onLaterPages=on_later_pages_handler)
             elif on_first_page_handler: # Should not happen if onLater is also set
-                doc.build(story, onFirstPage=on_first_page_handler)
+                self._build_document(doc, story, onFirstPage=on_first_page_handler)
             elif on_later_pages_handler: # Should not happen if onFirst is also set
-                 doc.build(story, onLaterPages=on_later_pages_handler)
+                 self._build_document(doc, story, onLaterPages=on_later_pages_handler)
             else:
-                doc.build(story)
+                self._build_document(doc, story)
         except Exception as e:
-            print(f"Error creating PDF {filepath}: {e}") # Consider raising GeneratorError
+            warn(f"Error creating PDF {filepath}: {e}") # Consider raising GeneratorError
 
     def _create_pdf_text_multi_column(self, filepath: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
-        c = canvas.Canvas(filepath, pagesize=letter)
+        c = canvas.Canvas(filepath, pagesize=letter, invariant=self.deterministic)
         c.setTitle(specific_config.get("title", "Multi-Column Text PDF"))
         c.setAuthor(specific_config.get("author", global_config.get("default_author", "Synthetic Data Generator")))
 
-        styles = getSampleStyleSheet()
+        styles = self._style_sheet()
         styleN = styles['Normal']
         styleH1 = styles['h1']
         styleN.fontName = specific_config.get("base_font_family", "Helvetica")
@@ -379,16 +439,17 @@ class PdfGenerator(BaseGenerator):
             current_y -= (item_height + 0.05*inch)
             
         try:
-            c.save()
+            with phase("write"):
+                c.save()
         except Exception as e:
-            print(f"Error creating PDF {filepath}: {e}")
+            warn(f"Error creating PDF {filepath}: {e}")
 
     def _create_pdf_text_flow_around_image(self, filepath: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
-        c = canvas.Canvas(filepath, pagesize=letter)
+        c = canvas.Canvas(filepath, pagesize=letter, invariant=self.deterministic)
         c.setTitle(specific_config.get("title", "Text Flow Around Image PDF"))
         c.setAuthor(specific_config.get("author", global_config.get("default_author", "Synthetic Data Generator")))
 
-        styles = getSampleStyleSheet()
+        styles = self._style_sheet()
         styleN = styles['Normal']
         styleH1 = styles['h1']
         styleN.fontName = specific_config.get("base_font_family", "Helvetica")
@@ -418,9 +479,10 @@ class PdfGenerator(BaseGenerator):
         p_below.drawOn(c, inch, inch ) 
 
         try:
-            c.save()
+            with phase("write"):
+                c.save()
         except Exception as e:
-            print(f"Error creating PDF {filepath}: {e}")
+            warn(f"Error creating PDF {filepath}: {e}")
 
     def _degrade_text(self, text: str, accuracy: float) -> str:
         """Simulates OCR degradation based on accuracy level."""
@@ -433,7 +495,7 @@ class PdfGenerator(BaseGenerator):
         
         # Get indices of characters that are not newlines or spaces
         possible_indices = [i for i, char in enumerate(degraded_text_list) if char not in ['\n', ' ']]
-        random.shuffle(possible_indices) # Shuffle in place
+        self.rng.shuffle(possible_indices) # Shuffle in place
         
         # Degrade characters
         for i in range(min(num_chars_to_degrade, len(possible_indices))):
@@ -448,17 +510,17 @@ class PdfGenerator(BaseGenerator):
         canvas_obj.saveState()
         font_name = annotation_settings.get("annotation_font_family", "Helvetica")
         font_size_min, font_size_max = annotation_settings.get("annotation_font_size_pt_range", [8, 12])
-        font_size = random.uniform(font_size_min, font_size_max)
+        font_size = self.rng.uniform(font_size_min, font_size_max)
         
         color_rgb = annotation_settings.get("annotation_color_rgb", [0,0,0]) # Default black
         opacity_min, opacity_max = annotation_settings.get("annotation_opacity_range", [0.5, 1.0])
-        opacity = random.uniform(opacity_min, opacity_max)
+        opacity = self.rng.uniform(opacity_min, opacity_max)
         
         rotation_min, rotation_max = annotation_settings.get("annotation_rotation_degrees_range", [-5, 5])
-        rotation = random.uniform(rotation_min, rotation_max)
+        rotation = self.rng.uniform(rotation_min, rotation_max)
 
         text_options = annotation_settings.get("annotation_text_options", ["Sample Annotation"])
-        text = random.choice(text_options) if text_options else "Sample Annotation"
+        text = self.rng.choice(text_options) if text_options else "Sample Annotation"
 
         # Position randomly on the page (simple approach)
         # Ensure text is somewhat within bounds, considering rotation might push it out
@@ -470,8 +532,8 @@ class PdfGenerator(BaseGenerator):
         max_x_start = page_width - text_width - 20 # 20 as a small buffer
         max_y_start = page_height - font_size - 20 # 20 as a small buffer
         
-        x = random.uniform(20, max_x_start if max_x_start > 20 else page_width / 2)
-        y = random.uniform(font_size + 20, max_y_start if max_y_start > (font_size + 20) else page_height / 2)
+        x = self.rng.uniform(20, max_x_start if max_x_start > 20 else page_width / 2)
+        y = self.rng.uniform(font_size + 20, max_y_start if max_y_start > (font_size + 20) else page_height / 2)
 
         canvas_obj.setFillColorRGB(color_rgb[0], color_rgb[1], color_rgb[2], alpha=opacity)
         canvas_obj.setFont(font_name, font_size)
@@ -484,14 +546,14 @@ class PdfGenerator(BaseGenerator):
         
         font_family = annotation_settings.get("annotation_font_family", "Helvetica") # Default if not specified
         font_size_range = annotation_settings.get("annotation_font_size_pt_range", [10, 14])
-        font_size = random.uniform(font_size_range[0], font_size_range[1])
+        font_size = self.rng.uniform(font_size_range[0], font_size_range[1])
         
         color_rgb = annotation_settings.get("annotation_color_rgb", [0,0,0]) # Default black
         opacity_range = annotation_settings.get("annotation_opacity_range", [0.6, 0.9])
-        opacity = random.uniform(opacity_range[0], opacity_range[1])
+        opacity = self.rng.uniform(opacity_range[0], opacity_range[1])
         
         rotation_range = annotation_settings.get("annotation_rotation_degrees_range", [-15, 15])
-        rotation = random.uniform(rotation_range[0], rotation_range[1])
+        rotation = self.rng.uniform(rotation_range[0], rotation_range[1])
 
         # Position randomly on the page, avoiding extreme edges
         # Ensure text_width is calculated *after* setting font, if needed for precise placement
@@ -501,8 +563,8 @@ class PdfGenerator(BaseGenerator):
         max_y = page_height - margin - font_size # Approx
         
         # Ensure max_x and max_y are not less than margin to avoid negative ranges for randint
-        pos_x = random.uniform(margin, max(margin, max_x))
-        pos_y = random.uniform(margin, max(margin, max_y))
+        pos_x = self.rng.uniform(margin, max(margin, max_x))
+        pos_y = self.rng.uniform(margin, max(margin, max_y))
 
         canvas_obj.setFillColorRGB(color_rgb[0], color_rgb[1], color_rgb[2], alpha=opacity)
         # Note: ReportLab's setFillColorRGB doesn't take alpha directly. setFillAlpha is separate.
@@ -528,16 +590,16 @@ class PdfGenerator(BaseGenerator):
         # More complex logic based on annotation_style will be added later.
         
         annotation_texts = annotation_settings.get("annotation_text_options", ["Default Annotation"])
-        text_to_draw = random.choice(annotation_texts) if annotation_texts else "Default Annotation"
+        text_to_draw = self.rng.choice(annotation_texts) if annotation_texts else "Default Annotation"
         
         # Basic font and color
         # TODO: Use annotation_font_family and other style settings
         canvas_obj.setFont("Helvetica", 10)
-        canvas_obj.setFillColorRGB(random.random(), random.random(), random.random())
+        canvas_obj.setFillColorRGB(self.rng.random(), self.rng.random(), self.rng.random())
 
         # Random position
-        x_pos = random.uniform(page_width * 0.1, page_width * 0.9)
-        y_pos = random.uniform(page_height * 0.1, page_height * 0.9)
+        x_pos = self.rng.uniform(page_width * 0.1, page_width * 0.9)
+        y_pos = self.rng.uniform(page_height * 0.1, page_height * 0.9)
 
         canvas_obj.drawString(x_pos, y_pos, text_to_draw)
 
@@ -559,31 +621,31 @@ class PdfGenerator(BaseGenerator):
 
 
         for _ in range(num_particles):
-            x = random.uniform(0, page_width)
-            y = random.uniform(0, page_height)
+            x = self.rng.uniform(0, page_width)
+            y = self.rng.uniform(0, page_height)
             
             if noise_type == "salt-and-pepper":
-                particle_size = random.uniform(0.5, 1.5) # pixels/points for salt-pepper
-                if random.random() < 0.5:
+                particle_size = self.rng.uniform(0.5, 1.5) # pixels/points for salt-pepper
+                if self.rng.random() < 0.5:
                     canvas_obj.setFillColorRGB(0, 0, 0) # Black
                 else:
                     canvas_obj.setFillColorRGB(1, 1, 1) # White
                 # Use small filled rectangles for salt-and-pepper
                 canvas_obj.rect(x, y, particle_size, particle_size, fill=1, stroke=0)
             elif noise_type == "speckle": # Default behavior
-                dot_size = random.uniform(0.1, 0.8) # points for speckle
-                grey_value = random.uniform(0.3, 0.7) # Mid to darkish grey
+                dot_size = self.rng.uniform(0.1, 0.8) # points for speckle
+                grey_value = self.rng.uniform(0.3, 0.7) # Mid to darkish grey
                 canvas_obj.setFillColorRGB(grey_value, grey_value, grey_value)
                 canvas_obj.circle(x, y, dot_size, fill=1, stroke=0)
             # Add other noise types here if needed
             elif noise_type == "gaussian":
                 # Minimal distinct behavior for Gaussian: blue squares
-                particle_size = random.uniform(0.5, 1.0)
+                particle_size = self.rng.uniform(0.5, 1.0)
                 canvas_obj.setFillColorRGB(0, 0, 1) # Blue
                 canvas_obj.rect(x, y, particle_size, particle_size, fill=1, stroke=0)
             else: # Default to speckle if noise_type is unknown
-                dot_size = random.uniform(0.1, 0.8)
-                grey_value = random.uniform(0.3, 0.7)
+                dot_size = self.rng.uniform(0.1, 0.8)
+                grey_value = self.rng.uniform(0.3, 0.7)
                 canvas_obj.setFillColorRGB(grey_value, grey_value, grey_value)
                 canvas_obj.circle(x, y, dot_size, fill=1, stroke=0)
 
@@ -658,7 +720,7 @@ class PdfGenerator(BaseGenerator):
         canvas_obj.restoreState()
 
     def _create_pdf_simulated_ocr_high_quality(self, filepath: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
-        c = canvas.Canvas(filepath, pagesize=letter)
+        c = canvas.Canvas(filepath, pagesize=letter, invariant=self.deterministic)
         c.setTitle(specific_config.get("title", "Simulated High-Quality OCR PDF"))
         c.setAuthor(specific_config.get("author", global_config.get("default_author", "Synthetic Data Generator")))
         if "subject" in specific_config:
@@ -672,7 +734,7 @@ class PdfGenerator(BaseGenerator):
         if "creator_tool" in specific_config:
             c.setCreator(specific_config["creator_tool"])
 
-        styles = getSampleStyleSheet()
+        styles = self._style_sheet()
         styleN = styles['Normal']
         styleN.fontName = specific_config.get("base_font_family", 'Courier') # OCR often results in monospace
         styleN.fontSize = specific_config.get("base_font_size_pt", 12)
@@ -700,16 +762,16 @@ class PdfGenerator(BaseGenerator):
         # Apply skew before adding content to story or drawing
         # For this variant, we apply it once to the canvas before drawing the story.
         # A more complex implementation might apply it per page or per item.
-        if random.random() < skew_chance and max_skew_angle > 0:
+        if self.rng.random() < skew_chance and max_skew_angle > 0:
             # ReportLab's skew is in degrees for the x and y axes relative to the normal axes.
             # A common OCR skew simulation might only skew along one axis slightly.
             # Let's apply a random skew to the x-axis (affecting shear parallel to y-axis)
             # and a smaller random skew to the y-axis (affecting shear parallel to x-axis)
             # Positive ax skews the X axis by ax degrees towards the Y axis.
             # Positive ay skews the Y axis by ay degrees towards the X axis.
-            skew_x_angle = random.uniform(-max_skew_angle, max_skew_angle)
+            skew_x_angle = self.rng.uniform(-max_skew_angle, max_skew_angle)
             # Optionally, make y_skew smaller or also up to max_skew_angle
-            skew_y_angle = random.uniform(-max_skew_angle / 2, max_skew_angle / 2)
+            skew_y_angle = self.rng.uniform(-max_skew_angle / 2, max_skew_angle / 2)
             c.skew(skew_x_angle, skew_y_angle)
             # Note: Skew is part of the canvas's current transformation matrix.
             # It might need to be reset if other elements shouldn't be skewed.
@@ -742,18 +804,20 @@ class PdfGenerator(BaseGenerator):
         noise_level_percent = ocr_simulation_settings.get("noise_level_percent", 5) # Default to 5%
         current_noise_level = noise_level_percent / 100.0 # Convert percent to 0.0-1.0 float
         noise_type = ocr_simulation_settings.get("noise_type", "speckle") # Default to speckle
-        if random.random() < noise_chance and current_noise_level > 0:
-            self._apply_ocr_noise(c, letter[0], letter[1], current_noise_level, noise_type)
+        if self.rng.random() < noise_chance and current_noise_level > 0:
+            with phase("ocr_noise"):
+                self._apply_ocr_noise(c, letter[0], letter[1], current_noise_level, noise_type)
 
         include_annotations_chance = ocr_simulation_settings.get("include_handwritten_annotations_chance", 0.0)
-        if random.random() < include_annotations_chance:
+        if self.rng.random() < include_annotations_chance:
             # Pass relevant parts of ocr_simulation_settings to the annotation method
             self._apply_handwritten_annotation(c, letter[0], letter[1], ocr_simulation_settings)
             
         try:
-            c.save()
+            with phase("write"):
+                c.save()
         except Exception as e:
-            print(f"Error creating PDF {filepath}: {e}")
+            warn(f"Error creating PDF {filepath}: {e}")
 
     def _draw_watermark_wrapped_for_onpage(self, canvas: canvas.Canvas, doc, watermark_settings: Dict[str, Any]):
         """Wrapper to call _draw_watermark with page dimensions from doc for onPage events."""
@@ -824,7 +888,7 @@ class PdfGenerator(BaseGenerator):
         canvas.restoreState()
 
     def _create_pdf_with_bookmarks(self, filepath: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
-        c = canvas.Canvas(filepath, pagesize=letter)
+        c = canvas.Canvas(filepath, pagesize=letter, invariant=self.deterministic)
         c.setTitle(specific_config.get("title", "PDF with Bookmarks (ToC)"))
         c.setAuthor(specific_config.get("author", global_config.get("default_author", "Synthetic Data Generator")))
 
@@ -844,12 +908,13 @@ class PdfGenerator(BaseGenerator):
         c.drawText(text_c1)
         
         try:
-            c.save()
+            with phase("write"):
+                c.save()
         except Exception as e:
-            print(f"Error creating PDF {filepath}: {e}")
+            warn(f"Error creating PDF {filepath}: {e}")
 
     def _create_pdf_visual_toc_hyperlinked(self, filepath: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
-        c = canvas.Canvas(filepath, pagesize=letter)
+        c = canvas.Canvas(filepath, pagesize=letter, invariant=self.deterministic)
         c.setTitle(specific_config.get("title", "PDF with Visual Hyperlinked ToC"))
         c.setAuthor(specific_config.get("author", global_config.get("default_author", "Synthetic Data Generator")))
         
@@ -923,7 +988,7 @@ class PdfGenerator(BaseGenerator):
         max_depth = specific_config.get("visual_toc", {}).get("max_depth", 1) # Default to 1 if not specified
             
         # Get a default style sheet to copy from for indentation
-        styles = getSampleStyleSheet()
+        styles = self._style_sheet()
         default_style = styles['Normal']
 
         
@@ -972,11 +1037,11 @@ class PdfGenerator(BaseGenerator):
                 canvas_item.drawString(inch, 0.75 * inch, footer_config.get("left_content", f"Page {doc.page}"))
             canvas_item.restoreState()
 
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
+        doc = SimpleDocTemplate(filepath, pagesize=letter, invariant=self.deterministic)
         doc.title = specific_config.get("title", "PDF with Headers/Footers")
         doc.author = specific_config.get("author", global_config.get("default_author", "Synthetic Data Generator"))
         
-        styles = getSampleStyleSheet()
+        styles = self._style_sheet()
         styleN = styles['Normal']
         styleH1 = styles['h1']
         styleN.fontName = specific_config.get("base_font_family", "Helvetica")
@@ -989,12 +1054,12 @@ class PdfGenerator(BaseGenerator):
             story.append(Spacer(1, 0.1*inch))
         
         try:
-            doc.build(story, onFirstPage=draw_header_footer, onLaterPages=draw_header_footer)
+            self._build_document(doc, story, onFirstPage=draw_header_footer, onLaterPages=draw_header_footer)
         except Exception as e:
-            print(f"Error creating PDF {filepath}: {e}")
+            warn(f"Error creating PDF {filepath}: {e}")
 
     def _create_pdf_bottom_page_footnotes(self, filepath: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
-        c = canvas.Canvas(filepath, pagesize=letter)
+        c = canvas.Canvas(filepath, pagesize=letter, invariant=self.deterministic)
         c.setTitle(specific_config.get("title", "PDF with Bottom Page Footnotes"))
         c.setAuthor(specific_config.get("author", global_config.get("default_author", "Synthetic Data Generator")))
 
@@ -1019,12 +1084,13 @@ class PdfGenerator(BaseGenerator):
         c.drawString(inch, fn_y, fn2_text)
 
         try:
-            c.save()
+            with phase("write"):
+                c.save()
         except Exception as e:
-            print(f"Error creating PDF {filepath}: {e}")
+            warn(f"Error creating PDF {filepath}: {e}")
 
     def _create_pdf_simple_table(self, filepath: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
-        styles = getSampleStyleSheet()
+        styles = self._style_sheet()
         styleH1 = styles['h1']
         
         story = []
@@ -1050,14 +1116,14 @@ class PdfGenerator(BaseGenerator):
 
         doc = SimpleDocTemplate(filepath, pagesize=letter,
                                 leftMargin=inch, rightMargin=inch,
-                                topMargin=inch, bottomMargin=inch)
+                                topMargin=inch, bottomMargin=inch, invariant=self.deterministic)
         doc.title = specific_config.get("title", "PDF with Simple Table")
         doc.author = specific_config.get("author", global_config.get("default_author", "Synthetic Data Generator"))
         
         try:
-            doc.build(story)
+            self._build_document(doc, story)
         except Exception as e:
-            print(f"Error creating PDF {filepath}: {e}")
+            warn(f"Error creating PDF {filepath}: {e}")
 
     def _add_pdf_chapter_content(self, story: List, chapter_number: int, chapter_title: str, specific_config: Dict[str, Any], global_config: Dict[str, Any]):
             """
@@ -1065,7 +1131,7 @@ class PdfGenerator(BaseGenerator):
             This is a placeholder to be expanded or called by more specific content generation.
             For the current test, its existence and call count are what matter.
             """
-            styles = getSampleStyleSheet()
+            styles = self._style_sheet()
             styleH2 = styles['h2']
             styleN = styles['Normal']
             
@@ -1078,12 +1144,14 @@ class PdfGenerator(BaseGenerator):
             text_blocks = specific_config.get("text_blocks_config", [])
             ligature_config = specific_config.get("ligature_simulation", {"enable": True}) # Default to enabled
 
+            num_paragraphs = 1 # the placeholder paragraph below
             for block in text_blocks:
                 if block.get("type") == "text":
                     text_content = block.get("content", "")
                     processed_text = self._process_text_for_ligatures(text_content, ligature_config)
                     story.append(Paragraph(processed_text, styleN))
                     story.append(Spacer(1, 0.1*inch))
+                    num_paragraphs += 1
 
             # Simulate determining counts for sub-elements within a chapter
             # to align with test mock expectations for _determine_count calls.
@@ -1092,12 +1160,16 @@ class PdfGenerator(BaseGenerator):
             sections_config = specific_config.get("sections_per_chapter_config", 0)
             num_sections = self._determine_count(sections_config, f"sections_chap_{chapter_number}")
             
+            # `per_unit_of` counts are drawn over this chapter's units.
+            chapter_units = {"chapter": 1, "section": num_sections, "paragraph": num_paragraphs}
             notes_config = specific_config.get("notes_system", {}).get("notes_config", 0)
-            num_notes = self._determine_count(notes_config, f"notes_chap_{chapter_number}")
+            with self.unit_scope(**chapter_units):
+                num_notes = self._determine_count(notes_config, f"notes_chap_{chapter_number}")
             
             images_config = specific_config.get("multimedia", {}).get("images_config", 0)
             if specific_config.get("multimedia", {}).get("include_images", False):
-                num_images = self._determine_count(images_config, f"images_chap_{chapter_number}")
+                with self.unit_scope(**chapter_units):
+                    num_images = self._determine_count(images_config, f"images_chap_{chapter_number}")
                 # In a real implementation, would loop num_images and add content
             else:
                 # If include_images is false, _determine_count for images might still be called
@@ -1166,7 +1238,7 @@ class PdfGenerator(BaseGenerator):
         # Placeholder for the figure itself (e.g., a box)
         # In a real implementation, this would involve creating an Image flowable
         # For now, we'll just add a spacer or a simple paragraph representing the figure.
-        styles = getSampleStyleSheet()
+        styles = self._style_sheet()
         styleN = styles['Normal']
         story.append(Paragraph("[Placeholder Figure Image]", styleN)) # Placeholder for figure
         story.append(Spacer(1, 0.1*inch))
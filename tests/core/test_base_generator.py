@@ -41,4 +41,52 @@ def test_validate_config_empty_configs(concrete_generator_instance):
     """Test validate_config with empty but valid dictionary inputs."""
     specific_config = {}
     global_config = {}
-    assert concrete_generator_instance.validate_config(specific_config, global_config)
\ No newline at end of file
+    assert concrete_generator_instance.validate_config(specific_config, global_config)
+class FileWritingGenerator(ConcreteGenerator):
+    def generate(self, specific_config, global_config, output_path):
+        with open(output_path, "wb") as f:
+            f.write(specific_config["payload"])
+        return output_path
+
+def test_render_falls_back_to_generate_in_temp_dir(tmp_path, monkeypatch):
+    """Test that the default render() returns the bytes generate() wrote, without leaving files behind."""
+    import tempfile
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    assert FileWritingGenerator().render({"payload": b"\x00abc"}, {}) == b"\x00abc"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_determine_count_compiles_each_quantity_once(concrete_generator_instance, mocker):
+    from synth_data_gen.core import base
+    compile_spy = mocker.spy(base, "compile_quantity")
+    range_config = {"min": 1, "max": 3}
+    counts = [concrete_generator_instance._determine_count(range_config, "items") for _ in range(20)]
+    assert set(counts) <= {1, 2, 3}
+    assert compile_spy.call_count == 1
+    assert len(concrete_generator_instance._determine_counts(range_config, "items", 5)) == 5
+    assert compile_spy.call_count == 1
+
+
+def test_determine_count_per_unit_of_uses_declared_units(concrete_generator_instance):
+    notes_config = {"chance": 0.1, "per_unit_of": "paragraph", "max_total": 30}
+    with concrete_generator_instance.unit_scope(paragraph=100_000):
+        assert concrete_generator_instance._determine_count(notes_config, "notes") == 30
+    assert concrete_generator_instance._determine_count(notes_config, "notes") in (0, 1)
+    counts = concrete_generator_instance._determine_counts_per_unit(notes_config, "notes", [{"paragraph": 1000}] * 3)
+    assert sum(counts) == 30
+    # Parents that don't declare the unit hold one of it.
+    assert concrete_generator_instance._determine_counts_per_unit({"chance": 1.0, "per_unit_of": "paragraph"}, "notes",
+                                                                  [{"paragraph": 3}, {}, {"paragraph": 0}]) == [3, 1, 0]
+
+
+def test_max_total_is_shared_across_a_document(concrete_generator_instance, mocker):
+    from synth_data_gen.core import quantity
+    notes_config = {"chance": 1.0, "if_true": 5, "max_total": 12}
+    with concrete_generator_instance.document_budget():
+        counts = [concrete_generator_instance._determine_count(notes_config, f"notes_in_chapter_{i}") for i in range(10)]
+        sample_spy = mocker.spy(quantity.CappedQuantity, "sample_in_scope")
+        assert concrete_generator_instance._determine_count(notes_config, "notes_in_chapter_11") == 0
+        assert sample_spy.call_count == 0 # spent budgets don't sample at all
+    assert counts == [5, 5, 2] + [0] * 7
+    # Outside a document each draw is capped on its own.
+    assert concrete_generator_instance._determine_count(notes_config, "notes") == 5
@@ -0,0 +1,31 @@
+from synth_data_gen.core.budget import DocumentBudget, current_budget, document_budget, document_scoped
+
+
+def test_document_budget_spends_down_to_zero():
+    budget = DocumentBudget()
+    assert budget.remaining("notes", 10) == 10
+    assert budget.spend("notes", 10, 4) == 4
+    assert budget.spend("notes", 10, 9) == 6
+    assert budget.exhausted("notes", 10)
+    assert budget.spend("notes", 10, 3) == 0
+    assert budget.remaining("images", 2) == 2
+
+def test_document_budget_nests_and_closes():
+    assert current_budget() is None
+    with document_budget() as outer:
+        with document_budget() as inner:
+            assert inner is outer
+        assert current_budget() is outer
+    assert current_budget() is None
+
+def test_document_scoped_opens_a_fresh_budget_per_call():
+    seen = []
+
+    @document_scoped
+    def build():
+        seen.append(current_budget())
+
+    build()
+    build()
+    assert seen[0] is not None and seen[1] is not None and seen[0] is not seen[1]
+    assert current_budget() is None
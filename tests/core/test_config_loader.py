@@ -188,6 +188,46 @@ class TestConfigLoader(unittest.TestCase):
         
         self.loader.default_config_path = original_default_path
 
+    def test_l_and_v_config_override_object_only_no_default_no_user_file(self):
+        self.loader.default_config_path = "non_existent_default_for_this_test.yaml"
+        override = {"project_name": "Override Only", "settings": {"log_level": "INFO"}}
+        schema = {"type": "object", "properties": {"project_name": {"type": "string"}}, "required": ["project_name"]}
+
+        loaded_data = self.loader.load_and_validate_config(config_override_object=override, schema=schema)
+        self.assertEqual(loaded_data, override)
+        self.assertIsNot(loaded_data["settings"], override["settings"]) # merged copy, not the caller's object
+
+        with self.assertRaises(jsonschema.exceptions.ValidationError):
+            self.loader.load_and_validate_config(config_override_object={"version": "1.0.0"}, schema=schema)
+
+    def test_l_and_v_config_override_object_merges_over_user_file(self):
+        user_config_path = os.path.join(self.test_data_dir, "user_config_for_override.yaml")
+        with open(user_config_path, 'w', encoding='utf-8') as f:
+            yaml.dump({"project_name": "From File", "settings": {"log_level": "DEBUG"}}, f)
+
+        loaded_data = self.loader.load_and_validate_config(
+            config_path=user_config_path, config_override_object={"settings": {"retry_attempts": 5}}
+        )
+        self.assertEqual(loaded_data["project_name"], "From File")
+        self.assertEqual(loaded_data["settings"]["log_level"], "DEBUG")
+        self.assertEqual(loaded_data["settings"]["retry_attempts"], 5)
+        self.assertEqual(loaded_data["settings"]["output_path"], "./generated_data") # from default
+
+    def test_l_and_v_config_path_alias_and_file_path_precedence(self):
+        file_path_config = os.path.join(self.test_data_dir, "file_path_config.yaml")
+        config_path_config = os.path.join(self.test_data_dir, "config_path_config.yaml")
+        with open(file_path_config, 'w', encoding='utf-8') as f:
+            yaml.dump({"project_name": "From file_path"}, f)
+        with open(config_path_config, 'w', encoding='utf-8') as f:
+            yaml.dump({"project_name": "From config_path"}, f)
+
+        loaded_data = self.loader.load_and_validate_config(config_path=config_path_config)
+        self.assertEqual(loaded_data["project_name"], "From config_path")
+
+        # When both are given, file_path wins and config_path is ignored.
+        loaded_data = self.loader.load_and_validate_config(file_path=file_path_config, config_path=config_path_config)
+        self.assertEqual(loaded_data["project_name"], "From file_path")
+
     # Schema validation tests (on effective/merged config)
     def test_l_and_v_valid_schema_on_isolated_file(self): # Renamed, tests isolated validation
         valid_schema_config_path = os.path.join(self.test_data_dir, "valid_for_schema_config.yaml")
@@ -330,5 +370,114 @@ class TestConfigLoader(unittest.TestCase):
         non_existent_config = self.loader.get_generator_config(full_config, "non_existent_settings")
         self.assertEqual(non_existent_config, {})
 
+    def test_l_and_v_config_returns_read_only_config(self):
+        from synth_data_gen.core.frozen import FrozenDict
+        config = self.loader.load_and_validate_config(config_override_object={"settings": {"log_level": "DEBUG"}})
+        self.assertIsInstance(config, FrozenDict)
+        self.assertEqual(config["settings"]["log_level"], "DEBUG")
+        with self.assertRaises(TypeError):
+            config["settings"]["log_level"] = "ERROR"
+        derived = self.loader._merge_configs(config, {"settings": {"retry_attempts": 3}})
+        self.assertIs(derived["authors"], config["authors"]) # untouched sections are shared
+        self.assertEqual(config["settings"].get("retry_attempts"), 1)
+        self.assertIsInstance(self.loader.get_generator_config(config, "missing"), FrozenDict)
+
+    # Tests for the parsed-config cache
+    def _write_yaml(self, filename, content):
+        path = os.path.join(self.test_data_dir, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.dump(content, f)
+        return path
+
+    def test_load_config_parses_unchanged_file_once(self):
+        path = self._write_yaml("cached_config.yaml", {"key": "value"})
+        with patch('synth_data_gen.core.config_loader.yaml.load', wraps=yaml.load) as mock_load:
+            first = self.loader.load_config(path)
+            first["key"] = "mutated by caller"
+            second = ConfigLoader().load_config(path)
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual(second, {"key": "value"}) # callers get their own copy
+
+    def test_load_config_reparses_changed_content_with_same_mtime(self):
+        path = self._write_yaml("rewritten_config.yaml", {"key": "aaa"})
+        stat = os.stat(path)
+        self.assertEqual(self.loader.load_config(path), {"key": "aaa"})
+        self._write_yaml("rewritten_config.yaml", {"key": "bbb"})
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.loader.load_config(path), {"key": "bbb"})
+
+    def test_load_config_uses_libyaml_loader_when_available(self):
+        from synth_data_gen.core import config_loader
+        expected = yaml.CSafeLoader if getattr(yaml, "__with_libyaml__", False) else yaml.SafeLoader
+        self.assertIs(config_loader.YAML_LOADER, expected)
+
+    def test_persistent_cache_is_written_and_reused(self):
+        from synth_data_gen.core import config_loader
+        path = self._write_yaml("persisted_config.yaml", {"nested": {"n": 1}})
+        loader = ConfigLoader(persistent_cache=True)
+        self.assertEqual(loader.load_config(path), {"nested": {"n": 1}})
+        pickle_path = os.path.join(self.test_data_dir, ".persisted_config.yaml.parsed.pickle")
+        self.assertTrue(os.path.exists(pickle_path))
+
+        config_loader._parsed_configs.clear() # as in a fresh process
+        with patch('synth_data_gen.core.config_loader.yaml.load') as mock_load:
+            self.assertEqual(loader.load_config(path), {"nested": {"n": 1}})
+        mock_load.assert_not_called()
+
+        # A stale pickle (content changed) is ignored.
+        self._write_yaml("persisted_config.yaml", {"nested": {"n": 2}})
+        config_loader._parsed_configs.clear()
+        self.assertEqual(loader.load_config(path), {"nested": {"n": 2}})
+
+    def test_load_config_resolves_extends_and_nested_includes(self):
+        self._write_yaml("inc_base.yaml", {"output_directory_base": "base_out", "pdf": {"title": "Base", "base_font_size_pt": 10}})
+        self._write_yaml("inc_typography.yaml", {"base_font_family": "Helvetica", "base_font_size_pt": 11})
+        path = self._write_yaml("inc_team.yaml", {
+            "extends": "inc_base.yaml",
+            "pdf": {"include": ["inc_typography.yaml"], "base_font_size_pt": 12},
+        })
+        config = self.loader.load_config(path)
+        self.assertEqual(config, {
+            "output_directory_base": "base_out",
+            "pdf": {"title": "Base", "base_font_family": "Helvetica", "base_font_size_pt": 12},
+        })
+        with self.assertRaises(TypeError):
+            config["pdf"]["title"] = "changed" # resolved configs are read-only
+
+    def test_include_is_a_directive_only_in_sections_and_file_types_entries(self):
+        self._write_yaml("inc_entry.yaml", {"count": 3})
+        path = self._write_yaml("inc_scoped.yaml", {
+            "file_types": [{"type": "pdf", "include": "inc_entry.yaml"}],
+            "epub": {"assets": {"include": ["cover.jpg"]}},
+        })
+        self.assertEqual(self.loader.load_config(path), {
+            "file_types": [{"type": "pdf", "count": 3}],
+            "epub": {"assets": {"include": ["cover.jpg"]}},
+        })
+
+    def test_load_config_detects_include_cycles(self):
+        from synth_data_gen.core.config_loader import ConfigIncludeError
+        self._write_yaml("cycle_a.yaml", {"include": "cycle_b.yaml", "a": 1})
+        self._write_yaml("cycle_b.yaml", {"include": "cycle_a.yaml", "b": 1})
+        with self.assertRaisesRegex(ConfigIncludeError, "cycle_a.yaml -> cycle_b.yaml -> cycle_a.yaml"):
+            self.loader.load_config(os.path.join(self.test_data_dir, "cycle_a.yaml"))
+        path = self._write_yaml("missing_include.yaml", {"include": "no_such_fragment.yaml"})
+        with self.assertRaises(ConfigIncludeError):
+            self.loader.load_config(path)
+
+    def test_resolved_includes_are_memoized_until_a_file_changes(self):
+        self._write_yaml("memo_fragment.yaml", {"notes": {"type": "endnotes"}})
+        path = self._write_yaml("memo_config.yaml", {"epub": {"include": "memo_fragment.yaml"}})
+        first = self.loader.load_config(path)
+        with patch('synth_data_gen.core.config_loader.yaml.load', wraps=yaml.load) as mock_load:
+            self.assertIs(ConfigLoader().load_config(path), first)
+        mock_load.assert_not_called()
+
+        fragment = os.path.join(self.test_data_dir, "memo_fragment.yaml")
+        stat = os.stat(fragment)
+        self._write_yaml("memo_fragment.yaml", {"notes": {"type": "footnotes"}})
+        os.utime(fragment, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.loader.load_config(path), {"epub": {"notes": {"type": "footnotes"}}})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+import logging
+
+from synth_data_gen.core import events
+from synth_data_gen.core.events import (Event, GenerationReport, LoggingListener, PrometheusTextfileListener, collecting,
+                                        count, listeners_from_config, listening, phase, warn)
+from synth_data_gen.generators.markdown import MarkdownGenerator
+
+
+def test_without_listeners_warnings_print_and_nothing_is_emitted(capsys, mocker):
+    emit = mocker.spy(events, "emit")
+    with phase("render"):
+        count("chapters", 3)
+    warn("Warning: something odd")
+    assert capsys.readouterr().out == "Warning: something odd\n"
+    emit.assert_not_called()
+
+def test_collecting_gathers_phases_counts_and_warnings(capsys):
+    with collecting() as metrics:
+        with phase("render"):
+            count("chapters", 2)
+            count("chapters", 3)
+        with phase("render"):
+            pass
+        warn("Warning: no font")
+    assert set(metrics.phases) == {"render"} and metrics.phases["render"] >= 0
+    assert metrics.counts == {"chapters": 5}
+    assert metrics.warnings == ["Warning: no font"]
+    assert capsys.readouterr().out == ""
+
+def test_generator_counts_are_recorded_without_context_numbers():
+    generator = MarkdownGenerator()
+    with collecting() as metrics:
+        generator._determine_count(2, "sections_in_chapter_1")
+        generator._determine_count({"min": 3, "max": 3}, "sections_in_chapter_2")
+        generator._determine_counts(1, "md_images", 4)
+    assert metrics.counts == {"sections_in_chapter": 5, "md_images": 4}
+
+def test_listeners_receive_events_outside_work_items():
+    received = []
+    with listening([received.append]):
+        with phase("toc"):
+            pass
+        warn("Warning: odd")
+    with phase("toc"):
+        pass
+    assert [(e.kind, e.phase, e.message) for e in received] == [("phase", "toc", None), ("warning", None, "Warning: odd")]
+
+def test_failing_listener_does_not_stop_others(capsys):
+    received = []
+    def broken(event):
+        raise RuntimeError("boom")
+    with listening([broken, received.append]):
+        events.emit(Event("run_started"))
+    assert len(received) == 1
+    assert "boom" in capsys.readouterr().out
+
+def test_generation_report_aggregates_file_events():
+    report = GenerationReport()
+    report(Event("file_finished", file_type="pdf", path="a.pdf", duration=0.5, bytes=100,
+                 phases={"render": 0.4}, counts={"pdf_tables": 2}, warnings=["w"]))
+    report(Event("file_finished", file_type="pdf", path="b.pdf", duration=0.25, bytes=50, phases={"render": 0.2}))
+    report(Event("file_finished", file_type="pdf", path="c.pdf", error="ValueError: bad"))
+    report(Event("file_finished", file_type="pdf", path="d.pdf", bytes=10, skipped=True))
+    report(Event("run_finished", duration=2.0))
+    assert (report.files, report.failures, report.skipped, report.bytes) == (2, 1, 1, 150)
+    assert report.seconds_by_type == {"pdf": 0.75}
+    assert report.phase_seconds["render"] == 0.4 + 0.2
+    assert report.element_counts == {"pdf_tables": 2}
+    assert report.errors == [("c.pdf", "ValueError: bad")]
+    assert report.warnings == ["w"]
+    assert report.files_per_second == 1.0
+
+def test_prometheus_textfile_is_written_when_the_run_finishes(tmp_path):
+    path = tmp_path / "metrics" / "synth.prom"
+    listener = PrometheusTextfileListener(str(path))
+    listener(Event("run_started"))
+    listener(Event("file_finished", file_type='we"ird', path="a", duration=1.5, bytes=7, phases={"render": 1.0}))
+    assert not path.exists()
+    listener(Event("run_finished", duration=3.0))
+    text = path.read_text()
+    assert "# TYPE synth_data_gen_files_total counter" in text
+    assert 'synth_data_gen_files_total{file_type="we\\"ird"} 1' in text
+    assert 'synth_data_gen_phase_seconds_total{phase="render"} 1.0' in text
+    assert "synth_data_gen_run_duration_seconds 3.0" in text
+
+def test_logging_listener_logs_files_and_warnings(caplog):
+    listener = LoggingListener()
+    with caplog.at_level(logging.INFO, logger="synth_data_gen"):
+        listener(Event("file_finished", file_type="markdown", path="a.md", bytes=3, warnings=["Warning: odd"]))
+        listener(Event("file_finished", file_type="markdown", path="b.md", error="OSError: full"))
+    assert [r.levelno for r in caplog.records] == [logging.INFO, logging.WARNING, logging.ERROR]
+    assert "a.md" in caplog.records[0].getMessage()
+
+def test_listeners_from_config(tmp_path):
+    assert listeners_from_config(None) == []
+    listeners = listeners_from_config({"log": "debug", "prometheus_textfile": str(tmp_path / "m.prom")})
+    assert isinstance(listeners[0], LoggingListener) and listeners[0].level == logging.DEBUG
+    assert isinstance(listeners[1], PrometheusTextfileListener)
+    for spec in ("yes", {"log": "loud"}):
+        try:
+            listeners_from_config(spec)
+        except ValueError:
+            continue
+        raise AssertionError(f"{spec!r} was accepted")
+
+def test_listening_is_scoped_to_the_current_thread():
+    import threading
+    received, seen_elsewhere = [], []
+    with listening([received.append]):
+        thread = threading.Thread(target=lambda: seen_elsewhere.append(events.has_listeners()))
+        thread.start()
+        thread.join()
+        warn("Warning: here")
+    assert seen_elsewhere == [False]
+    assert [e.message for e in received] == ["Warning: here"]
+    assert not events.has_listeners()
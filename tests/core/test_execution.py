@@ -0,0 +1,189 @@
+import asyncio
+import os
+import threading
+import time
+import pytest
+from synth_data_gen.core.execution import (GenerationResult, WorkItem, execute_work_items_async, iter_parallel,
+                                          resolve_max_workers, run_work_item)
+from synth_data_gen.core.base import BaseGenerator
+from synth_data_gen.generators.markdown import MarkdownGenerator
+
+
+class FailingGenerator(MarkdownGenerator):
+    def render_content(self, specific_config, global_config):
+        raise ValueError("boom")
+
+
+def _md_item(tmp_path, index, generator_cls=MarkdownGenerator):
+    return WorkItem(
+        file_type="markdown",
+        index=index,
+        generator_cls=generator_cls,
+        specific_config={"md_variant": "no_frontmatter_variant"},
+        global_settings={},
+        output_path=str(tmp_path / f"markdown_{index}.md"),
+    )
+
+@pytest.mark.parametrize("value, expected", [(None, 1), (1, 1), (4, 4), (-2, 1), ("3", 1), (True, 1)])
+def test_resolve_max_workers(value, expected):
+    assert resolve_max_workers(value) == expected
+
+def test_resolve_max_workers_zero_uses_cpu_count():
+    assert resolve_max_workers(0) == (os.cpu_count() or 1)
+
+def test_run_work_item_returns_result(tmp_path):
+    item = _md_item(tmp_path, 1)
+    result = run_work_item(item)
+    assert isinstance(result, GenerationResult)
+    assert result.ok
+    assert result.path == item.output_path
+    assert (result.file_type, result.index) == ("markdown", 1)
+    assert result.bytes == os.path.getsize(item.output_path)
+    assert result.elapsed >= 0
+
+def test_run_work_item_captures_error(tmp_path):
+    item = _md_item(tmp_path, 1, FailingGenerator)
+    result = run_work_item(item)
+    assert not result.ok
+    assert isinstance(result.error, ValueError)
+    assert result.path == item.output_path
+    assert result.bytes == 0
+
+def test_iter_parallel_ordered_preserves_submission_order(tmp_path):
+    items = [_md_item(tmp_path, i) for i in range(1, 6)]
+    results = list(iter_parallel(items, max_workers=2, ordered=True))
+    assert [r.index for r in results] == [1, 2, 3, 4, 5]
+    assert all(r.ok for r in results)
+    assert all(os.path.exists(r.path) for r in results)
+
+def test_iter_parallel_consumes_items_lazily(tmp_path):
+    consumed = []
+
+    def items():
+        for i in range(1, 11):
+            consumed.append(i)
+            yield _md_item(tmp_path, i)
+
+    results = iter_parallel(items(), max_workers=1, max_pending=2)
+    first = next(results)
+    assert first.ok
+    # Only the bounded window (plus the refill after the first result) has been pulled from the plan.
+    assert len(consumed) <= 3
+    assert sorted(r.index for r in results) == [i for i in range(1, 11) if i != first.index]
+
+
+class SlowGenerator(MarkdownGenerator):
+    started = None
+
+    def render_content(self, specific_config, global_config):
+        SlowGenerator.started.set()
+        time.sleep(0.2)
+        return ""
+
+
+def _planned(items, generator):
+    for item in items:
+        yield item, generator
+
+def test_execute_work_items_async_returns_results_in_plan_order(tmp_path):
+    items = [_md_item(tmp_path, i) for i in range(1, 6)]
+    results = asyncio.run(execute_work_items_async(_planned(items, MarkdownGenerator()), max_concurrency=2))
+    assert [r.index for r in results] == [1, 2, 3, 4, 5]
+    assert all(r.ok for r in results)
+    assert all(os.path.getsize(r.path) == r.bytes for r in results)
+
+def test_execute_work_items_async_bounds_in_flight_items(tmp_path):
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    class CountingGenerator(MarkdownGenerator):
+        # A document counts as in flight from the start of rendering to the end of writing.
+        def render_content(self, specific_config, global_config):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            return super().render_content(specific_config, global_config)
+
+        def write_content(self, content, output_path):
+            time.sleep(0.02)
+            try:
+                return super().write_content(content, output_path)
+            finally:
+                with lock:
+                    in_flight.pop()
+
+    items = [_md_item(tmp_path, i) for i in range(1, 9)]
+    results = asyncio.run(execute_work_items_async(_planned(items, CountingGenerator()), max_concurrency=2))
+    assert all(r.ok for r in results)
+    assert max(peak) <= 2
+
+def test_execute_work_items_async_reports_errors_per_item(tmp_path):
+    items = [_md_item(tmp_path, 1)]
+    results = asyncio.run(execute_work_items_async(_planned(items, FailingGenerator()), max_concurrency=1))
+    assert not results[0].ok
+    assert isinstance(results[0].error, ValueError)
+
+def test_execute_work_items_async_cancellation_stops_planning(tmp_path):
+    planned_indices = []
+
+    def planned():
+        for i in range(1, 21):
+            planned_indices.append(i)
+            yield _md_item(tmp_path, i), SlowGenerator()
+
+    async def main():
+        SlowGenerator.started = threading.Event()
+        task = asyncio.ensure_future(execute_work_items_async(planned(), max_concurrency=1))
+        for _ in range(500):
+            if SlowGenerator.started.is_set():
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert len(planned_indices) <= 2
+
+class SlowWholeFileGenerator(BaseGenerator):
+    """Writes its file from a single generate() call, like the PDF and EPUB generators."""
+    GENERATOR_ID = "slow_whole_file"
+    started = None
+    finished = None
+
+    def generate(self, specific_config, global_config, output_path):
+        SlowWholeFileGenerator.started.set()
+        time.sleep(0.2)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("late")
+        SlowWholeFileGenerator.finished.set()
+        return output_path
+
+    def get_default_specific_config(self):
+        return {}
+
+def test_execute_work_items_async_cancellation_removes_output_of_running_item(tmp_path):
+    item = _md_item(tmp_path, 1, SlowWholeFileGenerator)
+
+    async def main():
+        SlowWholeFileGenerator.started = threading.Event()
+        SlowWholeFileGenerator.finished = threading.Event()
+        task = asyncio.ensure_future(execute_work_items_async(iter([(item, SlowWholeFileGenerator())]), max_concurrency=1))
+        for _ in range(500):
+            if SlowWholeFileGenerator.started.is_set():
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    # The running thread can't be interrupted; it finishes, then its file is removed.
+    assert SlowWholeFileGenerator.finished.wait(5)
+    for _ in range(100):
+        if not os.path.exists(item.output_path):
+            break
+        time.sleep(0.01)
+    assert not os.path.exists(item.output_path)
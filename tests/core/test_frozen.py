@@ -0,0 +1,64 @@
+import copy
+import json
+import pickle
+import threading
+import jsonschema
+import pytest
+from synth_data_gen.core.frozen import FrozenDict, FrozenList, freeze, merge_configs, thaw
+
+
+BASE = {"pdf": {"page_setup": {"page_size": "a4", "margins": {"top_mm": 20}}, "fonts": ["Helvetica"]}, "epub": {"title": "x"}}
+
+
+def test_freeze_makes_nested_containers_read_only():
+    config = freeze(BASE)
+    assert config == BASE and isinstance(config, dict)
+    assert isinstance(config["pdf"]["fonts"], FrozenList)
+    for mutate in (lambda: config.__setitem__("a", 1), lambda: config["pdf"].update(a=1),
+                   lambda: config["pdf"]["page_setup"].pop("page_size"), lambda: config["pdf"]["fonts"].append("Times")):
+        with pytest.raises(TypeError):
+            mutate()
+    assert freeze(config) is config
+
+def test_merge_configs_shares_untouched_subtrees():
+    base = freeze(BASE)
+    merged = merge_configs(base, {"pdf": {"page_setup": {"page_size": "letter"}}})
+    assert merged["pdf"]["page_setup"] == {"page_size": "letter", "margins": {"top_mm": 20}}
+    assert merged["epub"] is base["epub"]
+    assert merged["pdf"]["fonts"] is base["pdf"]["fonts"]
+    assert merged["pdf"]["page_setup"]["margins"] is base["pdf"]["page_setup"]["margins"]
+    assert base["pdf"]["page_setup"]["page_size"] == "a4"
+
+def test_merge_configs_does_not_alias_mutable_override_values():
+    override = {"pdf": {"fonts": ["Courier"]}}
+    merged = merge_configs(BASE, override)
+    override["pdf"]["fonts"].append("Times")
+    assert merged["pdf"]["fonts"] == ["Courier"]
+    assert BASE["pdf"]["fonts"] == ["Helvetica"]
+
+def test_frozen_configs_serialize_and_thaw():
+    config = freeze(BASE)
+    assert json.loads(json.dumps(config)) == BASE
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored == BASE and isinstance(restored, FrozenDict) and isinstance(restored["pdf"]["fonts"], FrozenList)
+    for mutable in (thaw(config), copy.deepcopy(config)):
+        mutable["pdf"]["page_setup"]["page_size"] = "letter"
+        assert type(mutable) is dict and type(mutable["pdf"]["fonts"]) is list
+    assert config["pdf"]["page_setup"]["page_size"] == "a4"
+    assert copy.copy(config) is config
+    jsonschema.validate(config, {"type": "object", "properties": {"pdf": {"type": "object"}}})
+
+def test_frozen_config_is_shared_across_threads():
+    config = freeze(BASE)
+    results = []
+
+    def derive(i):
+        results.append(merge_configs(config, {"epub": {"title": f"t{i}"}})["epub"]["title"])
+
+    threads = [threading.Thread(target=derive, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(results) == sorted(f"t{i}" for i in range(8))
+    assert config["epub"]["title"] == "x"
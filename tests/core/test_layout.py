@@ -0,0 +1,38 @@
+import os
+from synth_data_gen.core import layout as layout_module
+from synth_data_gen.core.layout import OutputLayout, ensure_directory, forget_directories
+
+
+def test_ensure_directory_creates_once(tmp_path, mocker):
+    makedirs = mocker.spy(layout_module.os, "makedirs")
+    target = str(tmp_path / "a")
+    for _ in range(3):
+        assert ensure_directory(target) == target
+    assert os.path.isdir(target)
+    assert makedirs.call_count == 1
+
+def test_forget_directories_only_drops_paths_under_base(tmp_path, mocker):
+    inside, outside = str(tmp_path / "run" / "x"), str(tmp_path / "run2")
+    ensure_directory(inside)
+    ensure_directory(outside)
+    forget_directories(str(tmp_path / "run"))
+    makedirs = mocker.spy(layout_module.os, "makedirs")
+    ensure_directory(inside)
+    ensure_directory(outside)
+    assert makedirs.call_count == 1
+
+def test_output_layout_creates_registered_dirs_lazily(tmp_path):
+    layout = OutputLayout(str(tmp_path / "out"))
+    md_dir = layout.register("markdowns")
+    assert md_dir == str(tmp_path / "out" / "markdowns")
+    assert not os.path.exists(md_dir)
+    assert layout.ensure("markdowns") == md_dir
+    assert os.path.isdir(md_dir)
+    assert layout.directories == {"markdowns": md_dir}
+
+def test_new_output_layout_recreates_deleted_dirs(tmp_path):
+    import shutil
+    base = str(tmp_path / "out")
+    OutputLayout(base).ensure("pdfs")
+    shutil.rmtree(base)
+    assert os.path.isdir(OutputLayout(base).ensure("pdfs"))
@@ -0,0 +1,105 @@
+import json
+import os
+from synth_data_gen.core.execution import GenerationResult, WorkItem, execute_work_item
+from synth_data_gen.core.manifest import MANIFEST_FILENAME, GenerationManifest, file_checksum
+from synth_data_gen.generators.markdown import MarkdownGenerator
+
+
+def _md_item(base_dir, index, specific_config=None):
+    return WorkItem(
+        file_type="markdown",
+        index=index,
+        generator_cls=MarkdownGenerator,
+        specific_config=specific_config or {"md_variant": "no_frontmatter_variant"},
+        global_settings={"base_seed": 7},
+        output_path=os.path.join(str(base_dir), "markdown", f"markdown_{index}.md"),
+        seed=1000 + index,
+    )
+
+def _generate_and_record(base_dir, item):
+    manifest = GenerationManifest(str(base_dir))
+    result = execute_work_item(item, MarkdownGenerator())
+    manifest.record(item, result)
+    manifest.close()
+    return result
+
+def test_record_writes_entry_with_hashes_and_checksum(tmp_path):
+    item = _md_item(tmp_path, 1)
+    result = _generate_and_record(tmp_path, item)
+
+    with open(tmp_path / MANIFEST_FILENAME, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry["path"] == "markdown/markdown_1.md"
+    assert entry["checksum"] == file_checksum(item.output_path) == result.checksum
+    assert entry["bytes"] == os.path.getsize(item.output_path)
+    assert entry["seed"] == 1001
+    assert entry["generator"] == "markdown"
+    assert entry["generator_version"] == MarkdownGenerator.GENERATOR_VERSION
+    assert entry["key"] == GenerationManifest.item_fields(item)["key"]
+
+def test_is_current_requires_same_inputs_and_existing_output(tmp_path):
+    item = _md_item(tmp_path, 1)
+    _generate_and_record(tmp_path, item)
+
+    manifest = GenerationManifest(str(tmp_path))
+    assert manifest.is_current(item)
+    assert not manifest.is_current(_md_item(tmp_path, 1, {"md_variant": "basic_frontmatter_variant"}))
+    assert not manifest.is_current(_md_item(tmp_path, 2))
+
+    with open(item.output_path, "r+b") as f: # same size, different content
+        first = f.read(1)
+        f.seek(0)
+        f.write(b"X" if first != b"X" else b"Y")
+    assert not manifest.is_current(item)
+
+    os.remove(item.output_path)
+    assert not manifest.is_current(item)
+
+def test_track_skips_current_items_only_when_resuming(tmp_path):
+    done, todo = _md_item(tmp_path, 1), _md_item(tmp_path, 2)
+    _generate_and_record(tmp_path, done)
+
+    manifest = GenerationManifest(str(tmp_path))
+    assert [item.index for item, _ in manifest.track([(done, None), (todo, None)])] == [1, 2]
+
+    manifest = GenerationManifest(str(tmp_path))
+    assert [item.index for item, _ in manifest.track([(done, None), (todo, None)], resume=True)] == [2]
+    skipped = list(manifest.drain_skipped())
+    assert [(r.index, r.skipped, r.ok) for r in skipped] == [(1, True, True)]
+    assert skipped[0].path == done.output_path
+
+def test_failed_results_and_malformed_lines_are_ignored(tmp_path):
+    item = _md_item(tmp_path, 1)
+    manifest = GenerationManifest(str(tmp_path))
+    list(manifest.track([(item, None)]))
+    manifest.record_result(GenerationResult(item.output_path, "markdown", 1, 0, 0.0, ValueError("boom")))
+    assert not manifest._pending
+    manifest.close()
+    assert not os.path.exists(tmp_path / MANIFEST_FILENAME)
+
+    _generate_and_record(tmp_path, item)
+    with open(tmp_path / MANIFEST_FILENAME, "a", encoding="utf-8") as f:
+        f.write('{"path": "markdown/markdown_2.md", "ke') # truncated by a crash
+    assert GenerationManifest(str(tmp_path)).is_current(item)
+
+def test_close_compacts_superseded_entries(tmp_path):
+    item = _md_item(tmp_path, 1)
+    _generate_and_record(tmp_path, item)
+    _generate_and_record(tmp_path, item)
+    _generate_and_record(tmp_path, _md_item(tmp_path, 2))
+    with open(tmp_path / MANIFEST_FILENAME, encoding="utf-8") as f:
+        assert sorted(json.loads(line)["path"] for line in f) == ["markdown/markdown_1.md", "markdown/markdown_2.md"]
+    assert GenerationManifest(str(tmp_path)).is_current(item)
+
+def test_disabled_manifest_neither_reads_nor_writes(tmp_path):
+    item = _md_item(tmp_path, 1)
+    _generate_and_record(tmp_path, item)
+    recorded = (tmp_path / MANIFEST_FILENAME).read_text()
+
+    manifest = GenerationManifest(str(tmp_path), enabled=False)
+    assert [i.index for i, _ in manifest.track([(item, None)], resume=True)] == [1]
+    manifest.record(item, execute_work_item(item, MarkdownGenerator()))
+    manifest.close()
+    assert (tmp_path / MANIFEST_FILENAME).read_text() == recorded
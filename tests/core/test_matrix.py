@@ -0,0 +1,39 @@
+import itertools
+import pytest
+from synth_data_gen.core.matrix import ConfigMatrix, overrides_for, parse_matrix
+
+
+def test_overrides_for_builds_nested_dicts():
+    assert overrides_for(["pdf_variant", "layout.columns", "layout.margins_mm.top"], ["simple_table", 2, 10]) == {
+        "pdf_variant": "simple_table", "layout": {"columns": 2, "margins_mm": {"top": 10}},
+    }
+
+def test_cases_follow_product_order():
+    matrix = ConfigMatrix({"a": [1, 2], "b.c": ["x", "y", "z"]})
+    assert matrix.size == matrix.case_count == 6
+    cases = list(matrix.cases())
+    assert [number for number, _ in cases] == list(range(1, 7))
+    assert [(case["a"], case["b"]["c"]) for _, case in cases] == list(itertools.product([1, 2], ["x", "y", "z"]))
+
+def test_sampled_cases_are_reproducible_and_lazy():
+    axes = {f"axis{i}": list(range(10)) for i in range(12)} # 10**12 combinations
+    first = list(ConfigMatrix(axes, sample=5, seed="s").cases())
+    assert first == list(ConfigMatrix(axes, sample=5, seed="s").cases())
+    assert len(first) == 5 and first != list(ConfigMatrix(axes, sample=5, seed="t").cases())
+    for number, case in first:
+        assert ConfigMatrix(axes)._combination(number - 1) == tuple(case[f"axis{i}"] for i in range(12))
+
+def test_sample_larger_than_product_yields_every_case():
+    matrix = ConfigMatrix({"a": [1, 2]}, sample=10)
+    assert matrix.case_count == 2
+    assert [case for _, case in matrix.cases()] == [{"a": 1}, {"a": 2}]
+
+def test_parse_matrix():
+    assert parse_matrix({"type": "pdf"}) is None
+    matrix = parse_matrix({"matrix": {"a": [1, 2, 3]}, "matrix_sample": 2}, base_seed=7, entry_position=1)
+    assert matrix.case_count == 2
+    assert matrix.seed == parse_matrix({"matrix": {"a": [1]}}, base_seed=7, entry_position=1).seed
+    for bad in ({"matrix": []}, {"matrix": {}}, {"matrix": {"a": []}}, {"matrix": {"a..b": [1]}},
+                {"matrix": {"a": [1], "a.b": [2]}}, {"matrix": {"a": [1]}, "matrix_sample": 0}):
+        with pytest.raises(ValueError):
+            parse_matrix(bad)
@@ -0,0 +1,81 @@
+import sys
+import textwrap
+import pytest
+from synth_data_gen.core import plugins
+from synth_data_gen.core.plugins import ENTRY_POINT_GROUP, PluginManager
+from synth_data_gen.core.registry import GeneratorRegistry
+from synth_data_gen.exceptions import PluginError
+
+
+@pytest.fixture
+def fake_plugin_dist(tmp_path, monkeypatch):
+    """An installed distribution registering a 'fake_txt' generator through an entry point."""
+    (tmp_path / "fake_txt_plugin.py").write_text(textwrap.dedent("""
+        from synth_data_gen.core.base import BaseGenerator
+
+        class FakeTxtGenerator(BaseGenerator):
+            GENERATOR_ID = "fake_txt"
+            def generate(self, specific_config, global_config, output_path):
+                with open(output_path, "w") as f:
+                    f.write("fake")
+                return output_path
+            def get_default_specific_config(self):
+                return {}
+    """))
+    dist_info = tmp_path / "fake_txt_plugin-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: fake-txt-plugin\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        f"[{ENTRY_POINT_GROUP}]\nfake_txt = fake_txt_plugin:FakeTxtGenerator\nbroken = fake_txt_plugin:Missing\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    sys.modules.pop("fake_txt_plugin", None)
+
+def test_discovers_entry_points_without_importing_them(fake_plugin_dist, tmp_path):
+    manager = PluginManager(cache_path=str(tmp_path / "plugins.json"))
+    assert manager.discover() == {"fake_txt": "fake_txt_plugin:FakeTxtGenerator", "broken": "fake_txt_plugin:Missing"}
+    assert "fake_txt_plugin" not in sys.modules
+    assert manager.load("fake_txt").GENERATOR_ID == "fake_txt"
+    with pytest.raises(PluginError):
+        manager.load("broken")
+    with pytest.raises(PluginError):
+        manager.load("unregistered")
+
+def test_discovery_result_is_cached_on_disk(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "cache" / "plugins.json")
+    scans = []
+    monkeypatch.setattr(plugins, "_scan_entry_points", lambda group: scans.append(group) or {"x": "mod:X"})
+    assert PluginManager(cache_path=cache_path).discover() == {"x": "mod:X"}
+    assert PluginManager(cache_path=cache_path).discover() == {"x": "mod:X"} # a "new process"
+    assert len(scans) == 1
+
+    # Installing a distribution touches a sys.path directory, which invalidates the cache.
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "new_dist.dist-info").mkdir()
+    PluginManager(cache_path=cache_path).discover()
+    assert len(scans) == 2
+
+    monkeypatch.setenv(plugins.PLUGIN_CACHE_ENV, "0")
+    assert PluginManager().cache_path is None
+
+def test_registry_discovers_plugins_on_first_unknown_lookup():
+    calls = []
+    registry = GeneratorRegistry({"markdown": "synth_data_gen.generators.markdown:MarkdownGenerator"},
+                                 discover=lambda: calls.append(1) or {"markdown": "elsewhere:Other", "bad": "os:path"})
+    assert registry["markdown"].GENERATOR_ID == "markdown"
+    assert calls == []
+    assert "bad" in registry and calls == [1]
+    assert registry.reference("markdown") == "synth_data_gen.generators.markdown:MarkdownGenerator" # built-ins win
+    with pytest.raises(PluginError):
+        registry["bad"]
+    assert registry.get("other") is None and calls == [1]
+
+def test_generate_data_uses_plugin_generators(fake_plugin_dist, tmp_path, monkeypatch, capsys):
+    import synth_data_gen
+    registry = GeneratorRegistry({name: synth_data_gen.GENERATOR_MAP.reference(name) for name in ("epub", "pdf", "markdown")},
+                                 discover=PluginManager(cache_path=str(tmp_path / "plugins.json")).discover)
+    monkeypatch.setattr(synth_data_gen, "GENERATOR_MAP", registry)
+    config = {"file_types": [{"type": "fake_txt", "count": 2, "filename_pattern": "f_{index}.txt"}, {"type": "broken"}]}
+    generated = synth_data_gen.generate_data(config_obj=config, output_dir_override=str(tmp_path / "out"))
+    assert sorted(p.rsplit("/", 1)[-1] for p in generated) == ["f_1.txt", "f_2.txt"]
+    assert "Could not load the generator for type 'broken'" in capsys.readouterr().out
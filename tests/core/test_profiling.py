@@ -0,0 +1,52 @@
+import os
+import pstats
+
+import pytest
+from synth_data_gen.core.profiling import PROFILING_ENV, ProfileSettings, profiled, profiling_from_config
+from synth_data_gen.core.sharding import shard_key
+
+
+def test_profiling_is_off_without_block_or_env():
+    assert profiling_from_config(None, environ={}) is None
+    assert profiling_from_config({"enable": False}, environ={}) is None
+    assert profiling_from_config({"cprofile": False}, environ={}) is None
+
+def test_env_switch_enables_and_overrides_config():
+    assert profiling_from_config(None, environ={PROFILING_ENV: "1"}) == ProfileSettings()
+    settings = profiling_from_config({"rate": 10, "types": "PDF"}, environ={PROFILING_ENV: "{rate: 500, tracemalloc: true}"})
+    assert (settings.rate, settings.tracemalloc, settings.types) == (500, True, ["pdf"])
+    assert profiling_from_config({"rate": 10}, environ={PROFILING_ENV: "0"}) is None
+
+@pytest.mark.parametrize("block", [{"rate": 0}, {"top": "many"}, {"types": [1]}, {"cprofile": "yes"}, {"sampel": 3}, ["pdf"]])
+def test_malformed_blocks_are_rejected(block):
+    with pytest.raises(ValueError):
+        profiling_from_config(block, environ={})
+
+def test_sampling_by_rate_type_and_variant():
+    keys = [shard_key(0, "pdf", index) for index in range(1, 1001)]
+    sampled = [key for key in keys if ProfileSettings(rate=50).selects(key, "pdf", {})]
+    assert 5 <= len(sampled) <= 50
+    assert sampled == [key for key in keys if ProfileSettings(rate=50).selects(key, "pdf", {})]
+
+    settings = ProfileSettings(types=["pdf"], variants=["simple_table"])
+    assert settings.selects(keys[0], "PDF", {"pdf_variant": "simple_table"})
+    assert not settings.selects(keys[0], "pdf", {"pdf_variant": "with_bookmarks"})
+    assert not settings.selects(keys[0], "markdown", {"md_variant": "simple_table"})
+
+def test_reports_are_named_after_the_output_file(tmp_path):
+    base = str(tmp_path / "out")
+    assert ProfileSettings().report_base(os.path.join(base, "pdfs", "pdf_3.pdf"), base) == os.path.join(base, "_profiles", "pdfs", "pdf_3.pdf")
+    settings = ProfileSettings(output_dir=str(tmp_path / "prof"))
+    assert settings.report_base(os.path.join(base, "pdfs", "pdf_3.pdf"), base) == str(tmp_path / "prof" / "pdfs" / "pdf_3.pdf")
+
+def test_profiled_writes_pstats_and_allocation_report(tmp_path):
+    report_base = str(tmp_path / "reports" / "doc.pdf")
+    with profiled(ProfileSettings(tracemalloc=True, top=3), report_base):
+        blocks = [bytearray(1000) for _ in range(100)]
+    assert pstats.Stats(report_base + ".pstats").total_calls > 0
+    report = open(report_base + ".alloc.txt").read()
+    assert report.startswith("Peak traced memory:") and "Top 3 allocation sites" in report
+    with profiled(None, report_base + "_unused"):
+        pass
+    assert not os.path.exists(report_base + "_unused.pstats")
+    del blocks
@@ -0,0 +1,150 @@
+import random
+import pytest
+from synth_data_gen.core import quantity
+from synth_data_gen.core.quantity import (CappedQuantity, ExactQuantity, ProbabilisticQuantity, RangeQuantity,
+                                          compile_quantity)
+
+
+@pytest.mark.parametrize("value, expected_type", [
+    (3, ExactQuantity),
+    ({"min": 1, "max": 4}, RangeQuantity),
+    ({"chance": 0.5, "if_true": {"min": 1, "max": 3}}, ProbabilisticQuantity),
+    ({"chance": 0.5, "max_total": 2}, CappedQuantity),
+])
+def test_compile_quantity_kinds(value, expected_type):
+    assert isinstance(compile_quantity(value, "items"), expected_type)
+
+@pytest.mark.parametrize("value, expected", [
+    ({"min": 3, "max": 1}, 0),
+    ({"min": -1, "max": 1}, 0),
+    ({"foo": 1}, 0),
+    ([1, 2], 0),
+    ({"chance": 2, "if_false": 4}, 4), # invalid chance falls back to if_false
+    ({"chance": 1.0, "if_true": {"min": 5, "max": 1}}, 1), # invalid if_true range
+    ({"chance": 1.0, "if_true": 7, "max_total": "x"}, 7), # invalid max_total is ignored
+])
+def test_compile_quantity_invalid_values_fall_back(value, expected, capsys):
+    sampler = compile_quantity(value, "items")
+    assert "Warning" in capsys.readouterr().out
+    assert [sampler.sample(random.Random(0)) for _ in range(5)] == [expected] * 5
+
+def test_probabilistic_quantity_honours_if_true_range_and_max_total():
+    sampler = compile_quantity({"chance": 1.0, "if_true": {"min": 2, "max": 9}, "max_total": 4}, "items")
+    draws = [sampler.sample(random.Random(seed)) for seed in range(50)]
+    assert set(draws) <= {2, 3, 4}
+    assert 4 in draws
+
+def test_single_draws_match_the_previous_rng_consumption():
+    """Compiled sampling consumes the stream like the old dict walk: random() then randint()."""
+    value = {"chance": 0.5, "if_true": {"min": 1, "max": 6}, "if_false": 0}
+    rng, reference = random.Random(7), random.Random(7)
+    sampler = compile_quantity(value, "items")
+    for _ in range(20):
+        expected = reference.randint(1, 6) if reference.random() < 0.5 else 0
+        assert sampler.sample(rng) == expected
+
+def _rng_factory(monkeypatch, use_numpy):
+    """random.Random with NumPy hidden, or numpy.random.default_rng for the vectorised draws."""
+    if not use_numpy:
+        monkeypatch.setattr(quantity, "np", None)
+        return random.Random
+    numpy = pytest.importorskip("numpy")
+    return numpy.random.default_rng
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_sample(monkeypatch, use_numpy):
+    make_rng = _rng_factory(monkeypatch, use_numpy)
+    sampler = compile_quantity({"chance": 0.5, "if_true": {"min": 1, "max": 3}, "max_total": 2}, "sections")
+    draws = sampler.sample(make_rng(1), 200)
+    assert len(draws) == 200 and all(isinstance(d, int) for d in draws)
+    assert set(draws) == {0, 1, 2}
+    assert sampler.sample(make_rng(1), 200) == draws # reproducible for a seeded stream
+    assert compile_quantity(3).sample(make_rng(1), 4) == [3, 3, 3, 3]
+    assert sampler.sample(make_rng(1), 0) == []
+
+def test_batches_from_the_item_rng_do_not_depend_on_numpy(monkeypatch):
+    sampler = compile_quantity({"distribution": "poisson", "lam": 4}, "sections")
+    per_unit = compile_quantity({"chance": 0.3, "per_unit_of": "paragraph", "if_true": {"min": 1, "max": 2}}, "notes")
+    rng = random.Random(5)
+    singles = [sampler.sample(rng) for _ in range(50)]
+    with_numpy = (sampler.sample(random.Random(5), 50), per_unit.sample_per_parent(random.Random(5), [40, 0, 7]))
+    monkeypatch.setattr(quantity, "np", None)
+    assert sampler.sample(random.Random(5), 50) == singles == with_numpy[0]
+    assert per_unit.sample_per_parent(random.Random(5), [40, 0, 7]) == with_numpy[1]
+
+
+def test_per_unit_of_draws_one_coin_per_unit():
+    sampler = compile_quantity({"chance": 0.1, "per_unit_of": "paragraph"}, "notes")
+    assert sampler.per_unit_of == "paragraph"
+    totals = [sampler.sample_units(random.Random(seed), 1000) for seed in range(20)]
+    assert 70 < sum(totals) / len(totals) < 130
+    assert sampler.sample_units(random.Random(3), 1000) == totals[3]
+    assert sampler.sample_units(random.Random(0), 0) == 0
+
+def test_per_unit_of_uses_unit_scope():
+    from synth_data_gen.core.quantity import unit_scope, units_in_scope
+    sampler = compile_quantity({"chance": 0.5, "per_unit_of": "paragraph", "max_total": 30}, "notes")
+    assert units_in_scope("paragraph") == 1
+    with unit_scope(paragraph=100_000, section=3):
+        with unit_scope(section=1):
+            assert (units_in_scope("paragraph"), units_in_scope("section"), units_in_scope("document")) == (100_000, 1, 1)
+        assert sampler.sample_in_scope(random.Random(0)) == 30
+    # Outside any scope a per-unit value is a single coin, drawn exactly like a plain probabilistic value.
+    plain = compile_quantity({"chance": 0.5, "max_total": 30}, "notes")
+    assert [sampler.sample_in_scope(random.Random(s)) for s in range(10)] == [plain.sample(random.Random(s)) for s in range(10)]
+
+def test_per_unit_of_document_is_a_single_coin():
+    assert compile_quantity({"chance": 0.5, "per_unit_of": "document"}).per_unit_of is None
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_sample_per_parent_caps_document_total(monkeypatch, use_numpy):
+    make_rng = _rng_factory(monkeypatch, use_numpy)
+    sampler = compile_quantity({"chance": 0.2, "per_unit_of": "paragraph", "if_true": {"min": 1, "max": 2}, "max_total": 30}, "notes")
+    paragraphs_per_chapter = [50] * 20
+    counts = sampler.sample_per_parent(make_rng(0), paragraphs_per_chapter)
+    assert len(counts) == 20
+    assert sum(counts) == 30 # ~300 expected before the cap
+    assert counts[0] > 0 and counts[-1] == 0 # the budget is spent in chapter order
+    uncapped = compile_quantity({"chance": 0.2, "per_unit_of": "paragraph"}, "notes").sample_per_parent(make_rng(0), [0, 10])
+    assert uncapped[0] == 0
+
+
+@pytest.mark.parametrize("value, low, high, mean_range", [
+    ({"distribution": "poisson", "lam": 4}, 0, None, (3.5, 4.5)),
+    ({"distribution": "poisson", "lam": 60, "max": 55}, 0, 55, (50, 55)),
+    ({"distribution": "normal", "mean": 6, "std": 3, "min": 2, "max": 9}, 2, 9, (5, 7)),
+    ({"distribution": "zipf", "a": 2.0, "max": 100}, 1, 100, (1.2, 3.5)),
+    ({"distribution": "empirical", "values": [1, 10], "weights": [3, 1]}, 1, 10, (2.9, 4.1)),
+])
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_distribution_quantities(monkeypatch, use_numpy, value, low, high, mean_range):
+    make_rng = _rng_factory(monkeypatch, use_numpy)
+    sampler = compile_quantity(value, "sections")
+    rng = random.Random(11)
+    draws = [sampler.sample(rng) for _ in range(500)] + sampler.sample(make_rng(11), 2000)
+    assert all(isinstance(d, int) for d in draws)
+    assert min(draws) >= low and (high is None or max(draws) <= high)
+    assert mean_range[0] <= sum(draws) / len(draws) <= mean_range[1]
+
+def test_distribution_as_probabilistic_branch():
+    sampler = compile_quantity({"chance": 1.0, "if_true": {"distribution": "poisson", "lam": 2, "min": 1}}, "notes")
+    assert min(sampler.sample(random.Random(0), 200)) >= 1
+
+def test_empirical_distribution_from_file(tmp_path):
+    (tmp_path / "hist.yaml").write_text("2: 1\n7: 0\n")
+    (tmp_path / "obs.yaml").write_text("[3, 3, 3]\n")
+    assert set(compile_quantity({"distribution": "empirical", "file": str(tmp_path / "hist.yaml")}).sample(random.Random(0), 50)) == {2}
+    assert compile_quantity({"distribution": "empirical", "file": str(tmp_path / "obs.yaml")}).sample(random.Random(0)) == 3
+
+@pytest.mark.parametrize("value", [
+    {"distribution": "gamma", "k": 2},
+    {"distribution": "poisson"},
+    {"distribution": "normal", "mean": 3, "std": 0},
+    {"distribution": "poisson", "lam": 2, "min": 5, "max": 1},
+    {"distribution": "zipf", "a": 2.0, "max": 0},
+    {"distribution": "empirical", "values": [1, 2], "weights": [1]},
+    {"distribution": "empirical", "file": "/nonexistent/hist.yaml"},
+])
+def test_invalid_distributions_fall_back_to_zero(value, capsys):
+    assert compile_quantity(value, "sections").sample(random.Random(0), 5) == [0] * 5
+    assert "Warning" in capsys.readouterr().out
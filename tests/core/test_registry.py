@@ -0,0 +1,32 @@
+import pytest
+from synth_data_gen.core.base import BaseGenerator
+from synth_data_gen.core.registry import GeneratorRegistry, load_reference
+
+
+def test_registry_imports_on_first_lookup(mocker):
+    import_module = mocker.spy(__import__("importlib"), "import_module")
+    registry = GeneratorRegistry({"markdown": "synth_data_gen.generators.markdown:MarkdownGenerator"})
+    assert "markdown" in registry and not registry.is_loaded("markdown")
+    import_module.assert_not_called()
+
+    from synth_data_gen.generators.markdown import MarkdownGenerator
+    assert registry["markdown"] is MarkdownGenerator
+    assert registry.get("markdown") is MarkdownGenerator and registry.is_loaded("markdown")
+    assert import_module.call_count == 1
+    assert registry.reference("markdown") == "synth_data_gen.generators.markdown:MarkdownGenerator"
+
+def test_registry_accepts_classes_and_copies_to_a_plain_dict():
+    class Custom(BaseGenerator):
+        def generate(self, specific_config, global_config, output_path): return output_path
+        def get_default_specific_config(self): return {}
+
+    registry = GeneratorRegistry()
+    registry["custom"] = Custom
+    assert registry.copy() == {"custom": Custom}
+    assert registry.get("missing") is None
+    del registry["custom"]
+    assert len(registry) == 0
+
+def test_load_reference_rejects_malformed_references():
+    with pytest.raises(ValueError):
+        load_reference("synth_data_gen.generators.markdown")
@@ -0,0 +1,64 @@
+import jsonschema
+import pytest
+from synth_data_gen.core import schemas
+from synth_data_gen.core.frozen import freeze
+from synth_data_gen.core.schemas import SECTION_SCHEMAS, get_validator, section_errors, validate
+from synth_data_gen.generators.epub import EpubGenerator
+from synth_data_gen.generators.markdown import MarkdownGenerator
+from synth_data_gen.generators.pdf import PdfGenerator
+
+
+@pytest.mark.parametrize("generator_cls", [EpubGenerator, PdfGenerator, MarkdownGenerator])
+def test_default_specific_configs_match_their_schema(generator_cls):
+    generator = generator_cls()
+    assert generator.SETTINGS_SECTION in SECTION_SCHEMAS
+    assert section_errors(generator.SETTINGS_SECTION, freeze(generator.get_default_specific_config())) == []
+
+def test_validators_are_compiled_once(mocker):
+    schema = {"type": "object", "properties": {"count": {"type": "integer"}}}
+    check = mocker.spy(jsonschema.Draft7Validator, "check_schema")
+    assert get_validator(schema) is get_validator(schema)
+    assert get_validator(dict(schema)) is get_validator(schema)
+    assert check.call_count == 1
+
+def test_validate_raises_like_jsonschema():
+    schema = {"type": "object", "required": ["file_types"]}
+    with pytest.raises(jsonschema.exceptions.ValidationError) as excinfo:
+        validate({}, schema)
+    with pytest.raises(jsonschema.exceptions.ValidationError) as expected:
+        jsonschema.validate({}, schema)
+    assert excinfo.value.message == expected.value.message
+    validate({"file_types": []}, schema)
+
+def test_validator_checks_formats():
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validate({"date": "not-a-date"}, {"properties": {"date": {"type": "string", "format": "date"}}})
+
+def test_section_errors_name_the_offending_keys():
+    errors = section_errors("epub_specific_settings", {
+        "chapters_config": {"min": 2, "max": "four"},
+        "include_ncx": "sometimes",
+        "multimedia": {"images_config": -1},
+        "future_option": {"anything": True},
+    })
+    assert len(errors) == 3
+    assert errors[0].startswith("epub_specific_settings.chapters_config:")
+    assert errors[1].startswith("epub_specific_settings.include_ncx:")
+    assert errors[2].startswith("epub_specific_settings.multimedia.images_config:")
+    assert section_errors("no_such_section", {"x": 1}) == []
+
+def test_quantity_schema_accepts_every_quantity_form():
+    validator = get_validator(schemas.QUANTITY_SCHEMA)
+    for value in (3, {"min": 1, "max": 5}, {"chance": 0.3, "if_true": 2, "max_total": 4},
+                  {"chance": 0.1, "per_unit_of": "paragraph"}, {"distribution": "poisson", "lam": 3.5},
+                  {"count": 5, "max_depth": 3}):
+        assert validator.is_valid(value), value
+    for value in (-1, "3", {"chance": 1.5}, {"distribution": "cauchy"}):
+        assert not validator.is_valid(value), value
+
+def test_validate_config_rejects_schema_errors(capsys):
+    generator = PdfGenerator()
+    specific_config = generator.get_default_specific_config()
+    specific_config["page_count_config"] = "ten"
+    assert not generator.validate_config(specific_config, {})
+    assert "pdf_specific_settings.page_count_config" in capsys.readouterr().out
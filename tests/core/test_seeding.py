@@ -0,0 +1,48 @@
+import random
+import threading
+from synth_data_gen.core.seeding import current_rng, current_seed, derive_seed, seeded
+from synth_data_gen.generators.markdown import MarkdownGenerator
+
+
+def test_derive_seed_is_stable_and_depends_on_every_part():
+    assert derive_seed(42, "0:pdf:1") == derive_seed(42, "0:pdf:1")
+    assert len({derive_seed(42, "0:pdf:1"), derive_seed(43, "0:pdf:1"), derive_seed(42, "0:pdf:2"), derive_seed(42, "1:pdf:1")}) == 4
+    assert 0 <= derive_seed(42, "x") < 2 ** 64
+
+def test_seeded_activates_stream_and_restores_previous():
+    assert current_rng() is random and current_seed() is None
+    with seeded(7) as rng:
+        assert current_rng() is rng and current_seed() == 7
+        first = [rng.random() for _ in range(3)]
+        with seeded(None):
+            assert current_rng() is random
+        assert current_rng() is rng
+    assert current_rng() is random and current_seed() is None
+    with seeded(7) as rng:
+        assert [rng.random() for _ in range(3)] == first
+
+def test_seeded_streams_are_per_thread():
+    generator = MarkdownGenerator()
+    results = {}
+
+    def draw(seed):
+        with seeded(seed):
+            results[seed] = [generator.rng.random() for _ in range(1000)]
+
+    threads = [threading.Thread(target=draw, args=(seed,)) for seed in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for seed in (1, 2):
+        expected = random.Random(seed)
+        assert results[seed] == [expected.random() for _ in range(1000)]
+
+def test_base_generator_determine_count_uses_active_stream():
+    generator = MarkdownGenerator()
+    with seeded(5):
+        counts = [generator._determine_count({"min": 0, "max": 100}, "items") for _ in range(10)]
+        assert generator.deterministic
+    with seeded(5):
+        assert [generator._determine_count({"min": 0, "max": 100}, "items") for _ in range(10)] == counts
+    assert not generator.deterministic
@@ -0,0 +1,24 @@
+import pytest
+from synth_data_gen.core.sharding import resolve_shard, shard_for, shard_key
+
+
+@pytest.mark.parametrize("shard_index, shard_count, expected", [
+    (None, None, None),
+    (0, 1, None),
+    (2, 4, (2, 4)),
+])
+def test_resolve_shard(shard_index, shard_count, expected):
+    assert resolve_shard(shard_index, shard_count) == expected
+
+@pytest.mark.parametrize("shard_index, shard_count", [(0, None), (None, 2), (2, 2), (-1, 2), (0, 0), ("0", 2), (True, 2)])
+def test_resolve_shard_rejects_invalid_settings(shard_index, shard_count):
+    with pytest.raises(ValueError):
+        resolve_shard(shard_index, shard_count)
+
+def test_shard_for_is_stable_and_partitions_keys():
+    keys = [shard_key(0, "markdown", i) for i in range(1, 1001)]
+    shards = [shard_for(key, 4) for key in keys]
+    assert shards == [shard_for(key, 4) for key in keys]
+    assert set(shards) == {0, 1, 2, 3}
+    # Roughly balanced: every shard gets a fair share of 1000 keys.
+    assert all(150 < shards.count(shard) < 350 for shard in range(4))
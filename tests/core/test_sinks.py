@@ -0,0 +1,66 @@
+import io
+import os
+import tarfile
+import zipfile
+import pytest
+from synth_data_gen.core.sinks import DirectorySink, TarSink, ZipSink, open_sink
+
+DOCS = {"markdowns/markdown_1.md": b"# one\n", "pdfs/pdf_1.pdf": b"%PDF-1.4 fake"}
+
+
+def _write_all(sink):
+    with sink:
+        return [sink.write(name, data) for name, data in DOCS.items()]
+
+def test_directory_sink_writes_files(tmp_path):
+    paths = _write_all(DirectorySink(str(tmp_path)))
+    assert paths == [os.path.join(str(tmp_path), "markdowns", "markdown_1.md"), os.path.join(str(tmp_path), "pdfs", "pdf_1.pdf")]
+    assert (tmp_path / "pdfs" / "pdf_1.pdf").read_bytes() == DOCS["pdfs/pdf_1.pdf"]
+
+@pytest.mark.parametrize("name, mode", [("corpus.tar", "r:"), ("corpus.tar.gz", "r:gz"), ("corpus.tgz", "r:gz")])
+def test_tar_sink_round_trip(tmp_path, name, mode):
+    target = str(tmp_path / "out" / name)
+    assert _write_all(TarSink(target, mtime=0)) == list(DOCS)
+    with tarfile.open(target, mode) as tar:
+        assert {m.name: tar.extractfile(m).read() for m in tar.getmembers()} == DOCS
+        assert {m.mtime for m in tar.getmembers()} == {0}
+
+def test_zip_sink_round_trip(tmp_path):
+    target = str(tmp_path / "corpus.zip")
+    assert _write_all(ZipSink(target)) == list(DOCS)
+    with zipfile.ZipFile(target) as zf:
+        assert {name: zf.read(name) for name in zf.namelist()} == DOCS
+
+def test_archive_sinks_write_to_unseekable_streams():
+    class Unseekable(io.BytesIO):
+        def seekable(self):
+            return False
+
+        def seek(self, *args):
+            raise io.UnsupportedOperation("seek")
+
+        def tell(self):
+            raise io.UnsupportedOperation("tell")
+
+    for sink_cls in (TarSink, ZipSink):
+        stream = Unseekable()
+        _write_all(sink_cls(stream))
+        assert not stream.closed  # left open for the caller
+        data = stream.getvalue()
+        if sink_cls is TarSink:
+            with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+                assert tar.getnames() == list(DOCS)
+        else:
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                assert {name: zf.read(name) for name in zf.namelist()} == DOCS
+
+def test_open_sink(tmp_path):
+    assert open_sink(None) is None
+    assert open_sink({"type": "directory"}) is None
+    with open_sink({"type": "tar", "path": str(tmp_path / "c.tar")}) as sink:
+        assert isinstance(sink, TarSink)
+    with open_sink({"type": "zip", "path": str(tmp_path / "c.zip")}) as sink:
+        assert isinstance(sink, ZipSink)
+    for spec in ({"type": "tar"}, {"type": "parquet", "path": "x"}, "corpus.tar"):
+        with pytest.raises(ValueError):
+            open_sink(spec)
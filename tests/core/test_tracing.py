@@ -0,0 +1,46 @@
+import json
+import os
+import threading
+
+from synth_data_gen.core.events import collecting, phase
+from synth_data_gen.core.tracing import TraceWriter, current_spans, recording, span, traced_plan
+
+
+def test_spans_are_only_recorded_while_recording():
+    with span("outside"):
+        pass
+    assert current_spans() is None
+    with recording() as spans:
+        with span("outer", number=1):
+            with phase("inner"):
+                pass
+    assert current_spans() is None
+    assert [s["name"] for s in spans] == ["inner", "outer"]
+    inner, outer = spans
+    assert outer["ph"] == "X" and outer["args"] == {"number": 1}
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert outer["pid"] == os.getpid() and outer["tid"] == threading.get_ident()
+
+def test_recording_disabled_yields_none():
+    with recording(False) as spans:
+        with span("ignored"):
+            pass
+    assert spans is None
+
+def test_phases_feed_metrics_and_trace_together():
+    with collecting() as metrics, recording() as spans:
+        with phase("write"):
+            pass
+    assert list(metrics.phases) == ["write"]
+    assert [s["name"] for s in spans] == ["write"]
+
+def test_trace_writer_streams_valid_trace_json(tmp_path):
+    path = tmp_path / "traces" / "run.json"
+    with TraceWriter(str(path)) as writer:
+        planned = list(traced_plan(iter(["a", "b"]), writer))
+        writer.write([{"name": "pdf 1", "ph": "X", "ts": 1.0, "dur": 2.0, "pid": 4242, "tid": 1}])
+        writer.write(None)
+    assert planned == ["a", "b"]
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] == ["plan", "plan", "plan", "pdf 1"]
+    assert {e["pid"]: e["args"]["name"] for e in events if e["ph"] == "M"} == {os.getpid(): "synth_data_gen", 4242: "worker 4242"}
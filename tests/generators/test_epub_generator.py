@@ -59,7 +59,7 @@ def test_validate_config_invalid_base_global_config(epub_generator_instance: Epu
 
 def test_generate_minimal_epub(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test the basic flow of the generate method for a minimal EPUB."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     
@@ -85,7 +85,7 @@ def test_generate_minimal_epub(mocker: MockerFixture, epub_generator_instance: E
 
 def test_generate_adds_basic_toc_items(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that generate calls ToC creation functions."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_create_ncx = mocker.patch('synth_data_gen.generators.epub_components.toc.create_ncx')
@@ -106,7 +106,7 @@ def test_generate_adds_basic_toc_items(mocker: MockerFixture, epub_generator_ins
     output_path = "test_output/basic_toc_test_epub2_ncx.epub"
     
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 0]) # chapters, sections, notes, images
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0]) # chapters, images
     
     epub_generator_instance.generate(specific_config, global_config, output_path)
     
@@ -115,7 +115,7 @@ def test_generate_adds_basic_toc_items(mocker: MockerFixture, epub_generator_ins
 
 def test_generate_chapters_config_exact_integer(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with chapters_config as an exact integer."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -134,7 +134,7 @@ def test_generate_chapters_config_exact_integer(mocker: MockerFixture, epub_gene
 
 def test_generate_chapters_config_range_object(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with chapters_config as a range object."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -156,7 +156,7 @@ def test_generate_chapters_config_range_object(mocker: MockerFixture, epub_gener
 
 def test_generate_chapters_config_probabilistic_object(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with chapters_config as a probabilistic object."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -178,7 +178,7 @@ def test_generate_chapters_config_probabilistic_object(mocker: MockerFixture, ep
 
 def test_generate_sections_config_exact_integer(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with sections_per_chapter_config as an exact integer."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -188,7 +188,8 @@ def test_generate_sections_config_exact_integer(mocker: MockerFixture, epub_gene
     mock_epub_book_class.return_value = mock_book_instance
     num_chapters = 1
     exact_section_count = 2
-    mock_determine_count.side_effect = [num_chapters, exact_section_count, 0, 0]
+    mock_determine_count.side_effect = [num_chapters, 0]
+    mock_determine_counts = mocker.patch.object(epub_generator_instance, '_determine_counts', return_value=[exact_section_count] * num_chapters)
     specific_config = {
         "title": "Exact Sections Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": exact_section_count
@@ -196,12 +197,12 @@ def test_generate_sections_config_exact_integer(mocker: MockerFixture, epub_gene
     global_config = {}
     output_path = "test_output/exact_sections.epub"
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[1] == mocker.call(exact_section_count, f"sections_in_chapter_1")
+    mock_determine_counts.assert_called_once_with(exact_section_count, "sections_in_chapter", num_chapters)
     assert mock_create_section_content.call_count == exact_section_count * num_chapters
 
 def test_generate_sections_config_range_object(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with sections_per_chapter_config as a range object."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -214,7 +215,8 @@ def test_generate_sections_config_range_object(mocker: MockerFixture, epub_gener
     sections_range_config = {"min": 1, "max": 3}
     expected_sections_from_range = 2
     mock_randint.return_value = expected_sections_from_range
-    mock_determine_count.side_effect = [num_chapters, expected_sections_from_range, 0, 0]
+    mock_determine_count.side_effect = [num_chapters, 0]
+    mock_determine_counts = mocker.patch.object(epub_generator_instance, '_determine_counts', return_value=[expected_sections_from_range] * num_chapters)
     specific_config = {
         "title": "Range Sections Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": sections_range_config
@@ -222,12 +224,12 @@ def test_generate_sections_config_range_object(mocker: MockerFixture, epub_gener
     global_config = {}
     output_path = "test_output/range_sections.epub"
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[1] == mocker.call(sections_range_config, f"sections_in_chapter_1")
+    mock_determine_counts.assert_called_once_with(sections_range_config, "sections_in_chapter", num_chapters)
     assert mock_create_section_content.call_count == expected_sections_from_range * num_chapters
 
 def test_generate_sections_config_probabilistic_object(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with sections_per_chapter_config as a probabilistic object."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -240,7 +242,8 @@ def test_generate_sections_config_probabilistic_object(mocker: MockerFixture, ep
     sections_prob_config = {"chance": 0.8, "max_total": 2}
     mock_random_random.return_value = 0.7
     expected_sections_from_prob = 1
-    mock_determine_count.side_effect = [num_chapters, expected_sections_from_prob, 0, 0]
+    mock_determine_count.side_effect = [num_chapters, 0]
+    mock_determine_counts = mocker.patch.object(epub_generator_instance, '_determine_counts', return_value=[expected_sections_from_prob] * num_chapters)
     specific_config = {
         "title": "Probabilistic Sections Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": sections_prob_config
@@ -248,12 +251,12 @@ def test_generate_sections_config_probabilistic_object(mocker: MockerFixture, ep
     global_config = {}
     output_path = "test_output/prob_sections.epub"
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[1] == mocker.call(sections_prob_config, f"sections_in_chapter_1")
+    mock_determine_counts.assert_called_once_with(sections_prob_config, "sections_in_chapter", num_chapters)
     assert mock_create_section_content.call_count == expected_sections_from_prob * num_chapters
 
 def test_generate_notes_config_exact_integer(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with notes_config (exact integer)."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -263,7 +266,8 @@ def test_generate_notes_config_exact_integer(mocker: MockerFixture, epub_generat
     mock_epub_book_class.return_value = mock_book_instance
     num_chapters = 1
     exact_notes_count = 3
-    mock_determine_count.side_effect = [num_chapters, 1, exact_notes_count, 0]
+    mock_determine_count.side_effect = [num_chapters, 0]
+    mock_determine_counts_per_unit = mocker.patch.object(epub_generator_instance, '_determine_counts_per_unit', return_value=[exact_notes_count] * num_chapters)
     specific_config = {
         "title": "Exact Notes Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": 1,
@@ -273,12 +277,12 @@ def test_generate_notes_config_exact_integer(mocker: MockerFixture, epub_generat
     output_path = "test_output/exact_notes.epub"
     mocker.patch.object(epub_generator_instance, '_create_section_content', mocker.MagicMock())
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[2] == mocker.call(exact_notes_count, f"notes_in_chapter_1")
+    mock_determine_counts_per_unit.assert_called_once_with(exact_notes_count, "notes_in_chapter", [{"chapter": 1, "section": 1, "paragraph": 1}] * num_chapters)
     mock_add_notes_to_chapter.assert_called_once()
 
 def test_generate_notes_config_range_object(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with notes_config (range object)."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -291,7 +295,8 @@ def test_generate_notes_config_range_object(mocker: MockerFixture, epub_generato
     notes_range_config = {"min": 1, "max": 4}
     expected_notes_from_range = 2
     mock_randint.return_value = expected_notes_from_range
-    mock_determine_count.side_effect = [num_chapters, 1, expected_notes_from_range, 0]
+    mock_determine_count.side_effect = [num_chapters, 0]
+    mock_determine_counts_per_unit = mocker.patch.object(epub_generator_instance, '_determine_counts_per_unit', return_value=[expected_notes_from_range] * num_chapters)
     specific_config = {
         "title": "Range Notes Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": 1,
@@ -301,12 +306,12 @@ def test_generate_notes_config_range_object(mocker: MockerFixture, epub_generato
     output_path = "test_output/range_notes.epub"
     mocker.patch.object(epub_generator_instance, '_create_section_content', mocker.MagicMock())
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[2] == mocker.call(notes_range_config, f"notes_in_chapter_1")
+    mock_determine_counts_per_unit.assert_called_once_with(notes_range_config, "notes_in_chapter", [{"chapter": 1, "section": 1, "paragraph": 1}] * num_chapters)
     mock_add_notes_to_chapter.assert_called_once()
 
 def test_generate_notes_config_probabilistic_object(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with notes_config (probabilistic object)."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -319,7 +324,8 @@ def test_generate_notes_config_probabilistic_object(mocker: MockerFixture, epub_
     notes_prob_config = {"chance": 0.6, "max_total": 3}
     mock_random_random.return_value = 0.5
     expected_notes_from_prob = 1
-    mock_determine_count.side_effect = [num_chapters, 1, expected_notes_from_prob, 0]
+    mock_determine_count.side_effect = [num_chapters, 0]
+    mock_determine_counts_per_unit = mocker.patch.object(epub_generator_instance, '_determine_counts_per_unit', return_value=[expected_notes_from_prob] * num_chapters)
     specific_config = {
         "title": "Probabilistic Notes Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": 1,
@@ -329,13 +335,13 @@ def test_generate_notes_config_probabilistic_object(mocker: MockerFixture, epub_
     output_path = "test_output/prob_notes.epub"
     mocker.patch.object(epub_generator_instance, '_create_section_content', mocker.MagicMock())
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[2] == mocker.call(notes_prob_config, f"notes_in_chapter_1")
+    mock_determine_counts_per_unit.assert_called_once_with(notes_prob_config, "notes_in_chapter", [{"chapter": 1, "section": 1, "paragraph": 1}] * num_chapters)
     mock_add_notes_to_chapter.assert_called_once()
 
 # Tests for images_config
 def test_generate_images_config_exact_integer(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with images_config (exact integer)."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -345,7 +351,7 @@ def test_generate_images_config_exact_integer(mocker: MockerFixture, epub_genera
     mock_epub_book_class.return_value = mock_book_instance
     num_chapters = 1
     exact_images_count = 2
-    mock_determine_count.side_effect = [num_chapters, 1, 0, exact_images_count]
+    mock_determine_count.side_effect = [num_chapters, exact_images_count]
     specific_config = {
         "title": "Exact Images Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": 1, "notes_system": {"notes_config": 0},
@@ -356,12 +362,12 @@ def test_generate_images_config_exact_integer(mocker: MockerFixture, epub_genera
     mocker.patch.object(epub_generator_instance, '_create_section_content', mocker.MagicMock())
     mocker.patch.object(epub_generator_instance, '_add_notes_to_chapter', mocker.MagicMock())
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[3] == mocker.call(exact_images_count, f"images_in_chapter_1")
+    assert mock_determine_count.call_args_list[1] == mocker.call(exact_images_count, f"images_in_chapter_1")
     mock_add_images_to_chapter.assert_called_once()
 
 def test_generate_images_config_range_object(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with images_config (range object)."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -374,7 +380,7 @@ def test_generate_images_config_range_object(mocker: MockerFixture, epub_generat
     images_range_config = {"min": 1, "max": 3}
     expected_images_from_range = 2
     mock_randint.return_value = expected_images_from_range
-    mock_determine_count.side_effect = [num_chapters, 1, 0, expected_images_from_range]
+    mock_determine_count.side_effect = [num_chapters, expected_images_from_range]
     specific_config = {
         "title": "Range Images Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": 1, "notes_system": {"notes_config": 0},
@@ -385,12 +391,12 @@ def test_generate_images_config_range_object(mocker: MockerFixture, epub_generat
     mocker.patch.object(epub_generator_instance, '_create_section_content', mocker.MagicMock())
     mocker.patch.object(epub_generator_instance, '_add_notes_to_chapter', mocker.MagicMock())
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[3] == mocker.call(images_range_config, f"images_in_chapter_1")
+    assert mock_determine_count.call_args_list[1] == mocker.call(images_range_config, f"images_in_chapter_1")
     mock_add_images_to_chapter.assert_called_once()
 
 def test_generate_images_config_probabilistic_object(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with images_config (probabilistic object)."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -403,7 +409,7 @@ def test_generate_images_config_probabilistic_object(mocker: MockerFixture, epub
     images_prob_config = {"chance": 0.9, "max_total": 2}
     mock_random_random.return_value = 0.8
     expected_images_from_prob = 1
-    mock_determine_count.side_effect = [num_chapters, 1, 0, expected_images_from_prob]
+    mock_determine_count.side_effect = [num_chapters, expected_images_from_prob]
     specific_config = {
         "title": "Probabilistic Images Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": 1, "notes_system": {"notes_config": 0},
@@ -414,12 +420,12 @@ def test_generate_images_config_probabilistic_object(mocker: MockerFixture, epub
     mocker.patch.object(epub_generator_instance, '_create_section_content', mocker.MagicMock())
     mocker.patch.object(epub_generator_instance, '_add_notes_to_chapter', mocker.MagicMock())
     epub_generator_instance.generate(specific_config, global_config, output_path)
-    assert mock_determine_count.call_args_list[3] == mocker.call(images_prob_config, f"images_in_chapter_1")
+    assert mock_determine_count.call_args_list[1] == mocker.call(images_prob_config, f"images_in_chapter_1")
     mock_add_images_to_chapter.assert_called_once()
 
 def test_generate_multimedia_include_images_false(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that images are not processed if multimedia.include_images is False."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -428,7 +434,7 @@ def test_generate_multimedia_include_images_false(mocker: MockerFixture, epub_ge
     mock_book_instance = mocker.MagicMock()
     mock_epub_book_class.return_value = mock_book_instance
     num_chapters = 1
-    mock_determine_count.side_effect = [num_chapters, 1, 0] # ch, sec, notes
+    mock_determine_count.side_effect = [num_chapters] # ch
     specific_config = {
         "title": "No Images Test", "chapters_config": num_chapters,
         "sections_per_chapter_config": 1, "notes_system": {"notes_config": 0},
@@ -441,16 +447,13 @@ def test_generate_multimedia_include_images_false(mocker: MockerFixture, epub_ge
     epub_generator_instance.generate(specific_config, global_config, output_path)
     
     mock_add_images_to_chapter.assert_not_called()
-    assert mock_determine_count.call_count == 3
-    assert mock_determine_count.call_args_list[0] == mocker.call(num_chapters, "chapters")
-    assert mock_determine_count.call_args_list[1] == mocker.call(1, f"sections_in_chapter_1")
-    assert mock_determine_count.call_args_list[2] == mocker.call(0, f"notes_in_chapter_1")
+    mock_determine_count.assert_called_once_with(num_chapters, "chapters")
     for call_args in mock_determine_count.call_args_list:
         assert call_args[0][1] != "images_in_chapter_1"
 
 def test_generate_uses_toc_settings(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that generate passes toc_settings to toc creation functions."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_create_nav_document = mocker.patch('synth_data_gen.generators.epub_components.toc.create_nav_document')
@@ -464,7 +467,7 @@ def test_generate_uses_toc_settings(mocker: MockerFixture, epub_generator_instan
     mock_chapter_item.title = 'Chapter 1'
     
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0])
 
     specific_config = {
         "title": "ToC Settings Test",
@@ -496,7 +499,7 @@ def test_generate_uses_toc_settings(mocker: MockerFixture, epub_generator_instan
 
 def test_generate_default_epub3_creates_nav_not_ncx(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that default EPUB3 generation creates NAV doc and not NCX."""
-    mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_create_ncx = mocker.patch('synth_data_gen.generators.epub_components.toc.create_ncx')
@@ -517,7 +520,7 @@ def test_generate_default_epub3_creates_nav_not_ncx(mocker: MockerFixture, epub_
     output_path = "test_output/epub3_default_toc.epub"
     
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0])
     
     epub_generator_instance.generate(specific_config, global_config, output_path)
     
@@ -526,7 +529,7 @@ def test_generate_default_epub3_creates_nav_not_ncx(mocker: MockerFixture, epub_
 
 def test_generate_default_epub2_creates_ncx_not_nav(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that default EPUB2 generation creates NCX and not NAV doc."""
-    mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_create_ncx = mocker.patch('synth_data_gen.generators.epub_components.toc.create_ncx')
@@ -547,7 +550,7 @@ def test_generate_default_epub2_creates_ncx_not_nav(mocker: MockerFixture, epub_
     output_path = "test_output/epub2_default_toc.epub"
     
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0])
     
     epub_generator_instance.generate(specific_config, global_config, output_path)
     
@@ -556,7 +559,7 @@ def test_generate_default_epub2_creates_ncx_not_nav(mocker: MockerFixture, epub_
 
 def test_generate_font_embedding_enabled(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that font embedding settings are applied when enabled."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     
     # Capture the EpubBook instance
@@ -590,7 +593,7 @@ def test_generate_font_embedding_enabled(mocker: MockerFixture, epub_generator_i
     
     mock_chapter_item = mocker.MagicMock(spec=epub.EpubHtml) # For _create_chapter_content
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1,0,0,0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0])
 
 
     epub_generator_instance.generate(specific_config, global_config, output_path)
@@ -620,7 +623,7 @@ def test_generate_font_embedding_enabled(mocker: MockerFixture, epub_generator_i
 
 def test_generate_unified_quantity_chapters_exact(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with chapters_config (exact integer) via unified quantity spec."""
-    mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -630,9 +633,9 @@ def test_generate_unified_quantity_chapters_exact(mocker: MockerFixture, epub_ge
     mock_epub_book_class.return_value = mock_book_instance
     
     exact_chapter_count = 3
-    # _determine_count will be called for chapters, sections, notes, images.
+    # _determine_count will be called for chapters and images (sections and notes are drawn in batches).
     # We are interested in the first call for chapters.
-    mock_determine_count.side_effect = [exact_chapter_count, 0, 0, 0] 
+    mock_determine_count.side_effect = [exact_chapter_count, 0]
 
     specific_config = {
         "title": "Unified Exact Chapters",
@@ -652,7 +655,7 @@ def test_generate_unified_quantity_chapters_exact(mocker: MockerFixture, epub_ge
 
 def test_generate_unified_quantity_chapters_range(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with chapters_config (range) via unified quantity spec."""
-    mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -668,9 +671,9 @@ def test_generate_unified_quantity_chapters_range(mocker: MockerFixture, epub_ge
     expected_chapters_from_range = 4 
     mock_base_randint.return_value = expected_chapters_from_range
     
-    # _determine_count will be called for chapters, sections, notes, images.
+    # _determine_count will be called for chapters and images (sections and notes are drawn in batches).
     # It will use the mocked randint for the chapters_config range.
-    mock_determine_count.side_effect = [expected_chapters_from_range, 0, 0, 0]
+    mock_determine_count.side_effect = [expected_chapters_from_range, 0]
 
     specific_config = {
         "title": "Unified Range Chapters",
@@ -690,7 +693,7 @@ def test_generate_unified_quantity_chapters_range(mocker: MockerFixture, epub_ge
 
 def test_generate_unified_quantity_chapters_probabilistic(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test generate with chapters_config (probabilistic) via unified quantity spec."""
-    mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
     mock_determine_count = mocker.patch.object(epub_generator_instance, '_determine_count')
@@ -707,7 +710,7 @@ def test_generate_unified_quantity_chapters_probabilistic(mocker: MockerFixture,
     mock_base_random_random.return_value = 0.6 
     expected_chapters_from_prob = 1 # For a single document, chance 0.7, random 0.6 -> 1 chapter
     
-    mock_determine_count.side_effect = [expected_chapters_from_prob, 0, 0, 0]
+    mock_determine_count.side_effect = [expected_chapters_from_prob, 0]
 
     specific_config = {
         "title": "Unified Probabilistic Chapters",
@@ -732,7 +735,7 @@ def test_generate_epub_with_basic_config_integrates_toc(mocker: MockerFixture, e
     Test that EpubGenerator.generate with a basic EPUB3 config correctly calls
     toc.create_nav_document and not toc.create_ncx.
     """
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     
     # Capture the EpubBook instance
@@ -765,7 +768,7 @@ def test_generate_epub_with_basic_config_integrates_toc(mocker: MockerFixture, e
     
     # Mock _determine_count to control number of chapters, sections, notes, images
     # For this test: 2 chapters, 0 sections, 0 notes, 0 images
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[2, 0, 0, 0, 0, 0, 0]) 
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[2, 0, 0]) 
                                                                     # ch, s_c1, n_c1, i_c1, s_c2, n_c2, i_c2
 
     specific_config_epub3 = {
@@ -813,7 +816,7 @@ def test_generate_epub2_with_basic_config_integrates_ncx(mocker: MockerFixture,
     Test that EpubGenerator.generate with a basic EPUB2 config correctly calls
     toc.create_ncx and not toc.create_nav_document.
     """
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     
     captured_book_instances = []
@@ -830,7 +833,7 @@ def test_generate_epub2_with_basic_config_integrates_ncx(mocker: MockerFixture,
     mock_chapter_1_item.file_name = "c1.xhtml"
     mock_chapter_1_item.title = "Chapter 1 Title"
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_1_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 0]) # 1 chapter
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0]) # 1 chapter
 
     specific_config_epub2 = {
         "title": "EPUB2 Basic NCX",
@@ -865,7 +868,7 @@ def test_generate_epub_with_citations_integrates_citations_component(mocker: Moc
     Test that EpubGenerator.generate correctly calls _apply_citations_to_item_content
     when citations are enabled in the config.
     """
-    mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mocker.patch('synth_data_gen.generators.epub.epub.EpubBook', return_value=mocker.MagicMock())
 
@@ -878,7 +881,7 @@ def test_generate_epub_with_citations_integrates_citations_component(mocker: Moc
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
     
     # Mock _determine_count: 1 chapter, 0 sections, 0 notes, 0 images
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 0]) 
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0]) 
     
     # Mock other content modification methods to isolate citations
     mocker.patch.object(epub_generator_instance, '_add_notes_to_chapter')
@@ -926,7 +929,7 @@ def test_generate_epub_with_notes_integrates_notes_method(mocker: MockerFixture,
     Test that EpubGenerator.generate correctly calls _add_notes_to_chapter
     when notes are enabled in the config.
     """
-    mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_book_instance = mocker.MagicMock()
     mocker.patch('synth_data_gen.generators.epub.epub.EpubBook', return_value=mock_book_instance)
@@ -938,7 +941,7 @@ def test_generate_epub_with_notes_integrates_notes_method(mocker: MockerFixture,
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
     
     # Mock _determine_count: 1 chapter, 0 sections, 1 note, 0 images
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 1, 0]) 
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0]) 
     
     mocker.patch.object(epub_generator_instance, '_apply_citations_to_item_content', side_effect=lambda c, *args: c) # Passthrough
     mocker.patch.object(epub_generator_instance, '_add_images_to_chapter')
@@ -989,7 +992,7 @@ def test_generate_epub_with_images_integrates_multimedia_method(mocker: MockerFi
     Test that EpubGenerator.generate correctly calls _add_images_to_chapter
     when images are enabled in the config.
     """
-    mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_book_instance = mocker.MagicMock()
     mocker.patch('synth_data_gen.generators.epub.epub.EpubBook', return_value=mock_book_instance)
@@ -1004,7 +1007,7 @@ def test_generate_epub_with_images_integrates_multimedia_method(mocker: MockerFi
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
     
     # Mock _determine_count: 1 chapter, 0 sections, 0 notes, 1 image
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 1]) 
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 1]) 
     
     mocker.patch.object(epub_generator_instance, '_apply_citations_to_item_content', side_effect=lambda c, *args: c)
     mocker.patch.object(epub_generator_instance, '_add_notes_to_chapter')
@@ -1054,7 +1057,7 @@ def test_generate_epub_with_images_integrates_multimedia_method(mocker: MockerFi
 
 def test_generate_epub3_navdoc_is_correctly_structured(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that for EPUB3, a structurally correct NAV document is generated and book.toc is set."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub') # Mock write_epub
 
     # We need to inspect the real EpubBook instance *after* the SUT has configured it
@@ -1094,7 +1097,7 @@ def test_generate_epub3_navdoc_is_correctly_structured(mocker: MockerFixture, ep
                         side_effect=[chapter1_item, chapter2_item]) # Two chapters
 
     # Mock _determine_count: 2 chapters, 0 sections per chapter, 0 notes, 0 images
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[2, 0,0,0, 0,0,0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[2, 0, 0])
 
     # Mock other content modification methods as they are not the focus here
     mocker.patch.object(epub_generator_instance, '_apply_citations_to_item_content', side_effect=lambda c, *args: c)
@@ -1159,7 +1162,7 @@ def test_generate_epub3_navdoc_is_correctly_structured(mocker: MockerFixture, ep
 
 def test_generate_epub2_ncx_is_correctly_structured(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that for EPUB2, a structurally correct NCX is generated and book.toc is set."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
 
     RealEpubBook = epub.EpubBook
@@ -1173,7 +1176,7 @@ def test_generate_epub2_ncx_is_correctly_structured(mocker: MockerFixture, epub_
     chapter1_item = epub.EpubHtml(title='EPUB2 Chapter 1', file_name='c1_epub2.xhtml', lang='en')
     chapter1_item.content = '<h1>EPUB2 Chapter 1</h1>'
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=chapter1_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0,0,0]) # 1 chapter
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0]) # 1 chapter
 
     mocker.patch.object(epub_generator_instance, '_apply_citations_to_item_content', side_effect=lambda c, *args: c)
     mocker.patch.object(epub_generator_instance, '_add_notes_to_chapter')
@@ -1228,7 +1231,7 @@ def test_generate_epub2_ncx_is_correctly_structured(mocker: MockerFixture, epub_
 
 def test_generate_epub3_navdoc_respects_max_depth(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that the EPUB3 NAV document respects the toc_settings.max_depth."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
 
     RealEpubBook = epub.EpubBook
@@ -1265,7 +1268,7 @@ def test_generate_epub3_navdoc_respects_max_depth(mocker: MockerFixture, epub_ge
     
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', 
                         side_effect=[chapter1_item, chapter2_item])
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[2,0,0,0,0,0,0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[2, 0, 0])
 
 
     mock_create_nav_document = mocker.patch('synth_data_gen.generators.epub_components.toc.create_nav_document')
@@ -1300,7 +1303,7 @@ def test_generate_epub3_navdoc_respects_max_depth(mocker: MockerFixture, epub_ge
 
 def test_generate_epub_with_custom_metadata(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that custom metadata is added to the book."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
 
     RealEpubBook = epub.EpubBook
@@ -1316,7 +1319,7 @@ def test_generate_epub_with_custom_metadata(mocker: MockerFixture, epub_generato
     mock_chapter_item.file_name = "c1.xhtml" # Needed for ToC fallback if book.toc is empty
     mock_chapter_item.title = "Chapter 1"    # Needed for ToC fallback
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1,0,0,0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0])
 
 
     specific_config_meta = {
@@ -1370,7 +1373,7 @@ def test_generate_epub_with_custom_metadata(mocker: MockerFixture, epub_generato
 
 def test_generate_epub_with_font_embedding(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that font embedding logic is triggered and font item is added."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
 
     RealEpubBook = epub.EpubBook
@@ -1390,7 +1393,7 @@ def test_generate_epub_with_font_embedding(mocker: MockerFixture, epub_generator
     mock_chapter_item = mocker.MagicMock(spec=epub.EpubHtml)
     mock_chapter_item.file_name = "c1.xhtml"; mock_chapter_item.title = "C1"
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1,0,0,0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0])
 
 
     specific_config_font = {
@@ -1440,7 +1443,7 @@ def test_generate_epub_with_font_embedding(mocker: MockerFixture, epub_generator
 
 def test_generate_runs_epubcheck_when_enabled(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that epubcheck is run when validation.run_epubcheck is True."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_book_instance = mocker.MagicMock()
     mocker.patch('synth_data_gen.generators.epub.epub.EpubBook', return_value=mock_book_instance)
@@ -1451,7 +1454,7 @@ def test_generate_runs_epubcheck_when_enabled(mocker: MockerFixture, epub_genera
     # Mock chapter creation and determine_count for minimal book generation
     mock_chapter_item = mocker.MagicMock(spec=epub.EpubHtml)
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', return_value=mock_chapter_item)
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1,0,0,0])
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0])
 
 
     specific_config_epubcheck = {
@@ -1475,7 +1478,7 @@ def test_generate_runs_epubcheck_when_enabled(mocker: MockerFixture, epub_genera
 
 def test_generate_epub_with_intext_citations_content(mocker: MockerFixture, epub_generator_instance: EpubGenerator):
     """Test that in-text citations are correctly inserted into chapter content."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub') # Mock write_epub
     
     # We need to inspect the chapter content *after* _apply_citations_to_item_content has run.
@@ -1632,7 +1635,7 @@ def test_generate_epub_with_intext_citations_content(mocker: MockerFixture, epub
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', side_effect=mock_create_chapter_content_side_effect)
     
     # Mock _determine_count: 1 chapter, 0 sections, 0 notes, 0 images
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 0]) 
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0]) 
 
     specific_config_citations = {
         "title": "Citations Content Test", "epub_version": 3, "chapters_config": 1,
@@ -1674,7 +1677,7 @@ def test_generate_epub_with_notes_content_is_correct(mocker: MockerFixture, epub
     Test that notes (footnotes_same_page) are correctly processed and added to chapter content
     and that the note items are added to the book.
     """
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     
     mock_book_instance = mocker.MagicMock()
@@ -1752,7 +1755,7 @@ def test_generate_epub_with_notes_content_is_correct(mocker: MockerFixture, epub
     
     # Mock _determine_count: 1 chapter, 0 sections, 2 notes, 0 images
     # The '2' for notes is crucial for _add_notes_to_chapter to process both markers.
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 2, 0]) 
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0]) 
     
     # Mock other transformations
     mocker.patch.object(epub_generator_instance, '_apply_citations_to_item_content', side_effect=lambda c, *args: c) # Passthrough
@@ -1807,7 +1810,7 @@ def test_generate_epub_with_images_content_is_correct(mocker: MockerFixture, epu
     Test that image markers are correctly replaced with <img> tags in chapter content
     and that image items are added to the book.
     """
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     
     mock_book_instance = mocker.MagicMock()
@@ -1847,7 +1850,7 @@ def test_generate_epub_with_images_content_is_correct(mocker: MockerFixture, epu
     mocker.patch.object(epub_generator_instance, '_create_chapter_content', side_effect=mock_create_chapter_content_side_effect)
     
     # Mock _determine_count: 1 chapter, 0 sections, 0 notes, 2 images
-    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 0, 0, 2]) 
+    mocker.patch.object(epub_generator_instance, '_determine_count', side_effect=[1, 2]) 
     
     # Mock other transformations
     mocker.patch.object(epub_generator_instance, '_apply_citations_to_item_content', side_effect=lambda c, *args: c)
@@ -1905,7 +1908,7 @@ def test_generate_epub_with_complex_config_and_interactions(mocker: MockerFixtur
     chapters, sections, notes, images, citations, custom ToC, font embedding, and epubcheck.
     Verifies content transformation, structural elements, and epubcheck validation.
     """
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub') # Mock to prevent lxml error
 
     # Create a MagicMock that will be returned by the patched epub.EpubBook constructor
@@ -2247,7 +2250,7 @@ def test_generate_epub3_navdoc_respects_max_depth_setting(mocker: MockerFixture,
     """
     Test that the EPUB3 NAV document respects toc_settings.max_depth.
     """
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
 
@@ -2383,7 +2386,7 @@ def test_generate_epub3_with_ncx_only_config(mocker: MockerFixture, epub_generat
     Test that for EPUB3, if config specifies NCX only (include_nav_doc=False, include_ncx=True),
     only NCX is created.
     """
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
     mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
     mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
 
@@ -2468,7 +2471,7 @@ def test_generate_epub3_with_ncx_only_config(mocker: MockerFixture, epub_generat
         Test that for EPUB2, if config specifies include_nav_doc=True, it is ignored,
         and an NCX is created (as it's mandatory for EPUB2) and no NAV doc is created.
         """
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
         mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
         mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
 
@@ -2531,7 +2534,7 @@ def test_generate_epub_with_no_toc_flags_and_max_depth(mocker: MockerFixture, ep
         Test that if include_ncx and include_nav_doc are False, no ToC is generated,
         regardless of toc_settings.max_depth.
         """
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
         mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
         mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
 
@@ -2594,7 +2597,7 @@ def test_generate_epub3_navdoc_only_config(mocker: MockerFixture, epub_generator
         Test that for EPUB3, if config specifies NavDoc only (include_nav_doc=True, include_ncx=False),
         only a NAV document is created and no NCX.
         """
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
         mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
         mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
 
@@ -2668,7 +2671,7 @@ def test_generate_epub_with_both_ncx_and_nav_doc_true(mocker: MockerFixture, epu
         Test that if both include_ncx and include_nav_doc are True, both ToC types are generated.
         This is primarily for EPUB3, but the flags should be respected.
         """
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
         mock_write_epub = mocker.patch('synth_data_gen.generators.epub.epub.write_epub')
         mock_epub_book_class = mocker.patch('synth_data_gen.generators.epub.epub.EpubBook')
 
@@ -2735,4 +2738,47 @@ def test_generate_epub_with_both_ncx_and_nav_doc_true(mocker: MockerFixture, epu
             isinstance(item, epub.EpubNav) 
             for item in added_items_capture
         )
-        assert found_nav, "NAV document not found when both ToCs requested"
\ No newline at end of file
+        assert found_nav, "NAV document not found when both ToCs requested"
+def test_render_returns_epub_bytes_matching_generate(mocker: MockerFixture, tmp_path):
+    """Test that render() writes the EPUB into memory and matches the seeded file output byte for byte."""
+    import io
+    import zipfile
+    from synth_data_gen.core.seeding import seeded
+    generator = EpubGenerator()
+    specific_config = generator.get_default_specific_config()
+    output_path = str(tmp_path / "book.epub")
+    with seeded(11):
+        generator.generate(specific_config, {}, output_path)
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.epub.ensure_directory')
+    with seeded(11):
+        rendered = generator.render(specific_config, {})
+
+    assert rendered == open(output_path, "rb").read()
+    with zipfile.ZipFile(io.BytesIO(rendered)) as archive:
+        assert archive.namelist()[0] == "mimetype"
+        assert archive.read("mimetype") == b"application/epub+zip"
+    mock_ensure_dirs.assert_not_called()
+
+
+def test_determine_count_shares_base_probabilistic_semantics(epub_generator_instance: EpubGenerator):
+    """The EPUB generator honours if_true ranges and max_total like every other generator."""
+    config = {"chance": 1.0, "if_true": {"min": 3, "max": 3}, "max_total": 5}
+    assert epub_generator_instance._determine_count(config, "chapters") == 3
+    assert epub_generator_instance._determine_count(dict(config, max_total=2), "chapters") == 2
+
+
+def test_notes_max_total_applies_to_whole_book(mocker: MockerFixture, epub_generator_instance: EpubGenerator, tmp_path):
+    """notes_config max_total caps the notes of the whole book, not of each chapter."""
+    add_notes = mocker.patch.object(epub_generator_instance, '_add_notes_to_chapter')
+    specific_config = {
+        "title": "Budget", "chapters_config": 8, "sections_per_chapter_config": 1,
+        "notes_system": {"notes_config": {"chance": 1.0, "if_true": 4, "max_total": 10}},
+        "multimedia": {"include_images": False, "images_config": 0},
+    }
+    epub_generator_instance.render(specific_config, {})
+    notes_per_chapter = [c.args[3] for c in add_notes.call_args_list]
+    assert notes_per_chapter == [4, 4, 2]
+    # The next document gets a fresh budget.
+    add_notes.reset_mock()
+    epub_generator_instance.render(specific_config, {})
+    assert sum(c.args[3] for c in add_notes.call_args_list) == 10
@@ -51,7 +51,7 @@ def test_get_default_specific_config(markdown_generator_test_setup):
 def test_generate_exact_headings_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test that generate respects headings_config.count for exact heading generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     
     exact_heading_count = 2
@@ -90,7 +90,7 @@ def test_generate_exact_headings_count(mocker: MockerFixture, markdown_generator
 def test_generate_exact_list_items_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test that generate respects md_list_items_config.count for exact list item generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     
     exact_list_item_count = 3
@@ -125,7 +125,7 @@ def test_generate_exact_list_items_count(mocker: MockerFixture, markdown_generat
 def test_generate_exact_images_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test that generate respects md_images_config.count for exact image generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     
     exact_image_count = 2
@@ -160,7 +160,7 @@ def test_generate_exact_images_count(mocker: MockerFixture, markdown_generator_t
 def test_generate_exact_gfm_tables_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test that generate respects gfm_features.md_tables_occurrence_config.count."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     
     exact_table_count = 1
@@ -202,7 +202,7 @@ def test_generate_exact_gfm_tables_count(mocker: MockerFixture, markdown_generat
 def test_generate_range_headings_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test that generate respects headings_config for range-based heading generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
     
@@ -239,7 +239,7 @@ def test_generate_range_headings_count(mocker: MockerFixture, markdown_generator
 def test_generate_probabilistic_headings_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test that generate respects headings_config for probabilistic heading generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_random_random = mocker.patch('synth_data_gen.core.base.random.random')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -322,7 +322,7 @@ def test_generate_probabilistic_headings_count(mocker: MockerFixture, markdown_g
 def test_generate_range_list_items_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test that generate respects md_list_items_config for range-based list item generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
     
@@ -366,7 +366,7 @@ def test_generate_range_list_items_count(mocker: MockerFixture, markdown_generat
 def test_generate_probabilistic_list_items_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test probabilistic md_list_items_config for list item generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories') # Added this line
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory') # Added this line
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_random_random = mocker.patch('synth_data_gen.core.base.random.random')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -454,7 +454,7 @@ def test_generate_probabilistic_list_items_count(mocker: MockerFixture, markdown
 def test_generate_range_images_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test that generate respects md_images_config for range-based image generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
     
@@ -493,7 +493,7 @@ def test_generate_range_images_count(mocker: MockerFixture, markdown_generator_t
 def test_generate_probabilistic_images_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test probabilistic md_images_config for image generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories') # Added
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory') # Added
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_random_random = mocker.patch('synth_data_gen.core.base.random.random')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -578,7 +578,7 @@ def test_generate_probabilistic_images_count(mocker: MockerFixture, markdown_gen
 def test_generate_exact_footnotes_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test exact count for md_footnotes_occurrence_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     
     exact_footnotes_count = 2
@@ -615,7 +615,7 @@ def test_generate_exact_footnotes_count(mocker: MockerFixture, markdown_generato
 def test_generate_range_footnotes_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test range count for md_footnotes_occurrence_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
     
@@ -656,7 +656,7 @@ def test_generate_range_footnotes_count(mocker: MockerFixture, markdown_generato
 def test_generate_probabilistic_footnotes_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test probabilistic md_footnotes_occurrence_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories') # Added
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory') # Added
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_random_random = mocker.patch('synth_data_gen.core.base.random.random')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -728,7 +728,7 @@ def test_generate_probabilistic_footnotes_count(mocker: MockerFixture, markdown_
 def test_generate_exact_task_lists_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test exact count for md_task_lists_occurrence_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     
     exact_count = 1
@@ -748,7 +748,7 @@ def test_generate_exact_task_lists_count(mocker: MockerFixture, markdown_generat
 def test_generate_range_task_lists_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test range count for md_task_lists_occurrence_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
     
@@ -773,7 +773,7 @@ def test_generate_range_task_lists_count(mocker: MockerFixture, markdown_generat
 def test_generate_probabilistic_task_lists_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test probabilistic md_task_lists_occurrence_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories') # Added
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory') # Added
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_random_random = mocker.patch('synth_data_gen.core.base.random.random')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -838,7 +838,7 @@ def test_generate_probabilistic_task_lists_count(mocker: MockerFixture, markdown
 def test_generate_exact_code_blocks_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test exact count for md_code_blocks_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     
     exact_count = 1
@@ -858,7 +858,7 @@ def test_generate_exact_code_blocks_count(mocker: MockerFixture, markdown_genera
 def test_generate_range_code_blocks_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test range count for md_code_blocks_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
     
@@ -883,7 +883,7 @@ def test_generate_range_code_blocks_count(mocker: MockerFixture, markdown_genera
 def test_generate_probabilistic_code_blocks_count(mocker: MockerFixture, markdown_generator_test_setup):
     """Test probabilistic md_code_blocks_config."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories') # Added
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory') # Added
     mock_determine_count = mocker.patch.object(generator, '_determine_count')
     mock_random_random = mocker.patch('synth_data_gen.core.base.random.random')
     mock_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -948,7 +948,7 @@ def test_generate_probabilistic_code_blocks_count(mocker: MockerFixture, markdow
 def test_generate_frontmatter_yaml_basic(mocker: MockerFixture, markdown_generator_test_setup):
     """Test basic YAML frontmatter generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_generate_frontmatter = mocker.patch.object(generator, '_generate_frontmatter')
     mocker.patch.object(generator, '_create_md_basic_elements_content', return_value="")
     
@@ -978,7 +978,7 @@ def test_generate_frontmatter_yaml_basic(mocker: MockerFixture, markdown_generat
 def test_generate_frontmatter_yaml_not_included_when_chance_is_zero(mocker: MockerFixture, markdown_generator_test_setup):
     """Test frontmatter is not generated when include_chance is 0.0."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     mock_generate_frontmatter = mocker.patch.object(generator, '_generate_frontmatter')
     
     frontmatter_config = {
@@ -1009,7 +1009,7 @@ def test_generate_frontmatter_yaml_not_included_when_chance_is_zero(mocker: Mock
 def test_generate_frontmatter_toml_basic(mocker: MockerFixture, markdown_generator_test_setup):
     """Test basic TOML frontmatter generation - expecting failure."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     
     specific_config = {
         "frontmatter": {
@@ -1037,7 +1037,7 @@ def test_generate_frontmatter_toml_basic(mocker: MockerFixture, markdown_generat
 def test_generate_frontmatter_json_basic(mocker: MockerFixture, markdown_generator_test_setup):
     """Test basic JSON frontmatter generation."""
     generator, output_dir = markdown_generator_test_setup
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
     
     specific_config = {
         "headings_config": {"count": 0}, "md_list_items_config": {"count": 0},
@@ -1064,4 +1064,15 @@ def test_generate_frontmatter_json_basic(mocker: MockerFixture, markdown_generat
         json_data = json.loads(full_file_content.strip())
         assert json_data.get("title") == "Test JSON"
     except json.JSONDecodeError:
-        pytest.fail("Frontmatter was not valid JSON.")
\ No newline at end of file
+        pytest.fail("Frontmatter was not valid JSON.")
+def test_render_returns_encoded_document_without_writing(mocker: MockerFixture, tmp_path):
+    """Test that render() returns the same document generate() writes, as UTF-8 bytes, and touches no files."""
+    generator = MarkdownGenerator()
+    specific_config = {"md_variant": "no_frontmatter_variant", "title": "Ünïcode"}
+    output_path = generator.generate(specific_config, {}, str(tmp_path / "doc.md"))
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.markdown.ensure_directory')
+
+    rendered = generator.render(specific_config, {})
+    assert isinstance(rendered, bytes)
+    assert rendered == open(output_path, "rb").read()
+    mock_ensure_dirs.assert_not_called()
@@ -85,7 +85,7 @@ def test_validate_config_invalid_base_global_config(pdf_generator_instance: PdfG
 
 def test_generate_minimal_pdf_single_column(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test the basic flow of the generate method for a minimal single-column PDF."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_single_column = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_single_column')
     
     specific_config = {
@@ -103,7 +103,7 @@ def test_generate_minimal_pdf_single_column(mocker: MockerFixture, pdf_generator
 
 def test_generate_minimal_pdf_multi_column(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test routing to a different PDF variant."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_multi_column = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_multi_column')
     
     specific_config = {"title": "Multi Column Test", "pdf_variant": "multi_column_text"}
@@ -116,7 +116,7 @@ def test_generate_minimal_pdf_multi_column(mocker: MockerFixture, pdf_generator_
 
 def test_generate_unknown_variant_falls_back_to_single_column(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test that an unknown pdf_variant falls back to single_column_text."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_single_column = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_single_column')
     
     specific_config = {"title": "Unknown Variant Test", "pdf_variant": "this_variant_does_not_exist"}
@@ -131,7 +131,7 @@ def test_generate_unknown_variant_falls_back_to_single_column(mocker: MockerFixt
 
 def test_generate_single_column_unified_chapters_exact(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'chapters_config' (exact int) for 'single_column_text' variant."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mock_determine_count = mocker.patch.object(pdf_generator_instance, '_determine_count')
     mock_add_pdf_chapter_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
@@ -164,7 +164,7 @@ def test_generate_single_column_unified_chapters_exact(mocker: MockerFixture, pd
 def test_generate_single_column_unified_chapters_range(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'chapters_config' (range object) for 'single_column_text' variant,
     ensuring BaseGenerator._determine_count uses the patched random.randint."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mock_add_pdf_chapter_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
     mock_base_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -222,7 +222,7 @@ def test_generate_single_column_unified_chapters_range(mocker: MockerFixture, pd
 
 def test_generate_single_column_unified_chapters_probabilistic(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'chapters_config' (probabilistic) for 'single_column_text'."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mock_add_pdf_chapter_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
     mock_base_random = mocker.patch('synth_data_gen.core.base.random.random')
@@ -270,7 +270,7 @@ def test_generate_single_column_unified_chapters_probabilistic(mocker: MockerFix
 
 def test_generate_single_column_page_count_exact(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'page_count_config' (exact int) for 'single_column_text' variant."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mock_determine_count = mocker.patch.object(pdf_generator_instance, '_determine_count')
     mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content') 
@@ -302,7 +302,7 @@ def test_generate_single_column_page_count_exact(mocker: MockerFixture, pdf_gene
 
 def test_generate_single_column_page_count_range(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'page_count_config' (range) for 'single_column_text' variant."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
     mock_base_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -342,7 +342,7 @@ def test_generate_single_column_page_count_range(mocker: MockerFixture, pdf_gene
 
 def test_generate_single_column_page_count_probabilistic(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'page_count_config' (probabilistic) for 'single_column_text'."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
     mock_base_random = mocker.patch('synth_data_gen.core.base.random.random')
@@ -397,7 +397,7 @@ def test_generate_single_column_page_count_probabilistic(mocker: MockerFixture,
 def test_generate_routes_to_multi_column_based_on_layout_config(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test that generate routes to multi-column if layout.columns is 2,
        even if pdf_variant is 'single_column_text'."""
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_single = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_single_column')
     mock_create_multi = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_multi_column')
     
@@ -419,7 +419,7 @@ def test_generate_routes_to_multi_column_based_on_layout_config(mocker: MockerFi
     mock_create_single.assert_not_called()
 def test_generate_single_column_applies_custom_margins(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test that custom margins are applied in the single-column variant."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content') # Mock to simplify
     mocker.patch.object(pdf_generator_instance, '_determine_count', side_effect=[1, 1, 0, 0, 0]) # page, chapter, tables, figures
@@ -464,7 +464,7 @@ def test_generate_single_column_applies_custom_margins(mocker: MockerFixture, pd
 
 def test_generate_running_header_enable_disable(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test that 'running_header.enable' correctly controls header generation."""
-    mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_pdf = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_single_column') # Assuming this is the variant used
     
     base_specific_config = {
@@ -489,7 +489,7 @@ def test_generate_running_header_enable_disable(mocker: MockerFixture, pdf_gener
     assert not args_disabled[1]["running_header"]["enable"]
 def test_generate_running_header_content_and_font(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test running_header content and font_size_pt."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     # Mock the method that would actually draw, to inspect its arguments
     mock_create_pdf_method = mocker.patch.object(pdf_generator_instance, '_create_pdf_running_headers_footers')
     
@@ -525,7 +525,7 @@ def test_generate_running_header_content_and_font(mocker: MockerFixture, pdf_gen
 
 def test_generate_visual_toc_enable_disable(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test that 'visual_toc.enable' correctly controls ToC generation."""
-    mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_visual_toc = mocker.patch.object(pdf_generator_instance, '_create_pdf_visual_toc_hyperlinked')
     mock_create_single_column = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_single_column')
     
@@ -552,7 +552,7 @@ def test_generate_visual_toc_enable_disable(mocker: MockerFixture, pdf_generator
     mock_create_single_column.assert_called_once_with(output_path, specific_config_disabled, global_config)
 def test_generate_visual_toc_style_and_depth(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test visual_toc style, max_depth, and page_number_style."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_toc_method = mocker.patch.object(pdf_generator_instance, '_create_pdf_visual_toc_hyperlinked')
     
     toc_config = {
@@ -581,7 +581,7 @@ def test_generate_visual_toc_style_and_depth(mocker: MockerFixture, pdf_generato
     assert called_specific_config["visual_toc"]["page_number_style"] == "roman_numerals"
 def test_generate_ocr_simulation_passes_settings(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test that ocr_simulation_settings are passed to the correct method."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_ocr_pdf_method = mocker.patch.object(pdf_generator_instance, '_create_pdf_simulated_ocr_high_quality')
 
     ocr_settings = {
@@ -611,7 +611,7 @@ def test_generate_ocr_simulation_passes_settings(mocker: MockerFixture, pdf_gene
 
 def test_generate_routes_to_simple_table_variant(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test that generate routes to _create_pdf_simple_table for the 'simple_table' variant."""
-    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_create_simple_table = mocker.patch.object(pdf_generator_instance, '_create_pdf_simple_table')
     
     specific_config = {
@@ -630,7 +630,7 @@ def test_generate_routes_to_simple_table_variant(mocker: MockerFixture, pdf_gene
 
 def test_single_column_with_exact_table_occurrence(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'pdf_tables_occurrence_config' (exact int) within 'single_column_text'."""
-    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mock_add_pdf_table_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_table_content')
     mock_determine_count = mocker.patch.object(pdf_generator_instance, '_determine_count')
@@ -674,7 +674,7 @@ def test_single_column_with_exact_table_occurrence(mocker: MockerFixture, pdf_ge
 
 def test_single_column_with_range_table_occurrence(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'pdf_tables_occurrence_config' (range) within 'single_column_text'."""
-    mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mock_add_pdf_table_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_table_content')
     mock_base_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -723,7 +723,7 @@ def test_single_column_with_range_table_occurrence(mocker: MockerFixture, pdf_ge
     mock_doc_instance.build.assert_called_once()
 def test_single_column_with_probabilistic_table_occurrence(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
     """Test 'pdf_tables_occurrence_config' (probabilistic) within 'single_column_text'."""
-    mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
     mock_add_pdf_table_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_table_content')
     mock_determine_count_on_pdf = mocker.patch.object(pdf_generator_instance, '_determine_count')
@@ -777,7 +777,7 @@ def test_single_column_with_probabilistic_table_occurrence(mocker: MockerFixture
 
 def test_generate_single_column_page_rotation_is_applied(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
         """Test that page_setup.rotation correctly adjusts pagesize for SimpleDocTemplate."""
-        mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         
         # Mock methods that add content to avoid unrelated errors
@@ -825,7 +825,7 @@ def test_generate_single_column_page_rotation_is_applied(mocker: MockerFixture,
             f"Expected pagesize {expected_pagesize}, got {kwargs['pagesize']}"
 def test_ligature_simulation_setting_is_respected(mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
         """Test that ligature_simulation settings are passed to a processing step."""
-        mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         
         # Mock the actual Paragraph class to inspect text passed to it
@@ -923,7 +923,7 @@ def test_ocr_simulation_applies_accuracy(self, mocker: MockerFixture): # Added s
     pdf_generator_instance = self.generator # Use self.generator
     mock_canvas_instance = MagicMock() 
     mocker.patch('synth_data_gen.generators.pdf.canvas.Canvas', return_value=mock_canvas_instance)
-    mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+    mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
     
     from reportlab.platypus import Paragraph as ReportLabParagraph
     mock_paragraph_class = mocker.spy(ReportLabParagraph, '__init__')
@@ -1006,7 +1006,7 @@ class TestPdfGenerator:
     def test_single_column_with_probabilistic_table_occurrence(self, mock_base_random, mocker: MockerFixture):
         pdf_generator_instance = self.generator
 
-        mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         mock_add_pdf_table_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_table_content')
         mock_determine_count_on_pdf = mocker.patch.object(pdf_generator_instance, '_determine_count')
@@ -1109,7 +1109,7 @@ class TestPdfGenerator:
     def test_single_column_with_probabilistic_figure_occurrence(self, mock_base_random, mocker: MockerFixture):
         pdf_generator_instance = self.generator
 
-        mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         mock_add_pdf_figure_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_figure_content')
         mock_determine_count_on_pdf = mocker.patch.object(pdf_generator_instance, '_determine_count')
@@ -1283,7 +1283,7 @@ class TestPdfGenerator:
     def test_ligature_simulation_setting_is_respected(self, mock_paragraph_class, mocker: MockerFixture): 
         pdf_generator_instance = self.generator
 
-        mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         
         mocker.patch.object(pdf_generator_instance, '_add_pdf_table_content')
@@ -1362,7 +1362,7 @@ class TestPdfGenerator:
         pdf_generator_instance = self.generator 
         mock_canvas_instance = MagicMock() 
         mocker.patch('synth_data_gen.generators.pdf.canvas.Canvas', return_value=mock_canvas_instance)
-        mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         
         from reportlab.platypus import Paragraph as ReportLabParagraph # Ensure this is imported locally if not globally
         mock_paragraph_class = mocker.spy(ReportLabParagraph, '__init__')
@@ -1512,7 +1512,7 @@ class TestPdfGenerator:
 
     def test_generate_minimal_pdf_single_column(self, mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
         """Test the basic flow of the generate method for a minimal single-column PDF."""
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_create_single_column = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_single_column')
         
         specific_config = {
@@ -1530,7 +1530,7 @@ class TestPdfGenerator:
 
     def test_generate_minimal_pdf_multi_column(self, mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
         """Test routing to a different PDF variant."""
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_create_multi_column = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_multi_column')
         
         specific_config = {"title": "Multi Column Test", "pdf_variant": "multi_column_text"}
@@ -1543,7 +1543,7 @@ class TestPdfGenerator:
 
     def test_generate_unknown_variant_falls_back_to_single_column(self, mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
         """Test that an unknown pdf_variant falls back to single_column_text."""
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_create_single_column = mocker.patch.object(pdf_generator_instance, '_create_pdf_text_single_column')
         
         specific_config = {"title": "Unknown Variant Test", "pdf_variant": "this_variant_does_not_exist"}
@@ -1558,7 +1558,7 @@ class TestPdfGenerator:
 
     def test_generate_single_column_unified_chapters_exact(self, mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
         """Test 'chapters_config' (exact int) for 'single_column_text' variant."""
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         mock_determine_count = mocker.patch.object(pdf_generator_instance, '_determine_count')
         mock_add_pdf_chapter_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
@@ -1591,7 +1591,7 @@ class TestPdfGenerator:
     def test_generate_single_column_unified_chapters_range(self, mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
         """Test 'chapters_config' (range object) for 'single_column_text' variant,
         ensuring BaseGenerator._determine_count uses the patched random.randint."""
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         mock_add_pdf_chapter_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
         mock_base_randint = mocker.patch('synth_data_gen.core.base.random.randint')
@@ -1649,7 +1649,7 @@ class TestPdfGenerator:
 
     def test_generate_single_column_unified_chapters_probabilistic(self, mocker: MockerFixture, pdf_generator_instance: PdfGenerator):
         """Test 'chapters_config' (probabilistic) for 'single_column_text'."""
-        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mock_ensure_output_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         mock_add_pdf_chapter_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
         mock_base_random = mocker.patch('synth_data_gen.core.base.random.random')
@@ -1706,7 +1706,7 @@ class TestPdfGenerator:
     @patch('synth_data_gen.core.base.random.randint')
     def test_generate_single_column_page_count_probabilistic(self, mock_base_randint, mock_base_random, mocker: MockerFixture):
         pdf_generator_instance = self.generator
-        mocker.patch('synth_data_gen.generators.pdf.ensure_output_directories')
+        mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
         mock_simple_doc_template_class = mocker.patch('synth_data_gen.generators.pdf.SimpleDocTemplate')
         mock_add_pdf_chapter_content = mocker.patch.object(pdf_generator_instance, '_add_pdf_chapter_content')
         
@@ -1789,4 +1789,35 @@ class TestPdfGenerator:
         assert any(call[0][1] == "page_count" for call in mock_determine_count_on_pdf.call_args_list)
         assert mock_base_random.call_count == 1 
         mock_base_randint.assert_not_called() 
-        assert mock_add_pdf_chapter_content.call_count == expected_page_count_s2_val
\ No newline at end of file
+        assert mock_add_pdf_chapter_content.call_count == expected_page_count_s2_val
+
+def test_style_sheet_copies_are_independent_of_cached_template():
+    """Test that the cached stylesheet template is never mutated through a document's copy."""
+    from reportlab.lib.styles import getSampleStyleSheet
+    generator = PdfGenerator()
+    first = generator._style_sheet()
+    first['Normal'].fontName = 'Courier'
+    first['h1'].fontSize = 99
+
+    second = generator._style_sheet()
+    fresh = getSampleStyleSheet()
+    assert second['Normal'].fontName == fresh['Normal'].fontName
+    assert second['h1'].fontSize == fresh['h1'].fontSize
+    assert second['h1'].parent is second['Normal']
+    assert second['title'] is second['Title']
+
+def test_render_returns_pdf_bytes_matching_generate(mocker: MockerFixture, tmp_path):
+    """Test that render() writes the PDF into memory and matches the seeded file output byte for byte."""
+    from synth_data_gen.core.seeding import seeded
+    generator = PdfGenerator()
+    specific_config = {"pdf_variant": "simulated_ocr_high_quality", "base_font_family": "Helvetica", "page_count_config": 2}
+    output_path = str(tmp_path / "doc.pdf")
+    with seeded(3):
+        generator.generate(specific_config, {}, output_path)
+    mock_ensure_dirs = mocker.patch('synth_data_gen.generators.pdf.ensure_directory')
+    with seeded(3):
+        rendered = generator.render(specific_config, {})
+
+    assert rendered.startswith(b"%PDF-")
+    assert rendered == open(output_path, "rb").read()
+    mock_ensure_dirs.assert_not_called()
@@ -0,0 +1,56 @@
+import json
+
+from synth_data_gen import bench
+from synth_data_gen.cli import main
+
+
+def test_default_scenarios_cover_every_variant():
+    names = {scenario.name for scenario in bench.default_scenarios()}
+    assert {f"pdf/{variant}" for variant in bench.PDF_VARIANTS} <= names
+    assert {f"markdown/{variant}" for variant in bench.MD_VARIANTS} <= names
+    assert {f"epub/{density}" for density in bench.EPUB_DENSITIES} <= names
+    assert [s.name for s in bench.select_scenarios(bench.default_scenarios(), ["epub/h", "with_latex"])] == ["markdown/with_latex", "epub/heavy"]
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert bench.percentile(values, 50) == 50
+    assert bench.percentile(values, 99) == 99
+    assert bench.percentile([3.0], 99) == 3.0
+    assert bench.percentile([], 50) == 0.0
+
+def test_run_scenario_measures_documents():
+    scenario = bench.Scenario("markdown/basic", "markdown", {"md_variant": "basic_elements"})
+    result = bench.run_scenario(scenario, iterations=4, warmup=1)
+    assert (result.docs, result.failures) == (4, 0)
+    assert result.bytes > 0 and result.docs_per_sec > 0 and result.mb_per_sec > 0
+    assert 0 < result.p50_ms <= result.p99_ms
+    assert set(result.phase_ms) == {"render", "write"}
+
+def test_run_scenario_counts_missing_output_as_failure(monkeypatch):
+    from synth_data_gen.generators.markdown import MarkdownGenerator
+    monkeypatch.setattr(MarkdownGenerator, "generate", lambda self, specific_config, global_config, output_path: output_path)
+    result = bench.run_scenario(bench.Scenario("markdown/nothing", "markdown"), iterations=3, warmup=1)
+    assert (result.docs, result.failures, result.bytes) == (0, 3, 0)
+    assert result.docs_per_sec == 0.0
+
+def test_compare_flags_regressions_in_the_right_direction():
+    def results(docs_per_sec, p99_ms):
+        return {"scenarios": {"pdf/x": {"docs_per_sec": docs_per_sec, "p99_ms": p99_ms, "peak_rss_mb": None}}}
+    changes = {c.metric: c for c in bench.compare_results(results(100.0, 10.0), results(80.0, 10.5), threshold=0.1)}
+    assert set(changes) == {"docs_per_sec", "p99_ms"}
+    assert changes["docs_per_sec"].regression and round(changes["docs_per_sec"].change, 2) == -0.2
+    assert not changes["p99_ms"].regression
+    assert not bench.compare_results(results(100.0, 10.0), {"scenarios": {"pdf/y": {"docs_per_sec": 1.0}}})
+
+def test_bench_command_saves_and_compares_results(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    args = ["bench", "-k", "markdown/no_frontmatter", "-n", "3", "--warmup", "0", "--no-isolate"]
+    assert main(args + ["-o", str(output)]) == 0
+    saved = json.loads(output.read_text())
+    assert list(saved["scenarios"]) == ["markdown/no_frontmatter_variant"]
+    assert saved["settings"]["iterations"] == 3
+
+    saved["scenarios"]["markdown/no_frontmatter_variant"]["docs_per_sec"] *= 1000
+    output.write_text(json.dumps(saved))
+    assert main(args + ["--compare", str(output)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import yaml
+from synth_data_gen.cli import main
+
+
+def _write_config(tmp_path, **extra):
+    config = dict({
+        "output_directory_base": str(tmp_path / "out"),
+        "file_types": [{"type": "markdown", "count": 2}],
+        "markdown": {"md_variant": "no_frontmatter_variant"},
+    }, **extra)
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(config))
+    return str(path)
+
+def test_generate_writes_files(tmp_path, capsys):
+    assert main(["generate", _write_config(tmp_path), "-o", str(tmp_path / "elsewhere")]) == 0
+    assert sorted(os.listdir(tmp_path / "elsewhere" / "markdowns")) == ["markdown_1.md", "markdown_2.md"]
+    assert "Generated 2 files, 0 failed." in capsys.readouterr().out
+
+def test_plan_lists_files_without_creating_them(tmp_path, capsys):
+    assert main(["plan", _write_config(tmp_path)]) == 0
+    out = capsys.readouterr().out
+    assert f"markdown\t2\t{tmp_path / 'out' / 'markdowns' / 'markdown_2.md'}" in out
+    assert "2 files planned." in out
+    assert not (tmp_path / "out").exists()
+
+def test_validate_reports_problems(tmp_path, capsys):
+    assert main(["validate", _write_config(tmp_path)]) == 0
+    config = _write_config(tmp_path, file_types=[{"type": "nope"}, {"type": "markdown", "matrix": []}])
+    assert main(["validate", config]) == 1
+    out = capsys.readouterr().out
+    assert "file_types[0]: unknown or missing type" in out and "file_types[1]:" in out
+
+def test_missing_config_exits_with_error(tmp_path, capsys):
+    assert main(["plan", str(tmp_path / "missing.yaml")]) == 2
+    assert "missing.yaml" in capsys.readouterr().err
+
+def test_markdown_only_run_does_not_import_other_generators(tmp_path):
+    code = ("import sys; from synth_data_gen.cli import main; main(['generate', sys.argv[1]]); "
+            "print(sorted(m for m in ('reportlab', 'ebooklib', 'lxml') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code, _write_config(tmp_path)], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+def test_generate_writes_metrics_textfile(tmp_path, capsys):
+    metrics = tmp_path / "synth.prom"
+    assert main(["generate", _write_config(tmp_path), "--metrics-textfile", str(metrics)]) == 0
+    assert 'synth_data_gen_files_total{file_type="markdown"} 2' in metrics.read_text()
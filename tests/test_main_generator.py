@@ -52,7 +52,7 @@ def test_generate_data_default_config(mocker: MockerFixture, cleanup_main_genera
     
     generated_files = generate_data()
 
-    # Check that the base directory was created by ensure_output_directories
+    # Check that the base directory was created by the output layout
     assert expected_output_dir_base.exists(), f"Default base output directory '{expected_output_dir_base}' should be created."
 
     # Check if mocks were called correctly (implying subdirectories were handled)
@@ -125,4 +125,400 @@ def test_generate_data_custom_config_obj(mocker: MockerFixture, cleanup_main_gen
 def test_generate_data_invalid_config_path(cleanup_main_generator_output):
     """Test generate_data with an invalid config_path."""
     with pytest.raises(FileNotFoundError):
-        generate_data(config_path="non_existent_config.yaml")
\ No newline at end of file
+        generate_data(config_path="non_existent_config.yaml")
+
+def test_generate_data_parallel_matches_serial(tmp_path):
+    """Test that max_workers > 1 generates the same files as the serial path."""
+    config = {
+        "file_types": [
+            {"type": "markdown", "count": 3, "markdown_specific_settings": {}},
+        ],
+        "markdown": {"md_variant": "no_frontmatter_variant"},
+    }
+    serial_files = generate_data(config_obj=config, output_dir_override=str(tmp_path / "serial"))
+    parallel_files = generate_data(config_obj=config, output_dir_override=str(tmp_path / "parallel"), max_workers=2)
+
+    assert [Path(p).name for p in serial_files] == ["markdown_1.md", "markdown_2.md", "markdown_3.md"]
+    assert [Path(p).name for p in parallel_files] == [Path(p).name for p in serial_files]
+    for serial_path, parallel_path in zip(serial_files, parallel_files):
+        assert Path(parallel_path).read_text() == Path(serial_path).read_text()
+
+
+def test_generate_data_progress_messages(tmp_path, capsys):
+    """Test that the pool path reports items as queued, since they are submitted ahead of the work."""
+    config = {"file_types": [{"type": "markdown", "count": 2}], "markdown": {"md_variant": "no_frontmatter_variant"}}
+    generate_data(config_obj=config, output_dir_override=str(tmp_path / "serial"))
+    serial_out = capsys.readouterr().out
+    generate_data(config_obj=config, output_dir_override=str(tmp_path / "parallel"), max_workers=2)
+    parallel_out = capsys.readouterr().out
+
+    assert "Generating markdown (2/2): " in serial_out
+    assert "Queued markdown (2/2): " in parallel_out
+    assert "Generating markdown" not in parallel_out
+
+
+def test_generate_data_progress_goes_to_listeners_or_is_quiet(tmp_path, capsys):
+    """Test that per-file progress lines go to a run's listeners instead of stdout, and that `quiet` drops them."""
+    config = {"file_types": [{"type": "markdown", "count": 2}], "markdown": {"md_variant": "no_frontmatter_variant"}}
+    received = []
+    generate_data(config_obj=config, output_dir_override=str(tmp_path / "a"), listeners=[received.append])
+    generate_data(config_obj=dict(config, quiet=True), output_dir_override=str(tmp_path / "b"))
+    out = capsys.readouterr().out
+
+    assert "Generating markdown" not in out
+    assert [e.message for e in received if e.kind == "progress"] == [
+        "Generating markdown (1/2): " + str(tmp_path / "a" / "markdowns" / "markdown_1.md"),
+        "Generating markdown (2/2): " + str(tmp_path / "a" / "markdowns" / "markdown_2.md"),
+    ]
+
+
+def test_generate_data_parallel_reports_errors_and_continues(tmp_path, capsys):
+    """Test that worker errors are reported like the serial path and don't stop the run."""
+    # A regular file where the generator expects a directory makes every file of the first type fail.
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "blocker").touch()
+    config = {
+        "max_workers": 2,
+        "file_types": [
+            {"type": "markdown", "count": 2, "output_subdir": "broken", "filename_pattern": "blocker/markdown_{index}.md"},
+            {"type": "markdown", "count": 1, "output_subdir": "ok"},
+        ],
+    }
+    generated_files = generate_data(config_obj=config, output_dir_override=str(tmp_path))
+
+    assert generated_files == [str(tmp_path / "ok" / "markdown_1.md")]
+    captured = capsys.readouterr().out
+    assert "Error during markdown generation for " + str(tmp_path / "broken" / "blocker" / "markdown_1.md") in captured
+    assert "Error during markdown generation for " + str(tmp_path / "broken" / "blocker" / "markdown_2.md") in captured
+
+
+def test_iter_generate_data_streams_result_records(tmp_path):
+    """Test that iter_generate_data yields one result record per written file."""
+    from synth_data_gen import iter_generate_data
+    config = {"file_types": [{"type": "markdown", "count": 2}]}
+
+    results = iter_generate_data(config_obj=config, output_dir_override=str(tmp_path))
+    first = next(results)
+    # The first file is on disk before the second one has been planned.
+    assert Path(first.path).exists()
+    assert not (tmp_path / "markdowns" / "markdown_2.md").exists()
+
+    rest = list(results)
+    assert [(r.file_type, r.index) for r in [first] + rest] == [("markdown", 1), ("markdown", 2)]
+    for r in [first] + rest:
+        assert r.ok
+        assert r.bytes == Path(r.path).stat().st_size
+        assert r.elapsed >= 0
+
+
+def test_generate_data_async_matches_generate_data(tmp_path):
+    """Test that generate_data_async produces the same files as generate_data."""
+    import asyncio
+    from synth_data_gen import generate_data_async
+    config = {"file_types": [{"type": "markdown", "count": 3}], "markdown": {"md_variant": "no_frontmatter_variant"}}
+
+    sync_files = generate_data(config_obj=config, output_dir_override=str(tmp_path / "sync"))
+    async_files = asyncio.run(generate_data_async(config_obj=config, output_dir_override=str(tmp_path / "async"), max_concurrency=2))
+
+    assert [Path(p).name for p in async_files] == [Path(p).name for p in sync_files]
+    for sync_path, async_path in zip(sync_files, async_files):
+        assert Path(async_path).read_text() == Path(sync_path).read_text()
+
+
+def test_generate_data_resume_skips_up_to_date_files(tmp_path):
+    """Test that a resumed rerun only regenerates files that are missing or whose inputs changed."""
+    from synth_data_gen import iter_generate_data
+    config = {
+        "file_types": [{"type": "markdown", "count": 3}],
+        "markdown": {"md_variant": "no_frontmatter_variant"},
+    }
+    generate_data(config_obj=config, output_dir_override=str(tmp_path / "plain"))
+    assert not (tmp_path / "plain" / ".synth_manifest.jsonl").exists() # only kept when resuming or asked for
+
+    first_files = generate_data(config_obj=config, output_dir_override=str(tmp_path), resume=True)
+    assert (tmp_path / ".synth_manifest.jsonl").exists()
+
+    os.remove(first_files[1])
+    mtimes = {p: os.path.getmtime(p) for p in (first_files[0], first_files[2])}
+    results = list(iter_generate_data(config_obj=config, output_dir_override=str(tmp_path), resume=True))
+
+    assert sorted(r.path for r in results) == sorted(first_files)
+    assert {Path(r.path).name: r.skipped for r in results} == {"markdown_1.md": True, "markdown_2.md": False, "markdown_3.md": True}
+    assert all(os.path.getmtime(p) == mtime for p, mtime in mtimes.items())
+
+    # A config change invalidates every entry.
+    config["markdown"] = {"md_variant": "basic_frontmatter_variant"}
+    results = list(iter_generate_data(config_obj=config, output_dir_override=str(tmp_path), resume=True))
+    assert not any(r.skipped for r in results)
+
+
+def test_generate_data_shards_merge_to_single_node_corpus(tmp_path):
+    """Test that the shards of a config are disjoint and together give the single-node corpus."""
+    config = {
+        "file_types": [
+            {"type": "markdown", "count": 7},
+            {"type": "markdown", "count": 5, "output_subdir": "more"},
+        ],
+        "markdown": {"md_variant": "no_frontmatter_variant"},
+    }
+    single = generate_data(config_obj=config, output_dir_override=str(tmp_path / "single"))
+    single_files = {os.path.relpath(p, tmp_path / "single"): Path(p).read_text() for p in single}
+
+    merged = {}
+    for shard_index in range(3):
+        shard_dir = tmp_path / f"shard{shard_index}"
+        shard_files = generate_data(config_obj=dict(config, shard_index=shard_index, shard_count=3, manifest=True),
+                                    output_dir_override=str(shard_dir))
+        for p in shard_files:
+            rel = os.path.relpath(p, shard_dir)
+            assert rel not in merged
+            merged[rel] = Path(p).read_text()
+        assert (shard_dir / f".synth_manifest.shard-{shard_index}-of-3.jsonl").exists()
+
+    assert merged == single_files
+
+
+def test_generate_data_rejects_invalid_shard(tmp_path):
+    """Test that an inconsistent shard setting fails instead of generating the full corpus."""
+    from synth_data_gen import InvalidConfigError
+    config = {"file_types": [{"type": "markdown", "count": 2}]}
+    with pytest.raises(InvalidConfigError):
+        generate_data(config_obj=config, output_dir_override=str(tmp_path), shard_index=3, shard_count=3)
+
+
+def test_generate_data_base_seed_output_independent_of_workers_and_shards(tmp_path):
+    """Test that with base_seed every file is byte-identical across worker counts and shardings."""
+    config = {
+        "global_settings": {"base_seed": 1234},
+        "file_types": [
+            {"type": "markdown", "count": 6},
+            {"type": "pdf", "count": 2},
+        ],
+        "markdown": {"md_variant": "basic_elements", "frontmatter": {"include_chance": 0.5}},
+        "pdf": {"pdf_variant": "simulated_ocr_high_quality", "base_font_family": "Helvetica", "title": "Seeded",
+                "page_count_config": {"min": 1, "max": 3}},
+    }
+
+    def read_all(base_dir, paths):
+        return {os.path.relpath(p, base_dir): Path(p).read_bytes() for p in paths}
+
+    serial = read_all(tmp_path / "serial", generate_data(config_obj=config, output_dir_override=str(tmp_path / "serial")))
+    parallel = read_all(tmp_path / "parallel", generate_data(config_obj=config, output_dir_override=str(tmp_path / "parallel"), max_workers=3))
+    sharded = {}
+    for shard_index in range(2):
+        shard_dir = tmp_path / f"shard{shard_index}"
+        sharded.update(read_all(shard_dir, generate_data(config_obj=config, output_dir_override=str(shard_dir),
+                                                         shard_index=shard_index, shard_count=2)))
+
+    assert len(serial) == 8
+    assert parallel == serial
+    assert sharded == serial
+    # Frontmatter was included for some files and not others: the streams differ per file.
+    assert len({content.startswith(b"---") for name, content in serial.items() if name.endswith(".md")}) == 2
+
+    config["global_settings"]["base_seed"] = 4321
+    reseeded = read_all(tmp_path / "reseeded", generate_data(config_obj=config, output_dir_override=str(tmp_path / "reseeded")))
+    assert reseeded != serial
+
+
+def test_generation_session_reuses_config_and_generators(tmp_path, mocker: MockerFixture):
+    """Test that a session loads config once and reuses generators and stylesheets across documents."""
+    from synth_data_gen import GenerationSession
+    from synth_data_gen.core.config_loader import ConfigLoader
+    import synth_data_gen.generators.pdf as pdf_module
+    load_spy = mocker.spy(ConfigLoader, "load_and_validate_config")
+    style_spy = mocker.spy(pdf_module, "getSampleStyleSheet")
+    config = {
+        "global_settings": {"base_seed": 9},
+        "markdown": {"md_variant": "no_frontmatter_variant"},
+        "pdf": {"pdf_variant": "simulated_ocr_high_quality", "base_font_family": "Helvetica", "page_count_config": 1},
+    }
+    session = GenerationSession(config_obj=config, output_dir_override=str(tmp_path))
+
+    results = [session.generate_one("markdown", {"title": f"Case {i}"}) for i in range(3)]
+    results += [session.generate_one("pdf", {"title": f"PDF {i}"}) for i in range(2)]
+
+    assert all(r.ok for r in results)
+    assert [Path(r.path).name for r in results] == [
+        "markdown_session_1.md", "markdown_session_2.md", "markdown_session_3.md", "pdf_session_1.pdf", "pdf_session_2.pdf"]
+    assert load_spy.call_count == 1
+    assert style_spy.call_count == 1
+    assert session.generator("markdown") is session.generator("MARKDOWN")
+    # Overrides don't leak into the cached specific config.
+    assert "title" not in session.specific_config("markdown")
+
+    # The n-th document of a type is reproducible across sessions.
+    again = GenerationSession(config_obj=config, output_dir_override=str(tmp_path / "again"))
+    first_pdf = again.generate_one("pdf", {"title": "PDF 0"})
+    assert Path(first_pdf.path).read_bytes() == Path(results[3].path).read_bytes()
+
+    from synth_data_gen import InvalidConfigError
+    with pytest.raises(InvalidConfigError):
+        session.generate_one("docx")
+
+
+def test_generation_session_render_one_returns_bytes(tmp_path):
+    """Test that render_one returns the same document generate_one would write, without writing it."""
+    from synth_data_gen import GenerationSession
+    config = {"global_settings": {"base_seed": 9}, "markdown": {"md_variant": "basic_elements", "frontmatter": {"include_chance": 0.5}}}
+    rendered = GenerationSession(config_obj=config, output_dir_override=str(tmp_path / "a")).render_one("markdown")
+    written = GenerationSession(config_obj=config, output_dir_override=str(tmp_path / "b")).generate_one("markdown")
+
+    assert rendered == Path(written.path).read_bytes()
+    assert not (tmp_path / "a" / "markdowns").exists()
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_generate_data_output_sink_archives_corpus(tmp_path, max_workers):
+    """Test that an archive sink holds the same documents a directory run writes, without per-type dirs."""
+    import hashlib
+    import json
+    import tarfile
+    import zipfile
+    config = {
+        "global_settings": {"base_seed": 5},
+        "file_types": [{"type": "markdown", "count": 3}, {"type": "pdf", "count": 1}],
+        "markdown": {"md_variant": "basic_elements"},
+        "pdf": {"pdf_variant": "simulated_ocr_high_quality", "base_font_family": "Helvetica", "page_count_config": 1},
+    }
+    directory = generate_data(config_obj=config, output_dir_override=str(tmp_path / "dir"))
+    expected = {os.path.relpath(p, tmp_path / "dir").replace(os.sep, "/"): Path(p).read_bytes() for p in directory}
+
+    tar_path = tmp_path / "corpus.tar.gz"
+    members = generate_data(config_obj=dict(config, output_sink={"type": "tar", "path": str(tar_path)}),
+                            output_dir_override=str(tmp_path / "tar_out"), max_workers=max_workers)
+    assert sorted(members) == sorted(expected)
+    with tarfile.open(tar_path, "r:gz") as tar:
+        assert {m.name: tar.extractfile(m).read() for m in tar.getmembers()} == expected
+    assert not (tmp_path / "tar_out" / "markdowns").exists()
+
+    from synth_data_gen import ZipSink
+    zip_path = tmp_path / "corpus.zip"
+    with ZipSink(str(zip_path)) as sink:
+        members = generate_data(config_obj=dict(config, manifest=True), output_dir_override=str(tmp_path / "zip_out"),
+                                max_workers=max_workers, output_sink=sink)
+    with zipfile.ZipFile(zip_path) as zf:
+        archived = {name: zf.read(name) for name in zf.namelist()}
+    manifest = [json.loads(line) for line in archived.pop(".synth_manifest.jsonl").decode("utf-8").splitlines()]
+    assert archived == expected
+    assert {entry["path"]: entry["checksum"] for entry in manifest} == {
+        name: hashlib.sha256(data).hexdigest() for name, data in expected.items()}
+
+
+def test_generate_data_rejects_invalid_output_sink(tmp_path):
+    """Test that a malformed output_sink block is a config error."""
+    from synth_data_gen import InvalidConfigError
+    config = {"file_types": [{"type": "markdown", "count": 1}], "output_sink": {"type": "tar"}}
+    with pytest.raises(InvalidConfigError):
+        generate_data(config_obj=config, output_dir_override=str(tmp_path))
+
+
+def test_generate_data_creates_only_used_directories(tmp_path):
+    """Test that a run creates the output dirs of its entries, not the legacy epub/pdf/markdown tree."""
+    config = {
+        "file_types": [{"type": "markdown", "count": 2}, {"type": "pdf", "count": 0}],
+        "markdown": {"md_variant": "no_frontmatter_variant"},
+    }
+    generate_data(config_obj=config, output_dir_override=str(tmp_path))
+    dirs = sorted(os.path.relpath(root, tmp_path) for root, _, _ in os.walk(tmp_path))
+    assert dirs == [".", "markdowns"]
+
+
+def test_generate_data_expands_matrix_entries(tmp_path, mocker: MockerFixture):
+    """Test that a matrix entry generates `count` files per case, each with that case's settings."""
+    seen = []
+    def fake_generate(self, specific_config, global_config, output_path):
+        seen.append((os.path.basename(output_path), specific_config["md_variant"], specific_config["frontmatter"]["style"]))
+        Path(output_path).write_text("x")
+        return output_path
+    mocker.patch.object(MarkdownGenerator, 'generate', fake_generate)
+    config = {
+        "file_types": [{
+            "type": "markdown", "count": 2, "filename_pattern": "md_{case}_{index}.md",
+            "matrix": {"md_variant": ["basic_elements", "extended_elements"], "frontmatter.style": ["yaml", "toml"]},
+        }],
+        "markdown": {"frontmatter": {"style": "json", "include_chance": 1.0}},
+    }
+    generated = generate_data(config_obj=config, output_dir_override=str(tmp_path))
+    assert len(generated) == 8
+    assert seen[::2] == [
+        ("md_1_1.md", "basic_elements", "yaml"), ("md_2_3.md", "basic_elements", "toml"),
+        ("md_3_5.md", "extended_elements", "yaml"), ("md_4_7.md", "extended_elements", "toml"),
+    ]
+
+def test_generate_data_skips_invalid_matrix(tmp_path, capsys):
+    config = {"file_types": [{"type": "markdown", "count": 1, "matrix": {"md_variant": "basic_elements"}}]}
+    assert generate_data(config_obj=config, output_dir_override=str(tmp_path)) == []
+    assert "Invalid matrix" in capsys.readouterr().out
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_generate_data_reports_metrics_to_listeners(tmp_path, max_workers, capsys):
+    """Test that listeners get per-file metrics, also from pool workers, and the run's totals."""
+    from synth_data_gen import GenerationReport
+    config = {
+        "file_types": [{"type": "markdown", "count": 3}],
+        "markdown": {"md_variant": "basic_elements"},
+        "metrics": {"prometheus_textfile": str(tmp_path / "synth.prom")},
+    }
+    report = GenerationReport()
+    files = generate_data(config_obj=config, output_dir_override=str(tmp_path / "out"), max_workers=max_workers, listeners=[report])
+
+    assert report.files == report.files_by_type["markdown"] == len(files) == 3
+    assert report.bytes == sum(os.path.getsize(p) for p in files)
+    assert set(report.phase_seconds) == {"render", "write"}
+    assert "headings" in report.element_counts
+    assert report.duration > 0
+    assert 'synth_data_gen_files_total{file_type="markdown"} 3' in (tmp_path / "synth.prom").read_text()
+
+def test_concurrent_runs_keep_their_listeners_apart(tmp_path):
+    """Test that runs on different threads only report to their own listeners."""
+    import threading
+    from synth_data_gen import GenerationReport, iter_generate_data
+    from synth_data_gen.core.events import has_listeners
+    config = {"file_types": [{"type": "markdown", "count": 10}], "markdown": {"md_variant": "basic_elements"}}
+    reports = [GenerationReport(), GenerationReport()]
+    outside = []
+    def run(i):
+        for _ in iter_generate_data(config_obj=config, output_dir_override=str(tmp_path / f"out{i}"), listeners=[reports[i]]):
+            outside.append(has_listeners()) # the caller's context, between results
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    outside.append(has_listeners())
+    for thread in threads:
+        thread.join()
+
+    assert [report.files for report in reports] == [10, 10]
+    assert not any(outside)
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_generate_data_writes_chrome_trace(tmp_path, max_workers):
+    """Test that a traced run records setup spans and each file's nested phases, per worker."""
+    import json
+    config = {
+        "file_types": [{"type": "epub", "count": 2}, {"type": "markdown", "count": 1}],
+        "epub": {"chapters_config": 2},
+    }
+    generate_data(config_obj=config, output_dir_override=str(tmp_path / "out"), max_workers=max_workers,
+                  trace_path=str(tmp_path / "trace.json"))
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    names = [e["name"] for e in events if e["ph"] == "X"]
+    assert names.count("load_config") == 1 and "plan" in names and "validate_config" in names
+    assert {"epub 1", "epub 2", "markdown 1"} <= set(names)
+    assert names.count("chapter") == 4 and {"build", "toc", "write"} <= set(names)
+    worker_pids = {e["pid"] for e in events if e["name"] == "epub 1"}
+    assert (worker_pids == {os.getpid()}) == (max_workers == 1)
+
+def test_generate_data_profiles_sampled_files(tmp_path, monkeypatch):
+    """Test that the profiling block profiles only the selected files, in workers too."""
+    monkeypatch.delenv("SYNTH_DATA_GEN_PROFILE", raising=False)
+    config = {
+        "file_types": [{"type": "markdown", "count": 2}, {"type": "pdf", "count": 1}],
+        "pdf": {"pdf_variant": "simple_table"},
+        "profiling": {"types": ["markdown"], "tracemalloc": True},
+    }
+    generate_data(config_obj=config, output_dir_override=str(tmp_path), max_workers=2)
+    profiles = sorted(os.path.relpath(os.path.join(root, name), tmp_path / "_profiles")
+                      for root, _, names in os.walk(tmp_path / "_profiles") for name in names)
+    assert profiles == [os.path.join("markdowns", name) for name in
+                        ("markdown_1.md.alloc.txt", "markdown_1.md.pstats", "markdown_2.md.alloc.txt", "markdown_2.md.pstats")]